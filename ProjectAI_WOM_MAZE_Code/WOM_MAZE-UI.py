@@ -3,14 +3,18 @@ import tkinter as tk
 from collections import deque
 import random
 import WOM_MAZE_LOGIC as logic
+from WOM_MAZE_RENDER import GridRenderer, FrameScheduler, speed_to_rate
+from WOM_MAZE_WORKER import SearchWorker, MazePool, run_in_background
+from WOM_MAZE_COMPONENTS import ComponentIndex
 import time  # for measuring elapsed time
-import subprocess, sys, os
-from PIL import Image, ImageDraw, ImageTk  # for creating icons
-from WOM_MAZE_LOGIC import bfs_generator, dfs_generator, dijkstra_generator, astar_generator
+import sys, os
+# subprocess and PIL are imported where they are used, to keep startup light
 
 # Configure CustomTkinter
 ctk.set_appearance_mode('light')
 ctk.set_default_color_theme('green')
+# Cell value -> colour of the bare maze; other values are drawn like 0
+BASE_COLORS = {0: 'white', 1: 'black'}
 
 class PathVisualizerApp(ctk.CTk):
     # --- Khởi tạo và UI ---
@@ -22,11 +26,19 @@ class PathVisualizerApp(ctk.CTk):
         self.resizable(True, True)
         self.grid_size = 50
         self.grid_data = None
+        self.components = None  # ComponentIndex of grid_data: unreachable queries end at once
+        self.snap = None  # NearestOpenIndex of grid_data: clicks on a wall snap to the nearest open cell
         # default weight for weighted A*
         self.weight = 2
         # Initialize icons
         self.start_icon = None
         self.end_icon = None
+        self.scheduler = None
+        self.worker = None
+        # Mazes for the selected size / algorithm are generated ahead in a background thread
+        self.maze_pool = MazePool(logic.generate_maze)
+        self.timing_query = None  # (algo, heuristic, grid, start, end) of the last animated search
+        self.timing_token = 0
 
         # Control panel (left) with increased width
         control = ctk.CTkFrame(self, width=300, fg_color='#00a000') 
@@ -39,7 +51,7 @@ class PathVisualizerApp(ctk.CTk):
 
         # Pathfinding Algorithm
         ctk.CTkLabel(control, text='Pathfinding Algorithm', text_color='white').grid(row=1, column=0, pady=(10,2), padx=10)
-        self.combo_algo = ctk.CTkComboBox(control, width=260, values=['BFS','DFS','Dijkstra','A*'])
+        self.combo_algo = ctk.CTkComboBox(control, width=260, values=['BFS','Bidirectional BFS','DFS','Dijkstra','A*'])
         self.combo_algo.set('BFS')
         self.combo_algo.grid(row=2, column=0, padx=10, pady=(0,10))
         self.combo_algo.configure(command=self.on_algo_change)
@@ -56,6 +68,7 @@ class PathVisualizerApp(ctk.CTk):
         self.combo_maze = ctk.CTkComboBox(control, width=260, values=['Recursive Backtracking','Prim','Kruskal','Eller'])
         self.combo_maze.set('Recursive Backtracking')
         self.combo_maze.grid(row=6, column=0, padx=10, pady=(0,10))
+        self.combo_maze.configure(command=lambda choice: self.prefetch_maze())
         # Special Maze Variant
         ctk.CTkLabel(control, text='Maze Variant', text_color='white').grid(row=7, column=0, pady=(10,2), padx=10)
         self.combo_variant = ctk.CTkComboBox(control, width=260, values=['EcoBot Navigator','Mud Maze','Zero','Compare'])
@@ -93,7 +106,7 @@ class PathVisualizerApp(ctk.CTk):
         self.speed_slider.grid(row=16, column=0, padx=10, pady=(0,5))
         self.lbl_speed = ctk.CTkLabel(control, text='5', text_color='white')
         self.lbl_speed.grid(row=17, column=0, padx=10)
-        # initialize delay based on default speed after label exists
+        # initialize playback rate based on default speed after label exists
         self.change_move_speed(self.speed_slider.get())
         # Apply Move Speed button
         self.btn_apply_speed = ctk.CTkButton(control, width=260, text='Apply Move Speed', corner_radius=10,
@@ -107,6 +120,10 @@ class PathVisualizerApp(ctk.CTk):
         self.grid_columnconfigure(1, weight=1)
         self.canvas = tk.Canvas(canvas_frame, bg='white')
         self.canvas.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        # The whole maze is one image; icons are canvas items drawn on top
+        self.renderer = GridRenderer(self.canvas, outline='gray', margin_color='#b0e0a0')
+        # Mouse wheel zooms around the pointer, middle-drag pans
+        self.renderer.bind_viewport(self.on_view_change)
         self.canvas.bind('<Configure>', lambda e: self.draw_grid(self.grid_size))
         # Initialize start/end selection and grid metrics
         self.start = None
@@ -144,16 +161,60 @@ class PathVisualizerApp(ctk.CTk):
         # Separator line
         sep2 = ctk.CTkFrame(metrics_frame, height=1, fg_color='white')
         sep2.grid(row=3, column=0, columnspan=2, sticky='ew', padx=5, pady=2)
-        # Time Elapsed
-        ctk.CTkLabel(metrics_frame, text='Time Elapsed (s):', text_color='white', font=('Arial', 12, 'bold'))\
+        # Animation time (wall clock since the animation started, depends on the speed setting)
+        ctk.CTkLabel(metrics_frame, text='Animation Time (s):', text_color='white', font=('Arial', 12, 'bold'))\
             .grid(row=4, column=0, sticky='w', padx=5, pady=(2,5))
         self.lbl_time = ctk.CTkLabel(metrics_frame, text='0.00', text_color='white', font=('Arial', 12))
         self.lbl_time.grid(row=4, column=1, sticky='e', padx=5, pady=(2,5))
+        # Separator line
+        sep3 = ctk.CTkFrame(metrics_frame, height=1, fg_color='white')
+        sep3.grid(row=5, column=0, columnspan=2, sticky='ew', padx=5, pady=2)
+        # Search statistics (expansions, heap operations, CPU time)
+        ctk.CTkLabel(metrics_frame, text='Search Stats:', text_color='white', font=('Arial', 12, 'bold'))\
+            .grid(row=6, column=0, columnspan=2, sticky='w', padx=5, pady=(2,2))
+        self.lbl_stats = ctk.CTkLabel(metrics_frame, text=logic.SearchStats().summary(), text_color='white',
+                                      font=('Arial', 12), justify='left')
+        self.lbl_stats.grid(row=7, column=0, columnspan=2, sticky='w', padx=5, pady=(2,5))
+        # Separator line
+        sep4 = ctk.CTkFrame(metrics_frame, height=1, fg_color='white')
+        sep4.grid(row=8, column=0, columnspan=2, sticky='ew', padx=5, pady=2)
+        # Real algorithm time: headless timed solve, independent of the animation speed
+        ctk.CTkLabel(metrics_frame, text='Algorithm Time:', text_color='white', font=('Arial', 12, 'bold'))\
+            .grid(row=9, column=0, sticky='w', padx=5, pady=(2,5))
+        self.lbl_algo_time = ctk.CTkLabel(metrics_frame, text='-', text_color='white', font=('Arial', 12))
+        self.lbl_algo_time.grid(row=9, column=1, sticky='e', padx=5, pady=(2,5))
         # add New Maze Window button (enabled only when variant != 'Zero')
         self.btn_new_window = ctk.CTkButton(right_control, width=260, text='New Maze Window', corner_radius=10,
                                            fg_color='white', text_color='black', hover_color='red',
                                            command=self.on_new_window)
         self.btn_new_window.grid(row=2, column=0, padx=10, pady=(10,5))
+        # Trace recording / replay
+        ctk.CTkLabel(right_control, text='Search Traces', text_color='white', font=('Arial', 14, 'bold'))\
+            .grid(row=3, column=0, pady=(20,2), padx=10)
+        self.btn_save_trace = ctk.CTkButton(right_control, width=260, text='Save Trace', corner_radius=10,
+                                            fg_color='white', text_color='black', hover_color='red',
+                                            command=self.on_save_trace)
+        self.btn_save_trace.grid(row=4, column=0, padx=10, pady=5)
+        ctk.CTkLabel(right_control, text='Play From Step', text_color='white')\
+            .grid(row=5, column=0, pady=(5,2), padx=10)
+        self.entry_trace_step = ctk.CTkEntry(right_control, width=260)
+        self.entry_trace_step.insert(0, '0')
+        self.entry_trace_step.grid(row=6, column=0, padx=10, pady=(0,5))
+        self.btn_play_trace = ctk.CTkButton(right_control, width=260, text='Play Trace', corner_radius=10,
+                                            fg_color='white', text_color='black', hover_color='red',
+                                            command=self.on_play_trace)
+        self.btn_play_trace.grid(row=7, column=0, padx=10, pady=5)
+        self.trace_reader = None
+        # Pause / resume the running search (it runs in a background thread)
+        self.btn_pause = ctk.CTkButton(right_control, width=260, text='Pause', corner_radius=10,
+                                       fg_color='white', text_color='black', hover_color='red',
+                                       command=self.on_pause)
+        self.btn_pause.grid(row=8, column=0, padx=10, pady=(20,5))
+        # Mazes from `wom_maze generate`, of any size (the slider stops at 100)
+        self.btn_load_maze = ctk.CTkButton(right_control, width=260, text='Load Maze File', corner_radius=10,
+                                           fg_color='white', text_color='black', hover_color='red',
+                                           command=self.on_load_maze)
+        self.btn_load_maze.grid(row=9, column=0, padx=10, pady=5)
         # set initial button state
         self.on_variant_change()
 
@@ -167,13 +228,20 @@ class PathVisualizerApp(ctk.CTk):
     def update_grid(self, val):
         self.grid_size = int(val)
         self.lbl_size.configure(text=str(self.grid_size))
+        self.prefetch_maze()
+
+    def prefetch_maze(self):
+        """Start generating mazes for the current selection before Generate is pressed."""
+        self.maze_pool.select(self.grid_size, self.combo_maze.get(), self.combo_variant.get())
 
     def change_move_speed(self, val):
         """Change move speed"""
         self.speed = val
         self.lbl_speed.configure(text=str(self.speed))
-        # compute animation delay: lower delay = faster speed
-        self.delay = int(200 / self.speed)
+        # events per second for the frame scheduler; 10 = as fast as rendering allows
+        self.rate = speed_to_rate(self.speed)
+        if self.scheduler is not None:
+            self.scheduler.set_rate(self.rate)
 
     def apply_speed(self):
         """Apply the selected move speed."""
@@ -185,6 +253,7 @@ class PathVisualizerApp(ctk.CTk):
 
     def create_start_icon(self, size):
         """Create a start icon (green flag)."""
+        from PIL import Image, ImageDraw, ImageTk
         img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
         draw = ImageDraw.Draw(img)
         # Draw flag pole
@@ -199,6 +268,7 @@ class PathVisualizerApp(ctk.CTk):
 
     def create_end_icon(self, size):
         """Create an end icon (red target)."""
+        from PIL import Image, ImageDraw, ImageTk
         img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
         draw = ImageDraw.Draw(img)
         # Draw concentric circles
@@ -212,240 +282,171 @@ class PathVisualizerApp(ctk.CTk):
                     fill='red')
         return ImageTk.PhotoImage(img)
 
-    def draw_grid(self, n): 
+    def base_color(self, r, c):
+        """Colour of a cell without any search overlay."""
+        return 'black' if self.grid_data and self.grid_data[r][c] == 1 else 'white'
+
+    def draw_base(self, n):
+        """Paint the bare maze. A maze of size n is painted by value in PIL, fast enough for large grids."""
+        if self.grid_data is not None and len(self.grid_data) == n:
+            self.renderer.layout_values(self.grid_data, BASE_COLORS)
+        else:
+            self.renderer.layout(n, self.base_color)
+
+    def draw_start_icon(self):
+        """Draw the start flag on top of the grid image."""
+        self.canvas.delete('start_icon')
+        if not self.renderer.visible(self.start):
+            return
+        cell = self.cell_size
+        x, y = self.renderer.cell_origin(self.start)
+        # Draw flag pole
+        self.canvas.create_line(x + cell*0.2, y + cell*0.2,
+                              x + cell*0.2, y + cell*0.8,
+                              fill='black', width=2, tags='start_icon')
+        # Draw flag
+        points = [
+            x + cell*0.2, y + cell*0.2,  # pole top
+            x + cell*0.7, y + cell*0.4,  # flag tip
+            x + cell*0.2, y + cell*0.6   # pole middle
+        ]
+        self.canvas.create_polygon(points, fill='green', outline='black', tags='start_icon')
+
+    def draw_end_icon(self):
+        """Draw the end target on top of the grid image."""
+        self.canvas.delete('end_icon')
+        if not self.renderer.visible(self.end):
+            return
+        cell = self.cell_size
+        x, y = self.renderer.cell_origin(self.end)
+        center_x = x + cell/2
+        center_y = y + cell/2
+        # Draw 3 concentric circles
+        radius = cell * 0.4
+        for i in range(3):
+            r = radius * (1 - i * 0.2)
+            if r > 1:  # Only draw if radius is greater than 1 pixel
+                self.canvas.create_oval(center_x-r, center_y-r,
+                                     center_x+r, center_y+r,
+                                     outline='red', width=2, tags='end_icon')
+        # Draw center dot
+        dot_radius = max(2, cell * 0.1)
+        self.canvas.create_oval(center_x-dot_radius, center_y-dot_radius,
+                              center_x+dot_radius, center_y+dot_radius,
+                              fill='red', outline='red', tags='end_icon')
+
+    def draw_grid(self, n):
         """Draw n x n grid with square cells and decorate margins."""
-        # Delete everything including start/end icons
-        self.canvas.delete('all')
-        
-        w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
-        # determine square cell size
-        cell = min(w / n, h / n)
-        total = cell * n
-        # padding to center grid
-        pad_x = (w - total) / 2
-        pad_y = (h - total) / 2
-        # decorate leftover areas with light green
-        margin_color = '#b0e0a0'
-        # left margin
-        self.canvas.create_rectangle(0, 0, pad_x, h, fill=margin_color, outline='')
-        # right margin
-        self.canvas.create_rectangle(pad_x + total, 0, w, h, fill=margin_color, outline='')
-        # top margin
-        self.canvas.create_rectangle(pad_x, 0, pad_x + total, pad_y, fill=margin_color, outline='')
-        # bottom margin
-        self.canvas.create_rectangle(pad_x, pad_y + total, pad_x + total, h, fill=margin_color, outline='')
-        # create cell rectangles and store references
-        self.cells = {}
-        for row in range(n):
-            for col in range(n):
-                x1 = pad_x + col * cell
-                y1 = pad_y + row * cell
-                x2 = x1 + cell
-                y2 = y1 + cell
-                # Set initial color based on grid_data if it exists
-                fill_color = 'black' if self.grid_data and self.grid_data[row][col] == 1 else 'white'
-                rect = self.canvas.create_rectangle(x1, y1, x2, y2, fill=fill_color, outline='gray')
-                self.cells[(row, col)] = rect
+        self.draw_base(n)
         # store grid metrics for click mapping
-        self.cell_size = cell
-        self.pad_x = pad_x
-        self.pad_y = pad_y
+        self.cell_size = self.renderer.cell_size
+        self.pad_x = self.renderer.pad_x
+        self.pad_y = self.renderer.pad_y
         # ensure start/end are within grid after resizing
-        if self.start not in self.cells:
+        if not self.renderer.in_grid(self.start):
             self.start = (0, 0)
-        if self.end not in self.cells:
+        if not self.renderer.in_grid(self.end):
             self.end = (n - 1, n - 1)
-            
-        # Draw start icon (flag)
-        if self.start in self.cells:
-            x = pad_x + self.start[1] * cell
-            y = pad_y + self.start[0] * cell
-            # Draw flag pole
-            self.canvas.create_line(x + cell*0.2, y + cell*0.2, 
-                                  x + cell*0.2, y + cell*0.8, 
-                                  fill='black', width=2, tags='start_icon')
-            # Draw flag
-            points = [
-                x + cell*0.2, y + cell*0.2,  # pole top
-                x + cell*0.7, y + cell*0.4,  # flag tip
-                x + cell*0.2, y + cell*0.6   # pole middle
-            ]
-            self.canvas.create_polygon(points, fill='green', outline='black', tags='start_icon')
-            
-        # Draw end icon (target)
-        if self.end in self.cells:
-            x = pad_x + self.end[1] * cell
-            y = pad_y + self.end[0] * cell
-            center_x = x + cell/2
-            center_y = y + cell/2
-            
-            # Draw 3 concentric circles
-            radius = cell * 0.4
-            for i in range(3):
-                r = radius * (1 - i * 0.2)
-                if r > 1:  # Only draw if radius is greater than 1 pixel
-                    self.canvas.create_oval(center_x-r, center_y-r, 
-                                         center_x+r, center_y+r, 
-                                         outline='red', width=2, tags='end_icon')
-            
-            # Draw center dot
-            dot_radius = max(2, cell * 0.1)
-            self.canvas.create_oval(center_x-dot_radius, center_y-dot_radius,
-                                  center_x+dot_radius, center_y+dot_radius,
-                                  fill='red', outline='red', tags='end_icon')
+        self.draw_start_icon()
+        self.draw_end_icon()
+
+    def on_view_change(self):
+        """Zoom / pan changed the cell size and position: redraw the icons on top."""
+        self.cell_size = self.renderer.cell_size
+        self.draw_start_icon()
+        self.draw_end_icon()
 
     def pixel_to_cell(self, x, y):
         """Convert canvas x,y to grid cell indices."""
-        if self.cell_size is None:
-            return None, None
-        col = int((x - self.pad_x) / self.cell_size)
-        row = int((y - self.pad_y) / self.cell_size)
-        return row, col
+        return self.renderer.pixel_to_cell(x, y)
 
     def on_canvas_left_click(self, event):
         """Handle left-click to set start point."""
         r, c = self.pixel_to_cell(event.x, event.y)
         if r is None or not (0 <= r < self.grid_size and 0 <= c < self.grid_size):
             return
-        # do not allow setting start on a wall
-        if self.grid_data is not None and self.grid_data[r][c] == 1:
-            return
-            
-        # Delete all existing start icons first
-        self.canvas.delete('start_icon')
-        
+        # a click on a wall moves the start to the nearest open cell
+        if self.grid_data is not None:
+            r, c = self.snap.nearest((r, c))
         # reset previous start (if different from end)
-        if self.start is not None and self.start != self.end:
-            # Restore original cell color
-            self.canvas.itemconfig(self.cells[self.start], 
-                                 fill='black' if self.grid_data and self.grid_data[self.start[0]][self.start[1]] == 1 else 'white')
-        
+        if self.renderer.in_grid(self.start) and self.start != self.end:
+            self.renderer.set_cell(self.start, self.base_color(*self.start))
         self.start = (r, c)
-        # Update start position without redrawing entire grid
-        if self.start in self.cells:
-            x = self.pad_x + self.start[1] * self.cell_size
-            y = self.pad_y + self.start[0] * self.cell_size
-            # Clear previous start icon area
-            self.canvas.create_rectangle(x, y, x + self.cell_size, y + self.cell_size, 
-                                      fill='white', outline='gray', tags='start_icon')
-            # Draw flag pole
-            self.canvas.create_line(x + self.cell_size*0.2, y + self.cell_size*0.2, 
-                                  x + self.cell_size*0.2, y + self.cell_size*0.8, 
-                                  fill='black', width=2, tags='start_icon')
-            # Draw flag
-            points = [
-                x + self.cell_size*0.2, y + self.cell_size*0.2,  # pole top
-                x + self.cell_size*0.7, y + self.cell_size*0.4,  # flag tip
-                x + self.cell_size*0.2, y + self.cell_size*0.6   # pole middle
-            ]
-            self.canvas.create_polygon(points, fill='green', outline='black', tags='start_icon')
+        self.renderer.set_cell(self.start, 'white')
+        self.draw_start_icon()
 
     def on_canvas_right_click(self, event):
         """Handle right-click to set end point."""
         r, c = self.pixel_to_cell(event.x, event.y)
         if r is None or not (0 <= r < self.grid_size and 0 <= c < self.grid_size):
             return
-        # do not allow setting end on a wall
-        if self.grid_data is not None and self.grid_data[r][c] == 1:
-            return
-            
-        # Delete all existing end icons first
-        self.canvas.delete('end_icon')
-        
+        # a click on a wall moves the end to the nearest open cell
+        if self.grid_data is not None:
+            r, c = self.snap.nearest((r, c))
         # reset previous end (if different from start)
-        if self.end is not None and self.end != self.start:
-            # Restore original cell color
-            self.canvas.itemconfig(self.cells[self.end], 
-                                 fill='black' if self.grid_data and self.grid_data[self.end[0]][self.end[1]] == 1 else 'white')
-        
+        if self.renderer.in_grid(self.end) and self.end != self.start:
+            self.renderer.set_cell(self.end, self.base_color(*self.end))
         self.end = (r, c)
-        # Update end position without redrawing entire grid
-        if self.end in self.cells:
-            x = self.pad_x + self.end[1] * self.cell_size
-            y = self.pad_y + self.end[0] * self.cell_size
-            # Clear previous end icon area
-            self.canvas.create_rectangle(x, y, x + self.cell_size, y + self.cell_size, 
-                                      fill='white', outline='gray', tags='end_icon')
-            center_x = x + self.cell_size/2
-            center_y = y + self.cell_size/2
-            
-            # Draw 3 concentric circles
-            radius = self.cell_size * 0.4
-            for i in range(3):
-                r = radius * (1 - i * 0.2)
-                if r > 1:  # Only draw if radius is greater than 1 pixel
-                    self.canvas.create_oval(center_x-r, center_y-r, 
-                                         center_x+r, center_y+r, 
-                                         outline='red', width=2, tags='end_icon')
-            
-            # Draw center dot
-            dot_radius = max(2, self.cell_size * 0.1)
-            self.canvas.create_oval(center_x-dot_radius, center_y-dot_radius,
-                                  center_x+dot_radius, center_y+dot_radius,
-                                  fill='red', outline='red', tags='end_icon')
+        self.renderer.set_cell(self.end, 'white')
+        self.draw_end_icon()
 
     def on_generate(self):
         """Generate a maze and draw walls."""
         n = self.grid_size
-        
+        # Take a pre-generated maze (generated here only if none is ready yet)
+        self.show_maze(self.maze_pool.get(n, self.combo_maze.get(), self.combo_variant.get()))
+
+    def on_load_maze(self):
+        """Load a maze text file (one row per line, 1 = wall), e.g. from `wom_maze generate --size 2000`."""
+        from tkinter import filedialog
+        from wom_maze import read_maze
+        path = filedialog.askopenfilename(filetypes=[('Maze text', '*.txt'), ('All files', '*')])
+        if not path:
+            return
+        try:
+            with open(path, encoding='utf-8') as f:
+                grid = read_maze(f)
+        except (OSError, ValueError) as e:
+            self.lbl_time.configure(text=f'Cannot load maze: {e}')
+            return
+        if not grid:
+            self.lbl_time.configure(text='Cannot load maze: empty file')
+            return
+        self.stop_animation()
+        self.grid_size = len(grid)
+        self.lbl_size.configure(text=str(self.grid_size))
+        self.show_maze(grid)
+
+    def show_maze(self, grid):
+        """Make grid the current maze and draw its walls; start and end have to be picked again."""
+        n = len(grid)
+
         # Reset start and end points
         self.start = None
         self.end = None
         # Delete all existing start/end icons
         self.canvas.delete('start_icon')
         self.canvas.delete('end_icon')
-        
-        # Generate new maze
-        self.grid_data = logic.generate_maze(n, self.combo_maze.get(), self.combo_variant.get())
-        
+
+        self.grid_data = grid
+        self.components = ComponentIndex(self.grid_data)
+        self.snap = logic.NearestOpenIndex(self.grid_data)
+
         # Draw the maze
-        for (r, c), rect in self.cells.items():
-            color = 'black' if self.grid_data[r][c] == 1 else 'white'
-            self.canvas.itemconfig(rect, fill=color)
-            
+        self.draw_base(n)
+
         # Reset metrics
         self.visited_count = 0
         self.path_length = 0
         self.lbl_visited.configure(text='0')
         self.lbl_path_length.configure(text='0')
         self.lbl_time.configure(text='0.00')
-        
-        # Vẽ lại các icon start và end
-        if self.start:
-            x = self.pad_x + self.start[1] * self.cell_size
-            y = self.pad_y + self.start[0] * self.cell_size
-            # Draw flag pole
-            self.canvas.create_line(x + self.cell_size*0.2, y + self.cell_size*0.2, 
-                                  x + self.cell_size*0.2, y + self.cell_size*0.8, 
-                                  fill='black', width=2)
-            # Draw flag
-            points = [
-                x + self.cell_size*0.2, y + self.cell_size*0.2,  # pole top
-                x + self.cell_size*0.7, y + self.cell_size*0.4,  # flag tip
-                x + self.cell_size*0.2, y + self.cell_size*0.6   # pole middle
-            ]
-            self.canvas.create_polygon(points, fill='green', outline='black')
-            
-        if self.end:
-            x = self.pad_x + self.end[1] * self.cell_size
-            y = self.pad_y + self.end[0] * self.cell_size
-            center_x = x + self.cell_size/2
-            center_y = y + self.cell_size/2
-            # Draw concentric circles
-            for r in range(int(self.cell_size*0.4), 0, -int(self.cell_size*0.1)):
-                self.canvas.create_oval(center_x-r, center_y-r, 
-                                     center_x+r, center_y+r, 
-                                     outline='red', width=2)
-            # Draw center dot
-            self.canvas.create_oval(center_x-self.cell_size*0.1, center_y-self.cell_size*0.1,
-                                  center_x+self.cell_size*0.1, center_y+self.cell_size*0.1,
-                                  fill='red', outline='red')
 
     def start_pathfinding(self):
         self.visited_count = 0
         self.path_length = 0
         self.start_time = time.time()
-        self.stepping = True
+        self.stop_animation()
         try:
             n = self.grid_size
             # Kiểm tra hợp lệ điểm bắt đầu và kết thúc
@@ -460,32 +461,24 @@ class PathVisualizerApp(ctk.CTk):
                     self.lbl_visited.configure(text='0')
                     self.lbl_path_length.configure(text='0')
                     return
-            for (r, c), rect in self.cells.items():
-                if self.grid_data is not None:
-                    color = 'black' if self.grid_data[r][c] == 1 else 'white'
-                else:
-                    color = 'white'
-                self.canvas.itemconfig(rect, fill=color)
             self.draw_grid(self.grid_size)
             grid = self.grid_data if self.grid_data is not None else [[0] * n for _ in range(n)]
             algo = self.combo_algo.get()
-            if algo == 'BFS':
-                self.step_gen = bfs_generator(grid, self.start, self.end)
-            elif algo == 'DFS':
-                self.step_gen = dfs_generator(grid, self.start, self.end)
-            elif algo == 'Dijkstra':
-                self.step_gen = dijkstra_generator(grid, self.start, self.end)
-            else:
-                heur = self.combo_heur.get()
-                self.step_gen = astar_generator(grid, self.start, self.end, heur)
-            self.after(self.delay, self.step)
+            self.stats = logic.SearchStats()
+            self.lbl_stats.configure(text=self.stats.summary())
+            self.timing_query = (algo, self.combo_heur.get(), grid, self.start, self.end)
+            self.lbl_algo_time.configure(text='-')
+            self.animate(logic.solver_generator(algo, grid, self.start, self.end, self.combo_heur.get(),
+                                                stats=self.stats, components=self.components))
         except Exception as e:
             self.lbl_time.configure(text=f'Error: {e}')
 
     def on_reset(self):
         # Dừng animation nếu đang dò đường
-        self.stepping = False
+        self.stop_animation()
         self.grid_data = None
+        self.components = None
+        self.snap = None
         self.start = None
         self.end = None
         self.draw_grid(self.grid_size)
@@ -498,8 +491,62 @@ class PathVisualizerApp(ctk.CTk):
                 path.append(cell)
         return path
 
+    def on_save_trace(self):
+        """Run the current query without animation and save its event stream as a trace file."""
+        from tkinter import filedialog
+        import WOM_MAZE_TRACE as trace
+        if self.start is None or self.end is None:
+            self.lbl_time.configure(text='Please select start and end points!')
+            return
+        path = filedialog.asksaveasfilename(defaultextension='.womt',
+                                            filetypes=[('WOM MAZE trace', '*.womt')])
+        if not path:
+            return
+        n = self.grid_size
+        grid = self.grid_data if self.grid_data is not None else [[0] * n for _ in range(n)]
+        events = logic.solver_generator(self.combo_algo.get(), grid, self.start, self.end, self.combo_heur.get())
+        count = trace.record_trace(path, events, grid, self.start, self.end)
+        self.lbl_time.configure(text=f'Saved {count} events')
+
+    def on_play_trace(self):
+        """Load a trace file and animate it without running the solver."""
+        from tkinter import filedialog
+        import WOM_MAZE_TRACE as trace
+        path = filedialog.askopenfilename(filetypes=[('WOM MAZE trace', '*.womt')])
+        if not path:
+            return
+        self.stop_animation()
+        if self.trace_reader is not None:
+            self.trace_reader.close()
+        self.trace_reader = reader = trace.TraceReader(path)
+        self.grid_size = reader.n
+        self.lbl_size.configure(text=str(reader.n))
+        self.grid_data = reader.grid()
+        self.components = ComponentIndex(self.grid_data)
+        self.snap = logic.NearestOpenIndex(self.grid_data)
+        self.start, self.end = reader.start, reader.goal
+        self.draw_grid(self.grid_size)
+        try:
+            first = max(0, min(int(self.entry_trace_step.get()), len(reader)))
+        except ValueError:
+            first = 0
+        # Jump straight to the requested step, then animate from there
+        for typ, cell in reader.events(0, first):
+            if cell != self.start and cell != self.end:
+                self.renderer.set_cell(cell, '#ADD8E6' if typ == 'visit' else 'blue')
+        self.visited_count, self.path_length = reader.counts_at(first)
+        self.lbl_visited.configure(text=str(self.visited_count))
+        self.lbl_path_length.configure(text=str(self.path_length))
+        self.stats = logic.SearchStats()
+        self.lbl_stats.configure(text='Replaying trace (no live stats)')
+        self.start_time = time.time()
+        self.timing_query = None
+        self.lbl_algo_time.configure(text='-')
+        self.animate(reader.events(first))
+
     def on_variant_change(self, choice=None):
         """Enable or disable New Maze Window button based on selected variant."""
+        self.prefetch_maze()
         if self.combo_variant.get() == 'Zero':
             self.btn_new_window.configure(state='disabled')
         else:
@@ -507,6 +554,7 @@ class PathVisualizerApp(ctk.CTk):
 
     def on_new_window(self):
         """Open a new maze solver window as a separate process based on selected variant."""
+        import subprocess
         variant = self.combo_variant.get()
         script_dir = os.path.dirname(os.path.abspath(__file__))
         mapping = {
@@ -519,31 +567,82 @@ class PathVisualizerApp(ctk.CTk):
             script_path = os.path.join(script_dir, script_name)
             subprocess.Popen([sys.executable, script_path])
 
-    def step(self):
-        if not getattr(self, 'stepping', True):
+    # --- Animation ---
+    def animate(self, events):
+        """Run an event stream in a background worker and play it through the frame scheduler."""
+        self.stop_animation()
+        self.worker = SearchWorker(events).start()
+        self.scheduler = FrameScheduler(self, self.worker.events(), self.apply_event,
+                                        on_frame=self.update_metrics, on_done=self.on_search_done,
+                                        rate=self.rate).start()
+
+    def stop_animation(self):
+        """Cancel the running search (if any) and stop drawing its events."""
+        self.timing_token += 1
+        if self.scheduler is not None:
+            self.scheduler.stop()
+            self.scheduler = None
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+        self.btn_pause.configure(text='Pause')
+
+    def on_pause(self):
+        if self.worker is None:
             return
-        try:
-            typ, cell = next(self.step_gen)
-            if typ == 'visit':
-                self.visited_count += 1
-                if cell != self.start and cell != self.end:
-                    self.canvas.itemconfig(self.cells[cell], fill='#ADD8E6')
-                self.lbl_visited.configure(text=str(self.visited_count))
-                self.lbl_time.configure(text=f"{time.time() - self.start_time:.2f}")
-            else:
-                self.path_length += 1
-                if cell != self.start and cell != self.end:
-                    self.canvas.itemconfig(self.cells[cell], fill='blue')
-                self.lbl_path_length.configure(text=str(self.path_length))
-                self.lbl_time.configure(text=f"{time.time() - self.start_time:.2f}")
-            self.after(self.delay, self.step)
-        except StopIteration:
-            elapsed = time.time() - self.start_time
-            self.lbl_visited.configure(text=str(self.visited_count))
-            self.lbl_path_length.configure(text=str(self.path_length))
-            self.lbl_time.configure(text=f"{elapsed:.2f}")
-            self.stepping = False
+        if self.worker.paused:
+            self.worker.resume()
+            self.scheduler.start()
+            self.btn_pause.configure(text='Pause')
+        else:
+            self.worker.pause()
+            self.scheduler.stop()
+            self.btn_pause.configure(text='Resume')
+
+    def apply_event(self, typ, cell):
+        if typ == 'visit':
+            self.visited_count += 1
+            if cell != self.start and cell != self.end:
+                self.renderer.set_cell(cell, '#ADD8E6')
+        else:
+            self.path_length += 1
+            if cell != self.start and cell != self.end:
+                self.renderer.set_cell(cell, 'blue')
+
+    def update_metrics(self):
+        """Refresh the counters once per frame."""
+        self.lbl_visited.configure(text=str(self.visited_count))
+        self.lbl_path_length.configure(text=str(self.path_length))
+        self.lbl_time.configure(text=f"{time.time() - self.start_time:.2f}")
+
+    def on_search_done(self):
+        self.update_metrics()
+        if self.worker.error is not None:
+            self.lbl_time.configure(text=f'Error: {self.worker.error}')
+        self.lbl_stats.configure(text=self.stats.summary())
+        self.scheduler = None
+        self.worker = None
+        self.btn_pause.configure(text='Pause')
+        self.measure_algorithm_time()
+
+    def measure_algorithm_time(self):
+        """Time the same query without animation (several runs) once the animation is over."""
+        if self.timing_query is None:
             return
+        algo, heur, grid, start, end = self.timing_query
+        self.timing_token += 1
+        token = self.timing_token
+        self.lbl_algo_time.configure(text='measuring...')
+
+        def done(timing, error):
+            if token != self.timing_token:
+                return  # a newer search has started since
+            if error is not None:
+                self.lbl_algo_time.configure(text=f'Error: {error}')
+            else:
+                self.lbl_algo_time.configure(text=logic.format_timing(timing))
+
+        run_in_background(self, logic.time_solver, done, grid, start, end, algo, heur)
 
 if __name__ == '__main__':
     app = PathVisualizerApp()
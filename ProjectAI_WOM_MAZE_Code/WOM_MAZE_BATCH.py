@@ -0,0 +1,333 @@
+"""Giải nhiều truy vấn (điểm đầu, điểm cuối) trên cùng một mê cung, chia sẻ công việc.
+
+Gọi astar/dijkstra cho từng truy vấn thì mỗi lần lại tìm từ đầu. solve_many
+gom các truy vấn cùng đích: một lần Dijkstra ngược từ đích (lưới vô hướng,
+chi phí đối xứng) cho cây đường đi ngắn nhất phục vụ mọi điểm đầu của nhóm,
+và dừng ngay khi mọi điểm đầu đã được chốt. Nhóm mà điểm đầu chung nhiều hơn
+điểm cuối thì tìm xuôi từ điểm đầu rồi đảo đường đi.
+
+    results = solve_many(grid, [((0, 0), (99, 99)), ((5, 7), (99, 99)), ...])
+    for res in results:           # đúng thứ tự đầu vào
+        print(res.cost, len(res.path), res.stats.expansions, res.group_size)
+    sum(res.stats.expansions for res in results)    # = tổng công việc thật, không đếm lặp theo nhóm
+
+Mô hình di chuyển giống WOM_MAZE_LOGIC: 'Dijkstra' / 'A*' đi 8 hướng với chi
+phí octile, 'BFS' đi 4 hướng với chi phí 1. Bộ nhớ tìm kiếm (mảng dist /
+parent phẳng) được dùng lại giữa các nhóm nhờ đánh dấu thế hệ, không phải
+xoá. processes=N chia các nhóm cho một Pool, lưới nằm trong WOM_MAZE_SHARED.
+Truy vấn mà hai đầu khác vùng liên thông (WOM_MAZE_COMPONENTS) được trả lời
+"không có đường" ngay, không đưa vào nhóm nào.
+
+Mỗi kết quả có hai bộ đếm: group_stats là SearchStats của cả lần tìm kiếm
+(cùng một đối tượng cho mọi truy vấn trong nhóm), còn stats là phần của riêng
+truy vấn đó: công việc từ lúc đầu còn lại của truy vấn trước được chốt tới lúc
+của truy vấn này được chốt (truy vấn chốt cuối, hoặc không tới được, nhận nốt
+phần còn lại). Cộng stats của mọi kết quả thì ra đúng tổng của các nhóm.
+"""
+import heapq
+import time
+from array import array
+from collections import deque
+
+import WOM_MAZE_LOGIC as logic
+from WOM_MAZE_COMPONENTS import ComponentIndex
+
+SQRT2 = 2 ** 0.5
+MODELS = {'Dijkstra': 8, 'A*': 8, 'BFS': 4}
+
+
+class QueryResult:
+    """Kết quả một truy vấn: stats là phần công việc của riêng nó, group_stats là của cả nhóm."""
+
+    __slots__ = ('start', 'goal', 'path', 'cost', 'stats', 'group_stats', 'group_size', 'settle_order')
+
+    def __init__(self, start, goal, path, cost, stats, group_stats, group_size, settle_order=None):
+        self.start = start
+        self.goal = goal
+        self.path = path
+        self.cost = cost              # None nếu không có đường
+        self.stats = stats
+        self.group_stats = group_stats
+        self.group_size = group_size  # số truy vấn dùng chung lần tìm kiếm này (0: bị loại trước khi tìm)
+        self.settle_order = settle_order  # số ô đã chốt khi đầu còn lại được chốt (None: không tới được)
+
+    @property
+    def found(self):
+        return self.cost is not None
+
+    def __repr__(self):
+        return (f'QueryResult({self.start} -> {self.goal}, cost={self.cost}, '
+                f'path={len(self.path)} cells, group={self.group_size})')
+
+
+# --- Bộ nhớ tìm kiếm dùng lại ---
+class SearchWorkspace:
+    """Mảng phẳng n*n cho dist / parent / đích; thế hệ (stamp) thay cho việc xoá mảng."""
+
+    def __init__(self, walls, n):
+        self.walls = walls                   # dãy phẳng n*n, 1 = tường
+        self.n = n
+        size = n * n
+        self.dist = [0.0] * size
+        self.parent = array('i', [-1]) * size
+        self.stamp = array('I', [0]) * size   # dist/parent chỉ hợp lệ khi stamp == gen
+        self.target = array('I', [0]) * size  # ô là đích của nhóm hiện tại khi target == gen
+        self.gen = 0
+        self.settled_at = {}                 # ô target -> bộ đếm lúc nó được chốt (lần tìm gần nhất)
+        self.steps8 = self._steps(8)
+        self.steps4 = self._steps(4)
+
+    @classmethod
+    def from_grid(cls, grid):
+        n = len(grid)
+        walls = bytearray(n * n)
+        for r, row in enumerate(grid):
+            walls[r * n:(r + 1) * n] = bytes(1 if v == 1 else 0 for v in row)
+        return cls(walls, n)
+
+    @staticmethod
+    def _steps(moves):
+        dirs = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+        if moves == 8:
+            dirs += [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+        return [(dr, dc, 1 if dr == 0 or dc == 0 else SQRT2) for dr, dc in dirs]
+
+    def search(self, source, targets, moves, stats, reverse=True):
+        """Tìm từ source đến khi mọi ô trong targets được chốt (hoặc hết ô).
+
+        Giữ đúng quy ước của solver trong WOM_MAZE_LOGIC: điểm đầu nằm trên
+        tường vẫn đi ra được, còn ô tường thì không đi vào được. Khi reverse
+        (source là điểm cuối, targets là các điểm đầu) điều đó thành: không mở
+        rộng source là tường, nhưng được chạm tới các target là tường.
+        Trả về số ô đã chốt; dist/parent của thế hệ hiện tại mô tả cây đường đi.
+        """
+        self.gen += 1
+        gen = self.gen
+        n = self.n
+        walls, dist, parent, stamp, target = self.walls, self.dist, self.parent, self.stamp, self.target
+        settled_at = self.settled_at = {}
+        remaining = 0
+        for t in targets:
+            if target[t] != gen:
+                target[t] = gen
+                remaining += 1
+        steps = self.steps8 if moves == 8 else self.steps4
+        bfs = moves == 4
+        stamp[source] = gen
+        dist[source] = 0
+        parent[source] = -1
+        frontier = deque([source]) if bfs else [(0, source)]
+        stats.pushes += 1
+        peak = 1
+        settled = 0
+        heappop, heappush = heapq.heappop, heapq.heappush
+        while frontier and remaining:
+            stats.pops += 1
+            if bfs:
+                u = frontier.popleft()
+                d = dist[u]
+            else:
+                d, u = heappop(frontier)
+                if d > dist[u]:
+                    stats.stale_pops += 1
+                    continue
+            settled += 1
+            if target[u] == gen:
+                remaining -= 1
+                settled_at[u] = (stats.pops, stats.pushes, stats.expansions, stats.stale_pops, peak, settled)
+            if walls[u] and (reverse or u != source):
+                continue
+            stats.expansions += 1
+            r, c = divmod(u, n)
+            for dr, dc, cost in steps:
+                nr, nc = r + dr, c + dc
+                if not (0 <= nr < n and 0 <= nc < n):
+                    continue
+                v = nr * n + nc
+                if walls[v] and not (reverse and target[v] == gen):
+                    continue
+                nd = d + cost
+                if stamp[v] == gen and (bfs or nd >= dist[v]):
+                    continue
+                stamp[v] = gen
+                dist[v] = nd
+                parent[v] = u
+                if bfs:
+                    frontier.append(v)
+                else:
+                    heappush(frontier, (nd, v))
+                stats.pushes += 1
+                if len(frontier) > peak:
+                    peak = len(frontier)
+        stats.peak_open = max(stats.peak_open, peak)
+        stats.peak_closed = max(stats.peak_closed, settled)
+        return settled
+
+    def trace(self, cell):
+        """Đường đi từ cell ngược về gốc của cây hiện tại (cell trước, gốc sau)."""
+        if self.stamp[cell] != self.gen:
+            return None
+        n = self.n
+        path = []
+        parent = self.parent
+        while cell != -1:
+            path.append(divmod(cell, n))
+            cell = parent[cell]
+        return path
+
+
+# --- Gom nhóm và giải ---
+def group_queries(queries):
+    """Chia chỉ số truy vấn thành các nhóm [(('goal'|'start', ô), [chỉ số...]), ...]."""
+    goal_count = {}
+    start_count = {}
+    for start, goal in queries:
+        goal_count[goal] = goal_count.get(goal, 0) + 1
+        start_count[start] = start_count.get(start, 0) + 1
+    groups = {}
+    for i, (start, goal) in enumerate(queries):
+        if start_count[start] > goal_count[goal]:
+            key = ('start', start)
+        else:
+            key = ('goal', goal)
+        groups.setdefault(key, []).append(i)
+    return list(groups.items())
+
+
+def _solve_group(ws, queries, key, indices, moves):
+    """Một lần tìm kiếm cho cả nhóm; trả về [(chỉ số, path, cost, SearchStats riêng, thứ tự chốt)], SearchStats nhóm."""
+    n = ws.n
+    side, root = key
+    stats = logic.SearchStats()
+    t0 = time.thread_time()
+    # Gốc là ô chung; các đầu còn lại là đích cần chốt
+    others = [queries[i][0] if side == 'goal' else queries[i][1] for i in indices]
+    cells = [r * n + c for r, c in others]
+    ws.search(root[0] * n + root[1], cells, moves, stats, reverse=side == 'goal')
+    stats.cpu_time = time.thread_time() - t0
+    shares = _shares(ws.settled_at, cells, stats)
+    out = []
+    for i, cell in zip(indices, cells):
+        share = shares.pop(cell, None) or logic.SearchStats()  # đầu trùng nhau: phần đã tính cho truy vấn trước
+        order = ws.settled_at[cell][5] if cell in ws.settled_at else None
+        branch = ws.trace(cell)
+        if branch is None:
+            out.append((i, [], None, share, order))
+            continue
+        # branch đi từ "ô còn lại" về gốc: đúng chiều nếu gốc là đích, ngược lại thì đảo
+        path = branch if side == 'goal' else branch[::-1]
+        out.append((i, path, ws.dist[cell], share, order))
+    return out, stats
+
+
+_COUNTERS = ('pops', 'pushes', 'expansions', 'stale_pops')
+
+
+def _shares(settled_at, cells, stats):
+    """Chia bộ đếm của nhóm cho từng ô đích theo thứ tự được chốt; tổng các phần bằng stats."""
+    order = sorted({c for c in cells if c in settled_at}, key=lambda c: settled_at[c][5])
+    shares = {}
+    prev = (0, 0, 0, 0)
+    for c in order:
+        snap = settled_at[c]
+        share = shares[c] = logic.SearchStats()
+        for name, now, before in zip(_COUNTERS, snap, prev):
+            setattr(share, name, now - before)
+        share.peak_open, share.peak_closed = snap[4], snap[5]
+        prev = snap[:4]
+    # Công việc sau lần chốt cuối: của truy vấn không tới được đầu tiên, hoặc của truy vấn chốt cuối
+    unreached = [c for c in cells if c not in settled_at]
+    owner = unreached[0] if unreached else (order[-1] if order else None)
+    if owner is not None:
+        share = shares.setdefault(owner, logic.SearchStats())
+        for name, before in zip(_COUNTERS, prev):
+            setattr(share, name, getattr(share, name) + getattr(stats, name) - before)
+        if owner in unreached:
+            share.peak_open, share.peak_closed = stats.peak_open, stats.peak_closed
+    for share in shares.values():
+        share.cpu_time = stats.cpu_time * share.pops / stats.pops if stats.pops else 0.0
+    return shares
+
+
+def _stats_from_dict(values):
+    stats = logic.SearchStats()
+    for name, value in values.items():
+        setattr(stats, name, value)
+    return stats
+
+
+def _normalize(queries):
+    return [(tuple(start), tuple(goal)) for start, goal in queries]
+
+
+def solve_many(grid, queries, algorithm='Dijkstra', processes=None, workspace=None, components=None):
+    """Giải mọi truy vấn; trả về list QueryResult theo đúng thứ tự đầu vào.
+
+    algorithm: 'Dijkstra' / 'A*' (8 hướng, octile) hoặc 'BFS' (4 hướng).
+    processes: số tiến trình (None = chạy trong tiến trình hiện tại).
+    workspace: SearchWorkspace để dùng lại giữa nhiều lần gọi trên cùng lưới.
+    components: ComponentIndex của lưới để dùng lại (None = tạo mới).
+    """
+    try:
+        moves = MODELS[algorithm]
+    except KeyError:
+        raise ValueError(f'Unknown algorithm for batch solving: {algorithm}')
+    queries = _normalize(queries)
+    results = [None] * len(queries)
+    components = components or ComponentIndex(grid)
+    reachable = []
+    for i, (start, goal) in enumerate(queries):
+        if components.connected(start, goal, moves):
+            reachable.append(i)
+        else:
+            results[i] = QueryResult(start, goal, [], None, logic.SearchStats(), logic.SearchStats(), 0)
+    # group_queries đánh số theo danh sách con: đổi về chỉ số gốc
+    groups = [(key, [reachable[j] for j in indices])
+              for key, indices in group_queries([queries[i] for i in reachable])]
+    if processes and processes > 1 and len(groups) > 1:
+        solved = _solve_in_pool(grid, queries, groups, moves, processes)
+    else:
+        ws = workspace or SearchWorkspace.from_grid(grid)
+        solved = (_solve_group(ws, queries, key, indices, moves) for key, indices in groups)
+    for out, stats in solved:
+        for i, path, cost, share, order in out:
+            start, goal = queries[i]
+            results[i] = QueryResult(start, goal, path, cost, share, stats, len(out), order)
+    return results
+
+
+# --- Chia nhóm cho nhiều tiến trình ---
+_pool_ws = {}  # handle -> (SharedArray, SearchWorkspace): mỗi tiến trình con giữ bản của lưới gần nhất
+
+
+def _pool_task(args):
+    handle, queries, key, indices, moves = args
+    from WOM_MAZE_SHARED import SharedArray
+    entry = _pool_ws.get(handle)
+    if entry is None:
+        for shared, _ in _pool_ws.values():
+            shared.release()
+        _pool_ws.clear()
+        shared = SharedArray.attach(handle)
+        entry = _pool_ws[handle] = (shared, SearchWorkspace(shared.view, handle.shape[0]))
+    ws = entry[1]
+    out, stats = _solve_group(ws, queries, key, indices, moves)
+    return [(i, path, cost, share.as_dict(), order) for i, path, cost, share, order in out], stats.as_dict()
+
+
+def _solve_in_pool(grid, queries, groups, moves, processes):
+    import multiprocessing as mp
+    from WOM_MAZE_SHARED import share_grid
+    shared = share_grid([[1 if v == 1 else 0 for v in row] for row in grid])
+    try:
+        tasks = [(shared.handle, [queries[i] for i in indices], key, list(range(len(indices))), moves)
+                 for key, indices in groups]
+        with mp.Pool(processes) as pool:
+            chunks = pool.map(_pool_task, tasks, chunksize=max(1, len(tasks) // (processes * 4)))
+    finally:
+        shared.release()
+    solved = []
+    for (key, indices), (out, stats_dict) in zip(groups, chunks):
+        solved.append(([(indices[j], path, cost, _stats_from_dict(share), order)
+                        for j, path, cost, share, order in out], _stats_from_dict(stats_dict)))
+    return solved
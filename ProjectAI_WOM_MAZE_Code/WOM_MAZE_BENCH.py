@@ -0,0 +1,181 @@
+"""Benchmark không giao diện cho các thuật toán tìm đường và sinh mê cung.
+
+Chạy mọi thuật toán tìm đường x mọi thuật toán sinh mê cung x dãy kích thước,
+với seed cố định, rồi ghi kết quả ra JSON. Chế độ so sánh đối chiếu với một
+file baseline đã lưu và báo các trường hợp chậm đi.
+
+    python WOM_MAZE_BENCH.py --sizes 50 100 --output bench.json
+    python WOM_MAZE_BENCH.py --sizes 50 100 --compare bench.json
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import WOM_MAZE_LOGIC as logic
+
+SIZES = [50, 100, 250, 500, 1000, 2000, 4000]
+DEFAULT_SEED = 2025
+
+# Tên hiển thị -> (thuật toán, heuristic) trong WOM_MAZE_LOGIC
+SOLVERS = {
+    'BFS': ('BFS', None),
+    'Bidirectional BFS': ('Bidirectional BFS', None),
+    'DFS': ('DFS', None),
+    'Dijkstra': ('Dijkstra', None),
+    'A* Manhattan': ('A*', 'Manhattan'),
+    'A* Euclidean': ('A*', 'Euclidean'),
+    'A* Octile': ('A*', 'Octile'),
+}
+
+
+# --- Chuẩn bị một trường hợp đo ---
+def make_case(generator, n, seed):
+    """Sinh mê cung với seed cố định; trả về (grid, start, goal, thời gian sinh)."""
+    random.seed(seed)
+    t0 = time.perf_counter()
+    grid = logic.generate_maze(n, generator)
+    gen_time = time.perf_counter() - t0
+    start = logic.find_nearest_empty(grid, (0, 0))
+    goal = logic.find_nearest_empty(grid, (n - 1, n - 1))
+    return grid, start, goal, gen_time
+
+
+def run_solver(solver, grid, start, goal, stats=None):
+    """Chạy hết generator, trả về độ dài đường đi."""
+    algorithm, heuristic = solver
+    path_length = 0
+    for typ, _ in logic.solver_generator(algorithm, grid, start, goal, heuristic, stats):
+        if typ == 'path':
+            path_length += 1
+    return path_length
+
+
+def measure(solver, grid, start, goal, repeat=3, memory=True):
+    """Đo thời gian (trung vị qua repeat lần), bộ đếm tìm kiếm và bộ nhớ đỉnh."""
+    algorithm, heuristic = solver
+    timing = logic.time_solver(grid, start, goal, algorithm, heuristic, repeat)
+    # Lần chạy riêng có bộ đếm, để số đo thời gian ở trên không bị ảnh hưởng
+    stats = logic.SearchStats()
+    run_solver(solver, grid, start, goal, stats)
+    result = {
+        'wall_s': timing['median_ns'] / 1e9,
+        'wall_min_s': timing['min_ns'] / 1e9,
+        'wall_max_s': timing['max_ns'] / 1e9,
+        'path_length': timing['path_length'],
+    }
+    result.update(stats.as_dict())
+    if memory:
+        # tracemalloc làm chậm nên cũng chạy riêng
+        tracemalloc.start()
+        run_solver(solver, grid, start, goal)
+        result['peak_mem_kb'] = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+    return result
+
+
+def run_benchmark(sizes=SIZES, generators=None, solvers=None, seed=DEFAULT_SEED,
+                  repeat=3, memory=True, log=print):
+    """Chạy toàn bộ ma trận benchmark, trả về dict sẵn sàng ghi JSON."""
+    generators = generators or list(logic.MAZE_GENERATORS)
+    solvers = solvers or list(SOLVERS)
+    results = []
+    for generator in generators:
+        for n in sizes:
+            grid, start, goal, gen_time = make_case(generator, n, seed)
+            for name in solvers:
+                row = {
+                    'generator': generator,
+                    'size': n,
+                    'solver': name,
+                    'seed': seed,
+                    'start': list(start),
+                    'goal': list(goal),
+                    'generate_s': gen_time,
+                }
+                row.update(measure(SOLVERS[name], grid, start, goal, repeat, memory))
+                results.append(row)
+                if log:
+                    log(f"{generator:<24}{n:>6}  {name:<14}{row['wall_s'] * 1000:>10.2f} ms"
+                        f"{row['expansions']:>10} exp{row['pushes']:>10} push")
+    return {
+        'meta': {
+            'python': sys.version.split()[0],
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'repeat': repeat,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+# --- So sánh với baseline ---
+def _key(row):
+    return (row['generator'], row['size'], row['solver'])
+
+
+def compare(current, baseline, threshold=0.15):
+    """Trả về các dòng chậm hơn hoặc duyệt nhiều ô hơn baseline quá threshold (tỉ lệ)."""
+    base = {_key(row): row for row in baseline['results']}
+    regressions = []
+    for row in current['results']:
+        old = base.get(_key(row))
+        if old is None:
+            continue
+        for metric in ('wall_s', 'expansions'):
+            if not old.get(metric) or metric not in row:
+                continue
+            ratio = row[metric] / old[metric]
+            if ratio > 1 + threshold:
+                regressions.append({
+                    'generator': row['generator'],
+                    'size': row['size'],
+                    'solver': row['solver'],
+                    'metric': metric,
+                    'baseline': old[metric],
+                    'current': row[metric],
+                    'ratio': ratio,
+                })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='WOM MAZE benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--generators', nargs='+', choices=list(logic.MAZE_GENERATORS))
+    parser.add_argument('--solvers', nargs='+', choices=list(SOLVERS))
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc pass')
+    parser.add_argument('--output', help='write results to this JSON file')
+    parser.add_argument('--compare', metavar='BASELINE', help='baseline JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='allowed slowdown ratio before flagging a regression')
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.sizes, args.generators, args.solvers, args.seed,
+                           args.repeat, not args.no_memory)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for reg in regressions:
+            print(f"REGRESSION {reg['generator']} n={reg['size']} {reg['solver']} "
+                  f"{reg['metric']}: {reg['baseline']:.6g} -> {reg['current']:.6g} "
+                  f"(x{reg['ratio']:.2f})")
+        if regressions:
+            return 1
+        print('No regressions.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
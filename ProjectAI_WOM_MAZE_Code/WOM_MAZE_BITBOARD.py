@@ -0,0 +1,151 @@
+"""Bitboard: kiểm tra liên thông / tìm ô trống gần nhất bằng phép dịch bit trên số nguyên lớn.
+
+Mặt nạ ô trống của cả lưới được gói vào một số nguyên Python: ô (r, c) là
+bit r * W + c với W = n + 1, cột thừa c = n luôn là 0 để phép dịch ngang
+không tràn sang hàng bên cạnh. Một lần loang là vài phép dịch / and / or trên
+cả bàn cờ (chạy trong C theo từng word), thay cho việc xét từng tuple như BFS.
+Theo chiều tăng của bit (sang phải) dùng thêm mẹo phép cộng: ((x + m) ^ m) & m
+lấp một lần hết đoạn ô trống liên tiếp phía sau mỗi bit của x.
+
+    board = Bitboard(grid)
+    board.reachable(start, end)     # có đường 4 hướng qua các ô trống?
+    board.component_of(start)       # tập ô cùng vùng liên thông
+    board.nearest_open(pos)         # như logic.find_nearest_empty
+    grid[r][c] ^= 1; board.update([(r, c)])   # đồng bộ sau khi lưới đổi
+"""
+
+# Byte của ô -> chữ số nhị phân: chỉ giá trị 0 là ô trống
+_OPEN_DIGITS = bytes(ord('1') if v == 0 else ord('0') for v in range(256))
+# Thứ tự ưu tiên khi nhiều ô cách đều: theo thứ tự hướng của logic.get_neighbors (xuống, lên, phải, trái)
+_DIRECTION_RANK = {(1, 0): 0, (-1, 0): 1, (0, 1): 2, (0, -1): 3}
+
+
+def _tie_key(pos, cell):
+    dr, dc = cell[0] - pos[0], cell[1] - pos[1]
+    first = (1, 0) if dr > 0 else (-1, 0) if dr < 0 else (0, 1) if dc > 0 else (0, -1)
+    return _DIRECTION_RANK[first], -abs(dr), -dc
+
+
+class Bitboard:
+    """Mặt nạ ô trống (grid == 0) của lưới vuông n*n dưới dạng một số nguyên."""
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.n = n = len(grid)
+        self.width = W = n + 1
+        # Chuỗi nhị phân: hàng cuối đứng đầu (bit cao), mỗi hàng là cột thừa '0' rồi các ô đảo ngược
+        digits = b''.join(b'0' + bytes(row[::-1]).translate(_OPEN_DIGITS) for row in reversed(grid))
+        self.open = int(digits, 2) if n else 0
+        # Mọi ô trong lưới (trừ cột thừa): dùng khi loang xuyên tường
+        self.cells_mask = ((1 << n) - 1) * (((1 << (W * n)) - 1) // ((1 << W) - 1)) if n else 0
+
+    # --- Chuyển đổi ô <-> bit ---
+    def bit(self, cell):
+        return 1 << (cell[0] * self.width + cell[1])
+
+    def is_open(self, cell):
+        return (self.open >> (cell[0] * self.width + cell[1])) & 1 == 1
+
+    def cells(self, mask):
+        """Danh sách ô (r, c) ứng với các bit 1 của mask, theo thứ tự hàng."""
+        digits = bin(mask)[:1:-1]  # bit thấp trước
+        out = []
+        i = digits.find('1')
+        while i >= 0:
+            out.append(divmod(i, self.width))
+            i = digits.find('1', i + 1)
+        return out
+
+    def update(self, cells):
+        """Đồng bộ mặt nạ với self.grid tại các ô vừa đổi; trả về số ô thực sự đổi."""
+        changed = 0
+        for r, c in cells:
+            b = 1 << (r * self.width + c)
+            now = b if self.grid[r][c] == 0 else 0
+            if (self.open & b) != now:
+                self.open ^= b
+                changed += 1
+        return changed
+
+    # --- Loang ---
+    def _grow(self, x):
+        """x cộng thêm mọi ô trống kề 4 hướng (sang phải: cả đoạn liền kề)."""
+        m, W = self.open, self.width
+        return (x | x >> 1 | x << W | x >> W | (((x + m) ^ m) & m)) & m
+
+    def component_mask(self, cell):
+        """Bitmask vùng liên thông chứa cell (0 nếu cell là tường)."""
+        x = self.bit(cell) & self.open
+        while True:
+            y = self._grow(x)
+            if y == x:
+                return x
+            x = y
+
+    def component_of(self, cell):
+        """Tập ô cùng vùng liên thông 4 hướng với cell (rỗng nếu cell là tường)."""
+        return set(self.cells(self.component_mask(cell)))
+
+    def reachable(self, a, b):
+        """Có đường 4 hướng qua các ô trống từ a tới b không.
+
+        Loang luân phiên từ cả hai đầu: dừng khi hai vùng chạm nhau, hoặc khi
+        một bên hết chỗ loang (vùng nhỏ hơn quyết định thời gian khi không có đường).
+        """
+        if a == b:
+            return True
+        x = self.bit(a) & self.open
+        y = self.bit(b) & self.open
+        if not x or not y:
+            return False
+        grow = self._grow
+        while True:
+            nx = grow(x)
+            if nx & y:
+                return True
+            if nx == x:
+                return False
+            x = nx
+            ny = grow(y)
+            if ny & x:
+                return True
+            if ny == y:
+                return False
+            y = ny
+
+    def nearest_open(self, pos):
+        """Ô trống gần pos nhất theo số bước 4 hướng được đi xuyên tường (pos nếu không có).
+
+        Giống logic.find_nearest_empty: quả cầu Manhattan quanh pos lớn dần bằng
+        phép dịch cho tới khi chạm ô trống; nhiều ô cách đều thì ưu tiên theo
+        thứ tự hướng của get_neighbors. Chỉ dải hàng quanh pos được cắt ra để
+        dịch (rộng gấp đôi mỗi khi quả cầu chạm mép dải), nên ô trống ở gần thì
+        chi phí không phụ thuộc kích thước lưới.
+        """
+        pos = tuple(pos)
+        if self.is_open(pos):
+            return pos
+        r, c = pos
+        n, W = self.n, self.width
+        radius, step = 4, 0
+        lo, ball = r, 1 << c  # ball tính theo toạ độ trong dải, hàng lo là hàng 0
+        while True:
+            new_lo, hi = max(0, r - radius), min(n - 1, r + radius)
+            whole = new_lo == 0 and hi == n - 1
+            window = (1 << ((hi - new_lo + 1) * W)) - 1
+            opened = (self.open >> (new_lo * W)) & window
+            full = self.cells_mask & window
+            ball <<= (lo - new_lo) * W
+            lo = new_lo
+            # Quả cầu bán kính <= radius còn nằm trọn trong dải
+            while whole or step < radius:
+                grown = (ball | ball << 1 | ball >> 1 | ball << W | ball >> W) & full
+                step += 1
+                if grown == ball:
+                    return pos
+                hit = grown & ~ball & opened
+                if hit:
+                    cells = [(rr + lo, cc) for rr, cc in self.cells(hit)]
+                    return min(cells, key=lambda cell: _tie_key(pos, cell))
+                ball = grown
+            radius *= 2
@@ -0,0 +1,141 @@
+"""So sánh N cấu hình thuật toán trên cùng một mê cung, chạy đồng bộ theo lượt.
+
+Mỗi lượt, mọi thuật toán còn chạy được tiến thêm một lượng như nhau:
+    - 'expansions': cùng số lần mở rộng nút (stats.expansions), công bằng theo công việc;
+    - 'time'      : cùng một lát thời gian CPU, công bằng theo thời gian thực chạy.
+Thuật toán đã xong (hoặc bị dừng riêng) được bỏ qua ở các lượt sau; các
+thuật toán khác vẫn tiếp tục.
+
+    engine = ComparisonEngine(grid, start, goal, ['BFS', 'A* Octile'], mode='expansions')
+    for index, typ, cell in engine.events():
+        ...
+"""
+import WOM_MAZE_LOGIC as logic
+
+# Tên hiển thị -> (thuật toán, heuristic)
+CONFIGURATIONS = {
+    'BFS': ('BFS', None),
+    'Bidirectional BFS': ('Bidirectional BFS', None),
+    'DFS': ('DFS', None),
+    'Dijkstra': ('Dijkstra', None),
+    'A* Manhattan': ('A*', 'Manhattan'),
+    'A* Euclidean': ('A*', 'Euclidean'),
+    'A* Chebyshev': ('A*', 'Chebyshev'),
+    'A* Octile': ('A*', 'Octile'),
+    'A* Tie-breaking': ('A*', 'Tie-breaking'),
+}
+MODES = ('expansions', 'time')
+
+
+class Contender:
+    """Trạng thái của một cấu hình trong cuộc so sánh."""
+
+    def __init__(self, name, grid, start, goal):
+        self.name = name
+        self.algorithm, self.heuristic = CONFIGURATIONS[name]
+        self.stats = logic.SearchStats()
+        self.gen = logic.solver_generator(self.algorithm, grid, start, goal,
+                                          self.heuristic or 'Manhattan', self.stats)
+        self.visited = 0
+        self.path = 0
+        self.rounds = 0          # số lượt đã dùng đến khi xong
+        self.done = False
+        self.stopped = False     # bị người dùng dừng riêng
+
+    @property
+    def status(self):
+        if self.stopped:
+            return 'stopped'
+        if self.done:
+            return 'found' if self.path else 'no path'
+        return 'running'
+
+
+class ComparisonEngine:
+    """Chạy nhiều Contender theo từng lượt dưới một bộ lập lịch chung."""
+
+    def __init__(self, grid, start, goal, names, mode='expansions', quantum=None):
+        if mode not in MODES:
+            raise ValueError(f'unknown mode {mode!r}, expected one of {MODES}')
+        self.mode = mode
+        # Mặc định: 1 lần mở rộng mỗi lượt, hoặc lát 1 ms
+        self.quantum = quantum if quantum is not None else (1 if mode == 'expansions' else 0.001)
+        self.contenders = [Contender(name, grid, start, goal) for name in names]
+        self.round = 0
+
+    def stop(self, index):
+        """Dừng riêng một thuật toán; generator được đóng ở lượt kế tiếp."""
+        self.contenders[index].stopped = True
+
+    @property
+    def finished(self):
+        return all(c.done or c.stopped for c in self.contenders)
+
+    def _advance(self, c):
+        """Cho một thuật toán chạy hết phần của nó trong lượt này; trả về các sự kiện."""
+        out = []
+        stats = c.stats
+        # solver_generator đã bọc generator bằng timed_steps: stats.cpu_time tự tăng theo công việc thật
+        try:
+            if self.mode == 'expansions':
+                target = stats.expansions + self.quantum
+                while stats.expansions < target:
+                    out.append(next(c.gen))
+            else:
+                deadline = stats.cpu_time + self.quantum
+                while True:
+                    out.append(next(c.gen))
+                    if stats.cpu_time >= deadline:
+                        break
+        except StopIteration:
+            c.done = True
+            c.rounds = self.round
+        for typ, _ in out:
+            if typ == 'visit':
+                c.visited += 1
+            else:
+                c.path += 1
+        return out
+
+    def run_round(self):
+        """Một lượt: trả về danh sách (chỉ số, sự kiện) theo thứ tự các thuật toán."""
+        self.round += 1
+        result = []
+        for i, c in enumerate(self.contenders):
+            if c.done:
+                continue
+            if c.stopped:
+                c.gen.close()
+                c.done = True
+                c.rounds = self.round
+                continue
+            result.append((i, self._advance(c)))
+        return result
+
+    def events(self):
+        """Sinh (chỉ số, loại, ô) cho đến khi mọi thuật toán xong hoặc bị dừng."""
+        while not self.finished:
+            for i, batch in self.run_round():
+                for typ, cell in batch:
+                    yield i, typ, cell
+
+    def run(self):
+        """Chạy không giao diện đến hết; trả về các Contender."""
+        while not self.finished:
+            self.run_round()
+        return self.contenders
+
+
+# --- Đo thời gian thực và xếp hạng ---
+def time_configurations(grid, start, goal, names, repeat=5):
+    """Đo thời gian thực (không hoạt hình, không chạy đồng bộ) của từng cấu hình.
+
+    Trả về danh sách dict của logic.time_solver theo đúng thứ tự names.
+    """
+    return [logic.time_solver(grid, start, goal, *CONFIGURATIONS[name], repeat=repeat) for name in names]
+
+
+def ranking(values):
+    """Thứ hạng 1..n theo giá trị tăng dần; các giá trị bằng nhau cùng hạng."""
+    order = sorted(values)
+    return [order.index(v) + 1 for v in values]
@@ -1,18 +1,27 @@
 import customtkinter as ctk
 import tkinter as tk
+import math
 import WOM_MAZE_LOGIC as logic
-import time
+from WOM_MAZE_COMPARE import CONFIGURATIONS, ComparisonEngine, time_configurations, ranking
+from WOM_MAZE_RENDER import GridRenderer, FrameScheduler, speed_to_rate
+from WOM_MAZE_WORKER import SearchWorker, MazePool, run_in_background
 
 ctk.set_appearance_mode('light')
 ctk.set_default_color_theme('green')
 
-ALGORITHMS = ['BFS', 'DFS', 'Dijkstra', 'A*']
 COLORS = {
     'BFS': {'visit': '#FFA500', 'path': '#FF4500'},
+    'Bidirectional BFS': {'visit': '#FFD700', 'path': '#B8860B'},
     'DFS': {'visit': '#00CED1', 'path': '#008B8B'},
     'Dijkstra': {'visit': '#9370DB', 'path': '#4B0082'},
     'A*': {'visit': '#4682B4', 'path': '#00008B'}
 }
+MODES = {'Theo số lần mở rộng': 'expansions', 'Theo lát thời gian CPU': 'time'}
+METRICS = ['Thuật toán', 'Visited', 'Path length', 'Expansions', 'Push / Pop', 'Peak open', 'CPU (ms)', 'Trạng thái',
+           'Real time (ms)', 'Hạng (thời gian)', 'Hạng (mở rộng)']
+RESIZE_DELAY_MS = 250  # thanh trượt kích thước đứng yên chừng này thì mới tạo mê cung
+TITLE_HEIGHT = 20  # chiều cao dòng tiêu đề phía trên mỗi ô lưới
+
 
 class MazeCompareApp(ctk.CTk):
     def __init__(self):
@@ -23,348 +32,262 @@ class MazeCompareApp(ctk.CTk):
         self.grid_data = None
         self.start = (0, 0)
         self.end = (self.grid_size-1, self.grid_size-1)
-        self.delay = 30
-        self.metrics = [{}, {}]
-        self.running = False
+        self.speed = 10
+        self.engine = None
+        self.worker = None
+        self.scheduler = None
+        # Mê cung cho kích thước đang chọn được sinh trước ở luồng nền
+        self.maze_pool = MazePool(logic.generate_maze)
+        self.resize_job = None
+        self.renderers = []
+        self.names = []
+        self.counts = []
+        self.timing_token = 0
 
         # --- Panel chọn thuật toán và điều khiển ---
         control = ctk.CTkFrame(self, width=320, fg_color='#00a000')
         control.pack(side=tk.LEFT, fill=tk.Y, padx=0, pady=0)
-        ctk.CTkLabel(control, text='So sánh hai thuật toán', font=('Arial', 20, 'bold'), text_color='white').pack(pady=(20,10))
-        ctk.CTkLabel(control, text='Thuật toán 1', text_color='white').pack(pady=(10,2))
-        self.combo1 = ctk.CTkComboBox(control, values=ALGORITHMS, width=260)
-        self.combo1.set('BFS')
-        self.combo1.pack(pady=(0,10))
-        ctk.CTkLabel(control, text='Thuật toán 2', text_color='white').pack(pady=(10,2))
-        self.combo2 = ctk.CTkComboBox(control, values=ALGORITHMS, width=260)
-        self.combo2.set('A*')
-        self.combo2.pack(pady=(0,10))
+        ctk.CTkLabel(control, text='So sánh thuật toán', font=('Arial', 20, 'bold'), text_color='white').pack(pady=(20,10))
+        ctk.CTkLabel(control, text='Cấu hình', text_color='white').pack(pady=(10,2))
+        self.config_vars = {}
+        for name in CONFIGURATIONS:
+            var = tk.BooleanVar(value=name in ('BFS', 'A* Manhattan'))
+            ctk.CTkCheckBox(control, text=name, variable=var, text_color='white', width=260).pack(pady=2, padx=30, anchor='w')
+            self.config_vars[name] = var
+        ctk.CTkLabel(control, text='Chạy đồng bộ', text_color='white').pack(pady=(10,2))
+        self.combo_mode = ctk.CTkComboBox(control, values=list(MODES), width=260)
+        self.combo_mode.set('Theo số lần mở rộng')
+        self.combo_mode.pack(pady=(0,10))
         ctk.CTkLabel(control, text='Kích thước lưới', text_color='white').pack(pady=(10,2))
         self.size_slider = ctk.CTkSlider(control, from_=10, to=60, number_of_steps=50, command=self.update_size)
         self.size_slider.set(self.grid_size)
         self.size_slider.pack(pady=(0,5))
         self.size_label = ctk.CTkLabel(control, text=str(self.grid_size), text_color='white')
         self.size_label.pack()
+        ctk.CTkLabel(control, text='Tốc độ', text_color='white').pack(pady=(10,2))
+        self.speed_slider = ctk.CTkSlider(control, from_=1, to=10, number_of_steps=9, command=self.update_speed)
+        self.speed_slider.set(self.speed)
+        self.speed_slider.pack(pady=(0,5))
+        self.speed_label = ctk.CTkLabel(control, text=str(self.speed), text_color='white')
+        self.speed_label.pack()
         self.btn_maze = ctk.CTkButton(control, text='Tạo mê cung', command=self.generate_maze, fg_color='white', text_color='black', hover_color='red', width=260)
         self.btn_maze.pack(pady=(20,5))
         self.btn_compare = ctk.CTkButton(control, text='So sánh', command=self.start_compare, fg_color='white', text_color='black', hover_color='red', width=260)
-        self.btn_compare.pack(pady=(5,20))
-        # --- Bảng số liệu ---
-        self.metrics_frame = ctk.CTkFrame(control, fg_color='#004d00', corner_radius=10)
-        self.metrics_frame.pack(fill=tk.X, padx=10, pady=10)
-        self.metric_labels = []
-        for i, name in enumerate(['Thuật toán 1', 'Thuật toán 2']):
-            ctk.CTkLabel(self.metrics_frame, text=name, text_color='white', font=('Arial', 14, 'bold')).grid(row=0, column=i+1, padx=10)
-        for idx, metric in enumerate(['Visited', 'Path length', 'Time (s)']):
-            ctk.CTkLabel(self.metrics_frame, text=metric+':', text_color='white').grid(row=idx+1, column=0, sticky='w', padx=5)
-            row_labels = []
-            for i in range(2):
-                lbl = ctk.CTkLabel(self.metrics_frame, text='0', text_color='white')
-                lbl.grid(row=idx+1, column=i+1, padx=10)
-                row_labels.append(lbl)
-            self.metric_labels.append(row_labels)
+        self.btn_compare.pack(pady=5)
+        self.btn_stop = ctk.CTkButton(control, text='Dừng tất cả', command=self.stop_compare, fg_color='white', text_color='black', hover_color='red', width=260)
+        self.btn_stop.pack(pady=(5,20))
 
-        # --- Hai canvas lưới ---
+        # --- Lưới các ô (một canvas, mỗi cấu hình một vùng) và bảng số liệu ---
         main_frame = ctk.CTkFrame(self, fg_color='white')
         main_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        self.canvas1 = tk.Canvas(main_frame, bg='white')
-        self.canvas2 = tk.Canvas(main_frame, bg='white')
-        self.canvas1.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10, pady=10)
-        self.canvas2.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10, pady=10)
-        self.canvas1.bind('<Configure>', lambda e: self.draw_grid(self.canvas1, 0))
-        self.canvas2.bind('<Configure>', lambda e: self.draw_grid(self.canvas2, 1))
-        self.cell_size = [None, None]
-        self.pad_x = [None, None]
-        self.pad_y = [None, None]
-        self.cells = [{}, {}]
-        self.generators = [None, None]
-        self.start_end = [self.start, self.end]
-        self.after_id = None
+        self.metrics_frame = ctk.CTkFrame(main_frame, fg_color='#004d00', corner_radius=10)
+        self.metrics_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=10)
+        self.metric_labels = []
+        self.canvas = tk.Canvas(main_frame, bg='white')
+        self.canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.canvas.bind('<Configure>', lambda e: self.draw_tiles())
+        self.canvas.bind('<Button-1>', self.on_tile_click)
         self.generate_maze()
 
     def update_size(self, val):
         self.grid_size = int(val)
         self.size_label.configure(text=str(self.grid_size))
-        self.generate_maze()
+        # Kéo thanh trượt: chỉ sinh trước ở luồng nền, tạo mê cung khi thanh trượt dừng
+        self.maze_pool.select(self.grid_size, 'Recursive Backtracking')
+        if self.resize_job is not None:
+            self.after_cancel(self.resize_job)
+        self.resize_job = self.after(RESIZE_DELAY_MS, self.generate_maze)
 
-    def find_nearest_empty(self, grid, pos):
-        from collections import deque
-        n = len(grid)
-        visited = set()
-        queue = deque([pos])
-        while queue:
-            r, c = queue.popleft()
-            if grid[r][c] == 0:
-                return (r, c)
-            for dr, dc in [(-1,0),(1,0),(0,-1),(0,1)]:
-                nr, nc = r+dr, c+dc
-                if 0 <= nr < n and 0 <= nc < n and (nr, nc) not in visited:
-                    visited.add((nr, nc))
-                    queue.append((nr, nc))
-        return pos
+    def update_speed(self, val):
+        self.speed = int(val)
+        self.speed_label.configure(text=str(self.speed))
+        if self.scheduler is not None:
+            self.scheduler.set_rate(self.total_rate())
+
+    def total_rate(self):
+        """Mỗi cấu hình nhận cùng tốc độ, nên tổng tốc độ tỉ lệ với số cấu hình."""
+        rate = speed_to_rate(self.speed)
+        return None if rate is None else rate * max(1, len(self.names))
+
+    def selected_names(self):
+        return [name for name, var in self.config_vars.items() if var.get()]
 
     def generate_maze(self):
+        self.stop_compare()
+        self.engine = None
         n = self.grid_size
-        self.grid_data = logic.generate_maze(n, 'Recursive Backtracking')
-        self.start = self.find_nearest_empty(self.grid_data, (0, 0))
-        self.end = self.find_nearest_empty(self.grid_data, (n-1, n-1))
-        self.start_end = [self.start, self.end]
-        for i in range(2):
-            self.draw_grid(self.canvas1 if i==0 else self.canvas2, i)
-        for row_labels in self.metric_labels:
-            for lbl in row_labels:
-                lbl.configure(text='0')
+        self.grid_data = self.maze_pool.get(n, 'Recursive Backtracking')
+        self.start = logic.find_nearest_empty(self.grid_data, (0, 0))
+        self.end = logic.find_nearest_empty(self.grid_data, (n-1, n-1))
+        self.names = self.selected_names()
+        self.build_metric_rows()
+        self.draw_tiles()
 
-    def draw_grid(self, canvas, idx):
-        n = self.grid_size
-        canvas.delete('all')
-        w, h = canvas.winfo_width(), canvas.winfo_height()
-        cell = min(w / n, h / n)
-        total = cell * n
-        pad_x = (w - total) / 2
-        pad_y = (h - total) / 2
-        self.cell_size[idx] = cell
-        self.pad_x[idx] = pad_x
-        self.pad_y[idx] = pad_y
-        self.cells[idx] = {}
-        for row in range(n):
-            for col in range(n):
-                x1 = pad_x + col * cell
-                y1 = pad_y + row * cell
-                x2 = x1 + cell
-                y2 = y1 + cell
-                fill_color = 'black' if self.grid_data and self.grid_data[row][col] == 1 else 'white'
-                rect = canvas.create_rectangle(x1, y1, x2, y2, fill=fill_color, outline='gray')
-                self.cells[idx][(row, col)] = rect
-        # Vẽ start/end
-        s, e = self.start_end
-        if s in self.cells[idx]:
-            x = pad_x + s[1] * cell
-            y = pad_y + s[0] * cell
-            canvas.create_line(x + cell*0.2, y + cell*0.2, x + cell*0.2, y + cell*0.8, fill='black', width=2)
+    # --- Vẽ ---
+    def base_color(self, r, c):
+        return 'black' if self.grid_data and self.grid_data[r][c] == 1 else 'white'
+
+    def tile_regions(self, count):
+        """Chia canvas thành lưới gần vuông gồm count ô; trả về (x, y, w, h) của từng ô."""
+        w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
+        cols = max(1, math.ceil(math.sqrt(count)))
+        rows = max(1, math.ceil(count / cols))
+        tw, th = w / cols, h / rows
+        return [((i % cols) * tw, (i // cols) * th, tw, th) for i in range(count)]
+
+    def draw_tiles(self):
+        if self.canvas.winfo_width() < 10 or self.canvas.winfo_height() < 10:
+            return  # canvas chưa hiển thị; sự kiện <Configure> sẽ vẽ lại
+        self.canvas.delete('all')
+        self.renderers = []
+        for i, (x, y, w, h) in enumerate(self.tile_regions(len(self.names))):
+            name = self.names[i]
+            self.canvas.create_text(x + w/2, y + TITLE_HEIGHT/2, text=f'{name}  (click to stop)',
+                                    font=('Arial', 11, 'bold'), tags='title')
+            renderer = GridRenderer(self.canvas, region=(x + 4, y + TITLE_HEIGHT, w - 8, h - TITLE_HEIGHT - 4))
+            renderer.layout(self.grid_size, self.base_color)
+            self.renderers.append(renderer)
+            self.draw_icons(renderer)
+
+    def draw_icons(self, renderer):
+        cell = renderer.cell_size
+        if renderer.in_grid(self.start):
+            x, y = renderer.cell_origin(self.start)
+            self.canvas.create_line(x + cell*0.2, y + cell*0.2, x + cell*0.2, y + cell*0.8, fill='black', width=2, tags='icon')
             points = [x + cell*0.2, y + cell*0.2, x + cell*0.7, y + cell*0.4, x + cell*0.2, y + cell*0.6]
-            canvas.create_polygon(points, fill='green', outline='black')
-        if e in self.cells[idx]:
-            x = pad_x + e[1] * cell
-            y = pad_y + e[0] * cell
+            self.canvas.create_polygon(points, fill='green', outline='black', tags='icon')
+        if renderer.in_grid(self.end):
+            x, y = renderer.cell_origin(self.end)
             center_x = x + cell/2
             center_y = y + cell/2
             radius = cell * 0.4
             for i in range(3):
                 r = radius * (1 - i * 0.2)
                 if r > 1:
-                    canvas.create_oval(center_x-r, center_y-r, center_x+r, center_y+r, outline='red', width=2)
+                    self.canvas.create_oval(center_x-r, center_y-r, center_x+r, center_y+r, outline='red', width=2, tags='icon')
             dot_radius = max(2, cell * 0.1)
-            canvas.create_oval(center_x-dot_radius, center_y-dot_radius, center_x+dot_radius, center_y+dot_radius, fill='red', outline='red')
+            self.canvas.create_oval(center_x-dot_radius, center_y-dot_radius, center_x+dot_radius, center_y+dot_radius, fill='red', outline='red', tags='icon')
 
+    # --- Bảng số liệu: mỗi cấu hình một hàng ---
+    def build_metric_rows(self):
+        for child in self.metrics_frame.winfo_children():
+            child.destroy()
+        for col, metric in enumerate(METRICS):
+            ctk.CTkLabel(self.metrics_frame, text=metric, text_color='white', font=('Arial', 12, 'bold')).grid(row=0, column=col, padx=8)
+        self.metric_labels = []
+        for i, name in enumerate(self.names):
+            row_labels = []
+            for col in range(len(METRICS)):
+                lbl = ctk.CTkLabel(self.metrics_frame, text=name if col == 0 else ('0' if col < 8 else '-'),
+                                   text_color='white')
+                lbl.grid(row=i+1, column=col, padx=8)
+                row_labels.append(lbl)
+            self.metric_labels.append(row_labels)
+
+    def update_metric_labels(self):
+        """Cập nhật toàn bộ bảng một lần mỗi khung hình."""
+        if self.engine is None:
+            return
+        for i, contender in enumerate(self.engine.contenders):
+            stats = contender.stats
+            visited, path = self.counts[i]
+            labels = self.metric_labels[i]
+            labels[1].configure(text=str(visited))
+            labels[2].configure(text=str(path))
+            labels[3].configure(text=str(stats.expansions))
+            labels[4].configure(text=f'{stats.pushes} / {stats.pops}')
+            labels[5].configure(text=str(stats.peak_open))
+            labels[6].configure(text=f'{stats.cpu_time * 1000:.2f}')
+            labels[7].configure(text=contender.status)
+
+    # --- Chạy so sánh ---
     def start_compare(self):
-        if self.running:
+        self.stop_compare()
+        names = self.selected_names()
+        if not names:
             return
-        self.running = True
-        self.metrics = [{}, {}]
-        for i in range(2):
-            for (r, c), rect in self.cells[i].items():
-                color = 'black' if self.grid_data and self.grid_data[r][c] == 1 else 'white'
-                (self.canvas1 if i==0 else self.canvas2).itemconfig(self.cells[i][(r, c)], fill=color)
-        self.generators = [self.get_generator(self.combo1.get(), 0), self.get_generator(self.combo2.get(), 1)]
-        self.metrics = [
-            {'visited': 0, 'path': 0, 'start_time': time.time()},
-            {'visited': 0, 'path': 0, 'start_time': time.time()}
-        ]
-        self.after_id_0 = self.after(self.delay, self.step_compare_0)
-        self.after_id_1 = self.after(self.delay, self.step_compare_1)
+        self.names = names
+        self.build_metric_rows()
+        self.draw_tiles()
+        self.counts = [[0, 0] for _ in names]
+        self.engine = ComparisonEngine(self.grid_data, self.start, self.end, names,
+                                       mode=MODES[self.combo_mode.get()])
+        self.colors = [COLORS[c.algorithm] for c in self.engine.contenders]
+        # Cả N thuật toán chạy trong một luồng nền, theo lượt; giao diện chỉ vẽ theo khung hình
+        self.worker = SearchWorker(self.engine.events()).start()
+        self.scheduler = FrameScheduler(self, self.worker.events(), self.apply_event,
+                                        on_frame=self.update_metric_labels, on_done=self.on_done,
+                                        rate=self.total_rate()).start()
 
-    def get_generator(self, algo, idx):
-        grid = self.grid_data
-        s, e = self.start_end
-        if algo == 'BFS':
-            return self.bfs_generator(grid, s, e, idx)
-        elif algo == 'DFS':
-            return self.dfs_generator(grid, s, e, idx)
-        elif algo == 'Dijkstra':
-            return self.dijkstra_generator(grid, s, e, idx)
+    def apply_event(self, i, typ, cell):
+        if typ == 'visit':
+            self.counts[i][0] += 1
         else:
-            return self.astar_generator(grid, s, e, idx)
+            self.counts[i][1] += 1
+        if cell != self.start and cell != self.end:
+            self.renderers[i].set_cell(cell, self.colors[i][typ])
 
-    def bfs_generator(self, grid, start, goal, idx):
-        from collections import deque
-        visited = {start}
-        queue = deque([start])
-        parent = {start: None}
-        while queue:
-            u = queue.popleft()
-            yield 'visit', u
-            if u == goal:
-                break
-            for v in logic.get_neighbors(u, len(grid)):
-                if v not in visited and grid[v[0]][v[1]] == 0:
-                    visited.add(v)
-                    parent[v] = u
-                    queue.append(v)
-                    yield 'visit', v
-        node = goal
-        path = []
-        while node is not None:
-            path.append(node)
-            node = parent.get(node)
-        for cell in reversed(path):
-            yield 'path', cell
+    def on_tile_click(self, event):
+        """Dừng riêng thuật toán của ô được click; các thuật toán khác vẫn chạy."""
+        if self.engine is None:
+            return
+        for i, (x, y, w, h) in enumerate(self.tile_regions(len(self.names))):
+            if x <= event.x < x + w and y <= event.y < y + h:
+                self.engine.stop(i)
+                return
 
-    def dfs_generator(self, grid, start, goal, idx):
-        visited = set()
-        stack = [start]
-        parent = {start: None}
-        while stack:
-            u = stack.pop()
-            if u in visited:
-                continue
-            visited.add(u)
-            yield 'visit', u
-            if u == goal:
-                break
-            for v in logic.get_neighbors(u, len(grid)):
-                if v not in visited and grid[v[0]][v[1]] == 0:
-                    parent[v] = u
-                    stack.append(v)
-                    yield 'visit', v
-        node = goal
-        path = []
-        while node is not None:
-            path.append(node)
-            node = parent.get(node)
-        for cell in reversed(path):
-            yield 'path', cell
+    def stop_compare(self):
+        """Huỷ toàn bộ lần so sánh đang chạy (nếu có)."""
+        self.timing_token += 1
+        if self.scheduler is not None:
+            self.scheduler.stop()
+            self.scheduler = None
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+        if self.engine is not None:
+            for contender in self.engine.contenders:
+                if not contender.done:
+                    contender.stopped = True
+            self.update_metric_labels()
 
-    def dijkstra_generator(self, grid, start, goal, idx):
-        import heapq
-        dist = {start: 0}
-        parent = {}
-        visited = set()
-        heap = [(0, start)]
-        while heap:
-            d, u = heapq.heappop(heap)
-            if u in visited:
-                continue
-            visited.add(u)
-            yield 'visit', u
-            if u == goal:
-                break
-            for v, cost in logic.get_neighbors_cost(u, len(grid)):
-                if grid[v[0]][v[1]] == 1:
-                    continue
-                nd = d + cost
-                if v not in dist or nd < dist[v]:
-                    dist[v] = nd
-                    parent[v] = u
-                    heapq.heappush(heap, (nd, v))
-        # Nếu không tìm được đường đi thì return luôn, tránh KeyError
-        if goal not in parent and start != goal:
-            return
-        node = goal
-        path = []
-        while node != start:
-            path.append(node)
-            node = parent[node]
-        path.append(start)
-        for cell in reversed(path):
-            yield 'path', cell
+    def on_done(self):
+        self.update_metric_labels()
+        self.scheduler = None
+        self.worker = None
+        self.measure_real_times()
 
-    def astar_generator(self, grid, start, goal, idx):
-        import heapq
-        g_score = {start: 0}
-        f_score = {start: logic.get_heuristic(start, goal, 'Manhattan')}
-        open_set = [(f_score[start], start)]
-        came_from = {}
-        closed = set()
-        while open_set:
-            _, u = heapq.heappop(open_set)
-            if u in closed:
-                continue
-            closed.add(u)
-            yield 'visit', u
-            if u == goal:
-                break
-            for v, cost in logic.get_neighbors_cost(u, len(grid)):
-                if grid[v[0]][v[1]] == 1:
-                    continue
-                tentative_g = g_score[u] + cost
-                if v in g_score and tentative_g >= g_score[v]:
-                    continue
-                came_from[v] = u
-                g_score[v] = tentative_g
-                f_score[v] = tentative_g + logic.get_heuristic(v, goal, 'Manhattan')
-                heapq.heappush(open_set, (f_score[v], v))
-        node = goal
-        path = []
-        while node != start:
-            path.append(node)
-            node = came_from[node]
-        path.append(start)
-        for cell in reversed(path):
-            yield 'path', cell
+    def measure_real_times(self):
+        """Sau hoạt hình: đo thời gian thực của từng cấu hình (nhiều lần, không vẽ) rồi xếp hạng.
 
-    def step_compare_0(self):
-        i = 0
-        if self.generators[i] is None:
-            return
-        try:
-            typ, cell = next(self.generators[i])
-            if typ == 'visit':
-                self.metrics[i]['visited'] += 1
-                if cell != self.start and cell != self.end:
-                    color = COLORS[self.combo1.get()]['visit']
-                    self.canvas1.itemconfig(self.cells[i][cell], fill=color)
-            else:
-                self.metrics[i]['path'] += 1
-                if cell != self.start and cell != self.end:
-                    color = COLORS[self.combo1.get()]['path']
-                    self.canvas1.itemconfig(self.cells[i][cell], fill=color)
-            elapsed = time.time() - self.metrics[i]['start_time']
-            self.metric_labels[2][i].configure(text=f'{elapsed:.2f}')
-            self.metric_labels[0][i].configure(text=str(self.metrics[i]['visited']))
-            self.metric_labels[1][i].configure(text=str(self.metrics[i]['path']))
-            self.after_id_0 = self.after(self.delay, self.step_compare_0)
-        except StopIteration:
-            elapsed = time.time() - self.metrics[i]['start_time']
-            self.metric_labels[2][i].configure(text=f'{elapsed:.2f}')
-            self.metric_labels[0][i].configure(text=str(self.metrics[i]['visited']))
-            self.metric_labels[1][i].configure(text=str(self.metrics[i]['path']))
-            # Nếu cả hai đều xong thì cho phép chạy lại
-            if (i == 0 and (self.generators[1] is None or not hasattr(self.generators[1], '__next__'))) or (i == 1 and (self.generators[0] is None or not hasattr(self.generators[0], '__next__'))):
-                self.running = False
+        Thời gian hoạt hình phụ thuộc tốc độ vẽ, không phản ánh chi phí thật của thuật toán.
+        """
+        done = [i for i, c in enumerate(self.engine.contenders) if not c.stopped]
+        if not done:
             return
+        self.timing_token += 1
+        token = self.timing_token
+        for i in done:
+            self.metric_labels[i][8].configure(text='...')
 
-    def step_compare_1(self):
-        i = 1
-        if self.generators[i] is None:
-            return
-        try:
-            typ, cell = next(self.generators[i])
-            if typ == 'visit':
-                self.metrics[i]['visited'] += 1
-                if cell != self.start and cell != self.end:
-                    color = COLORS[self.combo2.get()]['visit']
-                    self.canvas2.itemconfig(self.cells[i][cell], fill=color)
-            else:
-                self.metrics[i]['path'] += 1
-                if cell != self.start and cell != self.end:
-                    color = COLORS[self.combo2.get()]['path']
-                    self.canvas2.itemconfig(self.cells[i][cell], fill=color)
-            elapsed = time.time() - self.metrics[i]['start_time']
-            self.metric_labels[2][i].configure(text=f'{elapsed:.2f}')
-            self.metric_labels[0][i].configure(text=str(self.metrics[i]['visited']))
-            self.metric_labels[1][i].configure(text=str(self.metrics[i]['path']))
-            self.after_id_1 = self.after(self.delay, self.step_compare_1)
-        except StopIteration:
-            elapsed = time.time() - self.metrics[i]['start_time']
-            self.metric_labels[2][i].configure(text=f'{elapsed:.2f}')
-            self.metric_labels[0][i].configure(text=str(self.metrics[i]['visited']))
-            self.metric_labels[1][i].configure(text=str(self.metrics[i]['path']))
-            # Nếu cả hai đều xong thì cho phép chạy lại
-            if (i == 0 and (self.generators[1] is None or not hasattr(self.generators[1], '__next__'))) or (i == 1 and (self.generators[0] is None or not hasattr(self.generators[0], '__next__'))):
-                self.running = False
-            return
+        def finished(timings, error):
+            if token != self.timing_token:
+                return  # đã có lần so sánh mới
+            if error is not None:
+                for i in done:
+                    self.metric_labels[i][8].configure(text='error')
+                return
+            medians = [t['median_ns'] for t in timings]
+            expansions = [self.engine.contenders[i].stats.expansions for i in done]
+            for i, t, rank_time, rank_exp in zip(done, timings, ranking(medians), ranking(expansions)):
+                labels = self.metric_labels[i]
+                labels[8].configure(text=f"{t['median_ns'] / 1e6:.2f} ±{t['spread_ns'] / 2e6:.2f}")
+                labels[9].configure(text=f'#{rank_time}')
+                labels[10].configure(text=f'#{rank_exp}')
+
+        run_in_background(self, time_configurations, finished, self.grid_data, self.start, self.end,
+                          [self.names[i] for i in done])
 
 if __name__ == '__main__':
     app = MazeCompareApp()
-    app.mainloop() 
\ No newline at end of file
+    app.mainloop()
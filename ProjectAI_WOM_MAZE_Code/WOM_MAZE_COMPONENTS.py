@@ -0,0 +1,206 @@
+"""Chỉ mục vùng liên thông: trả lời "có đường không" trong O(1) trước khi tìm đường.
+
+Khi điểm đầu và điểm cuối nằm ở hai vùng khác nhau, BFS / Dijkstra / A* phải
+loang hết vùng của điểm đầu rồi mới chịu thua: đó là truy vấn đắt nhất.
+ComponentIndex gán nhãn vùng cho mọi ô bằng union-find trên các đoạn ô trống
+liên tiếp của từng hàng (mỗi đoạn là một nút, nối với các đoạn chạm nó ở hàng
+trên), tính một lần cho mỗi mê cung và giữ đúng khi ô bị đổi:
+
+    index = ComponentIndex(grid)
+    index.connected(start, goal, moves=4)   # BFS / DFS (4 hướng)
+    index.connected(start, goal, moves=8)   # Dijkstra / A* (8 hướng)
+    grid[r][c] = 1; index.update([(r, c)])
+
+Mở một ô chỉ là vài phép hợp. Đóng một ô có thể tách vùng, union-find không
+tách được: nếu các hàng xóm của ô vẫn nối với nhau qua vành 3x3 quanh nó thì
+không vùng nào bị tách, ngược lại nhãn được đánh dấu cũ và tính lại ở truy
+vấn kế tiếp. Quy ước giống solver: ô tường không đi vào được, nhưng điểm đầu
+nằm trên tường vẫn bước ra được các ô trống kề nó. Truy vấn và cập nhật có
+khoá, nên solver chạy ở luồng nền dùng chung được chỉ mục với giao diện.
+"""
+import threading
+from array import array
+
+_STEPS = {
+    4: [(1, 0), (-1, 0), (0, 1), (0, -1)],
+    8: [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)],
+}
+_RING = [(-1, -1), (-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1)]
+
+
+class _Labels:
+    """Union-find trên các đoạn ô trống theo hàng, cho một kiểu di chuyển (4 hoặc 8 hướng)."""
+
+    def __init__(self, walls, n, moves):
+        self.walls = walls
+        self.n = n
+        self.moves = moves
+        self.steps = _STEPS[moves]
+        self.rebuild()
+
+    def rebuild(self):
+        walls, n = self.walls, self.n
+        reach = 1 if self.moves == 8 else 0  # 8 hướng: đoạn chạm chéo cũng nối
+        self.parent = parent = []
+        self.node = node = array('i', [-1]) * (n * n)  # ô -> nút union-find, -1 = tường
+        prev = []
+        for r in range(n):
+            base = r * n
+            row = walls[base:base + n]
+            runs = []
+            c = row.find(0)
+            while c >= 0:
+                end = row.find(1, c)
+                if end < 0:
+                    end = n
+                k = len(parent)
+                parent.append(k)
+                node[base + c:base + end] = array('i', [k]) * (end - c)
+                runs.append((c, end, k))
+                c = row.find(0, end)
+            # Nối với các đoạn của hàng trên chồng lên (hoặc chạm chéo) đoạn này: hai con trỏ
+            i = 0
+            for c0, c1, k in runs:
+                while i < len(prev) and prev[i][1] + reach <= c0:
+                    i += 1
+                j = i
+                while j < len(prev) and prev[j][0] < c1 + reach:
+                    self.union(k, prev[j][2])
+                    j += 1
+            prev = runs
+        self.dirty = False
+
+    def find(self, k):
+        parent = self.parent
+        while parent[k] != k:
+            parent[k] = parent[parent[k]]
+            k = parent[k]
+        return k
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            self.parent[max(a, b)] = min(a, b)
+
+    def _open_neighbors(self, u):
+        n, walls = self.n, self.walls
+        r, c = divmod(u, n)
+        out = []
+        for dr, dc in self.steps:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < n and 0 <= nc < n and not walls[nr * n + nc]:
+                out.append(nr * n + nc)
+        return out
+
+    def opened(self, u):
+        k = len(self.parent)
+        self.parent.append(k)
+        self.node[u] = k
+        for v in self._open_neighbors(u):
+            self.union(k, self.node[v])
+
+    def closed(self, u):
+        self.node[u] = -1
+        if not self.dirty and not self._ring_connected(u):
+            self.dirty = True
+
+    def _ring_connected(self, u):
+        """Các hàng xóm trống của u còn nối với nhau chỉ qua 8 ô quanh u không."""
+        neighbors = self._open_neighbors(u)
+        if len(neighbors) <= 1:
+            return True
+        n, walls = self.n, self.walls
+        r, c = divmod(u, n)
+        ring = set()
+        for dr, dc in _RING:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < n and 0 <= nc < n and not walls[nr * n + nc]:
+                ring.add((nr, nc))
+        start = divmod(neighbors[0], n)
+        seen = {start}
+        stack = [start]
+        while stack:
+            cr, cc = stack.pop()
+            for dr, dc in self.steps:
+                v = (cr + dr, cc + dc)
+                if v in ring and v not in seen:
+                    seen.add(v)
+                    stack.append(v)
+        return all(divmod(v, n) in seen for v in neighbors)
+
+    def label(self, u):
+        if self.dirty:
+            self.rebuild()
+        k = self.node[u]
+        return -1 if k < 0 else self.find(k)
+
+
+class ComponentIndex:
+    """Nhãn vùng liên thông của lưới vuông, theo 4 và 8 hướng (tính khi cần lần đầu)."""
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.n = n = len(grid)
+        self.walls = bytearray(n * n)
+        for r, row in enumerate(grid):
+            self.walls[r * n:(r + 1) * n] = bytes(1 if v == 1 else 0 for v in row)
+        self._labels = {}
+        self._lock = threading.Lock()
+
+    def _for(self, moves):
+        labels = self._labels.get(moves)
+        if labels is None:
+            if moves not in _STEPS:
+                raise ValueError(f'moves must be 4 or 8, got {moves!r}')
+            labels = self._labels[moves] = _Labels(self.walls, self.n, moves)
+        return labels
+
+    def update(self, cells):
+        """Đồng bộ với self.grid tại các ô vừa đổi; trả về số ô thực sự đổi."""
+        with self._lock:
+            return self._update(cells)
+
+    def _update(self, cells):
+        n, walls = self.n, self.walls
+        changed = 0
+        for r, c in cells:
+            u = r * n + c
+            wall = 1 if self.grid[r][c] == 1 else 0
+            if wall == walls[u]:
+                continue
+            walls[u] = wall
+            changed += 1
+            for labels in self._labels.values():
+                if wall:
+                    labels.closed(u)
+                else:
+                    labels.opened(u)
+        return changed
+
+    def label(self, cell, moves=4):
+        """Nhãn vùng của cell (-1 nếu cell là tường). Hai ô cùng nhãn thì nối được với nhau."""
+        with self._lock:
+            return self._for(moves).label(cell[0] * self.n + cell[1])
+
+    def connected(self, start, goal, moves=4, wall_goal=False):
+        """Có thể có đường từ start tới goal không (theo quy ước điểm đầu/điểm cuối của solver).
+
+        wall_goal: goal nằm trên tường cũng được coi như điểm đầu thứ hai, bước
+        ra được các ô kề nó (như BFS hai chiều tìm từ cả hai phía).
+        """
+        start, goal = tuple(start), tuple(goal)
+        if start == goal:
+            return True
+        with self._lock:
+            labels = self._for(moves)
+            n = self.n
+            u, v = start[0] * n + start[1], goal[0] * n + goal[1]
+            if self.walls[v] and not wall_goal:
+                return False
+            return not self._exits(labels, u).isdisjoint(self._exits(labels, v))
+
+    def _exits(self, labels, u):
+        """Nhãn các vùng mà ô u đi vào được: vùng của chính nó, hoặc của các ô trống kề nếu u là tường."""
+        if not self.walls[u]:
+            return {labels.label(u)}
+        return {labels.label(v) for v in labels._open_neighbors(u)}
@@ -1,6 +1,9 @@
 import customtkinter as ctk
 import tkinter as tk
 import WOM_MAZE_LOGIC as logic
+from WOM_MAZE_RENDER import GridRenderer, FrameScheduler, speed_to_rate
+from WOM_MAZE_WORKER import SearchWorker, MazePool
+from WOM_MAZE_COMPONENTS import ComponentIndex
 import time
 import heapq
 import random
@@ -27,6 +30,8 @@ class EcoBotNavigatorApp(ctk.CTk):
         self.state('zoomed')
         self.grid_size = 20  # Default grid size
         self.grid_data = None
+        self.components = None  # ComponentIndex of grid_data, rejects unreachable goals before searching
+        self.snap = None  # NearestOpenIndex of grid_data: clicks on a wall snap to the nearest open cell
         self.terrain_data = None  # New: Store terrain information
         self.fuel_stations = []   # New: Store fuel station positions
         self.start = None
@@ -35,7 +40,14 @@ class EcoBotNavigatorApp(ctk.CTk):
         self.pad_x = None
         self.pad_y = None
         self.speed = 5  # Default animation speed
-        self.delay = 200  # Animation delay in ms
+        self.rate = speed_to_rate(self.speed)  # Animation events per second (None = unlimited)
+        self.scheduler = None
+        self.worker = None
+        # Mazes for the selected size / algorithm are generated ahead in a background thread
+        self.maze_pool = MazePool(logic.generate_maze)
+        self.search_message = None  # Thông báo từ luồng tìm đường, hiển thị khi xong
+        self.stations_visited = 0
+        self.last_move = None
         self.current_fuel = 20  # Initial fuel
         self.max_fuel = 20      # Maximum fuel capacity
 
@@ -83,6 +95,7 @@ class EcoBotNavigatorApp(ctk.CTk):
                                        width=200)
         self.maze_type.set('Recursive Backtracking')
         self.maze_type.pack(pady=(0, 10))
+        self.maze_type.configure(command=lambda choice: self.prefetch_maze())
 
         # Terrain density slider
         ctk.CTkLabel(control, text='Terrain Density (%)', 
@@ -117,6 +130,10 @@ class EcoBotNavigatorApp(ctk.CTk):
                                          command=self.start_pathfinding,
                                          width=200)
         self.find_path_btn.pack(pady=5)
+        self.pause_btn = ctk.CTkButton(control, text='Pause',
+                                       command=self.on_pause,
+                                       width=200)
+        self.pause_btn.pack(pady=5)
 
         # Metrics frame
         metrics_frame = ctk.CTkFrame(control, fg_color='#008000')
@@ -192,6 +209,9 @@ class EcoBotNavigatorApp(ctk.CTk):
         
         self.canvas = tk.Canvas(canvas_frame, bg='white')
         self.canvas.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.renderer = GridRenderer(self.canvas, outline='gray')
+        # Mouse wheel zooms around the pointer, middle-drag pans
+        self.renderer.bind_viewport(self.on_view_change)
         
         # Right control panel
         right_control = ctk.CTkFrame(content, width=300, fg_color='#00a000')
@@ -263,6 +283,12 @@ class EcoBotNavigatorApp(ctk.CTk):
                                              text_color='white')
         self.terrain_dist_label.pack(pady=5)
 
+        # Search statistics
+        self.stats_label = ctk.CTkLabel(path_frame,
+                                      text=logic.SearchStats().summary(),
+                                      text_color='white', justify='left')
+        self.stats_label.pack(pady=5)
+
         # Reset button
         self.reset_btn = ctk.CTkButton(right_control, 
                                      text='Reset Maze',
@@ -302,33 +328,40 @@ class EcoBotNavigatorApp(ctk.CTk):
         return rgb_to_hex(blended)
 
     def pixel_to_cell(self, x, y):
-        if self.cell_size is None:
-            return None, None
-        col = int((x - self.pad_x) / self.cell_size)
-        row = int((y - self.pad_y) / self.cell_size)
-        return row, col
+        return self.renderer.pixel_to_cell(x, y)
+
+    def base_color(self, r, c):
+        """Colour of a cell from walls and terrain, without search overlay."""
+        if self.grid_data and self.grid_data[r][c] == 1:
+            return 'black'
+        if self.terrain_data and self.terrain_data[r][c]:
+            return self.terrain_data[r][c]['color']
+        return 'white'
+
+    def on_view_change(self):
+        """Zoom / pan changed the cell size and position: redraw the icons on top."""
+        self.cell_size = self.renderer.cell_size
+        self.draw_start_end_icons()
+        self.draw_fuel_stations()
 
     def draw_start_end_icons(self):
-        if not hasattr(self, 'cells'):
+        if not self.renderer.n:
             return
-        for item in self.canvas.find_all():
-            if item not in self.cells.values():
-                self.canvas.delete(item)
-        if self.start in self.cells:
-            x = self.pad_x + self.start[1] * self.cell_size
-            y = self.pad_y + self.start[0] * self.cell_size
+        self.canvas.delete('icon')
+        self.canvas.delete('fuel_station')
+        if self.renderer.visible(self.start):
+            x, y = self.renderer.cell_origin(self.start)
             self.canvas.create_line(x + self.cell_size*0.2, y + self.cell_size*0.2,
                                   x + self.cell_size*0.2, y + self.cell_size*0.8,
-                                  fill='black', width=2)
+                                  fill='black', width=2, tags='icon')
             points = [
                 x + self.cell_size*0.2, y + self.cell_size*0.2,
                 x + self.cell_size*0.7, y + self.cell_size*0.4,
                 x + self.cell_size*0.2, y + self.cell_size*0.6
             ]
-            self.canvas.create_polygon(points, fill='green', outline='black')
-        if self.end in self.cells:
-            x = self.pad_x + self.end[1] * self.cell_size
-            y = self.pad_y + self.end[0] * self.cell_size
+            self.canvas.create_polygon(points, fill='green', outline='black', tags='icon')
+        if self.renderer.visible(self.end):
+            x, y = self.renderer.cell_origin(self.end)
             center_x = x + self.cell_size/2
             center_y = y + self.cell_size/2
             max_radius = int(self.cell_size * 0.4)
@@ -336,23 +369,22 @@ class EcoBotNavigatorApp(ctk.CTk):
             for r in range(max_radius, 0, -step):
                 self.canvas.create_oval(center_x-r, center_y-r,
                                      center_x+r, center_y+r,
-                                     outline='red', width=2)
+                                     outline='red', width=2, tags='icon')
             dot_radius = max(1, int(self.cell_size * 0.1))
             self.canvas.create_oval(center_x-dot_radius,
                                   center_y-dot_radius,
                                   center_x+dot_radius,
                                   center_y+dot_radius,
-                                  fill='red', outline='red')
+                                  fill='red', outline='red', tags='icon')
 
     def draw_fuel_stations(self):
-        if not hasattr(self, 'cells'):
+        if not self.renderer.n:
             return
-        for item in self.canvas.find_all():
-            if 'fuel_station' in self.canvas.gettags(item):
-                self.canvas.delete(item)
+        self.canvas.delete('fuel_station')
         for station in self.fuel_stations:
-            x = self.pad_x + station[1] * self.cell_size
-            y = self.pad_y + station[0] * self.cell_size
+            if not self.renderer.visible(station):
+                continue
+            x, y = self.renderer.cell_origin(station)
             self.canvas.create_rectangle(x + self.cell_size*0.3, y + self.cell_size*0.4,
                                       x + self.cell_size*0.7, y + self.cell_size*0.8,
                                       fill='#FFD700', outline='black', tags='fuel_station')
@@ -393,43 +425,30 @@ class EcoBotNavigatorApp(ctk.CTk):
         self.grid_size = int(value)
         self.size_label.configure(text=str(self.grid_size))
         self.draw_grid(self.grid_size)
+        self.prefetch_maze()
+
+    def prefetch_maze(self):
+        """Start generating mazes for the current selection before Generate is pressed."""
+        self.maze_pool.select(self.grid_size, self.maze_type.get(), 'EcoBot Navigator')
 
     def update_speed(self, value):
         self.speed = int(value)
         self.speed_label.configure(text=str(self.speed))
-        self.delay = int(200 / self.speed)
+        self.rate = speed_to_rate(self.speed)
+        if self.scheduler is not None:
+            self.scheduler.set_rate(self.rate)
 
     def update_terrain_density(self, value):
         self.terrain_label.configure(text=f'{int(value)}%')
 
     def draw_grid(self, n):
-        self.canvas.delete('all')
-        w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
-        cell = min(w / n, h / n)
-        total = cell * n
-        pad_x = (w - total) / 2
-        pad_y = (h - total) / 2
-        self.cell_size = cell
-        self.pad_x = pad_x
-        self.pad_y = pad_y
-        self.cells = {}
-        for row in range(n):
-            for col in range(n):
-                x1 = pad_x + col * cell
-                y1 = pad_y + row * cell
-                x2 = x1 + cell
-                y2 = y1 + cell
-                if self.grid_data and self.grid_data[row][col] == 1:
-                    fill_color = 'black'
-                elif self.terrain_data and self.terrain_data[row][col]:
-                    fill_color = self.terrain_data[row][col]['color']
-                else:
-                    fill_color = 'white'
-                rect = self.canvas.create_rectangle(x1, y1, x2, y2, fill=fill_color, outline='gray')
-                self.cells[(row, col)] = rect
-        if self.start not in self.cells:
+        self.renderer.layout(n, self.base_color)
+        self.cell_size = self.renderer.cell_size
+        self.pad_x = self.renderer.pad_x
+        self.pad_y = self.renderer.pad_y
+        if not self.renderer.in_grid(self.start):
             self.start = (0, 0)
-        if self.end not in self.cells:
+        if not self.renderer.in_grid(self.end):
             self.end = (n-1, n-1)
         self.draw_start_end_icons()
         self.draw_fuel_stations()
@@ -439,22 +458,13 @@ class EcoBotNavigatorApp(ctk.CTk):
         r, c = self.pixel_to_cell(event.x, event.y)
         if r is None or not (0 <= r < self.grid_size and 0 <= c < self.grid_size):
             return
-        if self.grid_data is not None and self.grid_data[r][c] == 1:
-            return
+        if self.grid_data is not None:
+            r, c = self.snap.nearest((r, c))
         if self.end == (r, c):
             return
-        old_terrain = None
-        if self.start is not None and self.terrain_data is not None:
-            old_terrain = self.terrain_data[self.start[0]][self.start[1]]
-        if self.start is not None and self.start != self.end:
+        if self.renderer.in_grid(self.start) and self.start != self.end:
             if self.grid_data is not None:
-                if self.grid_data[self.start[0]][self.start[1]] == 1:
-                    color = 'black'
-                elif old_terrain:
-                    color = old_terrain['color']
-                else:
-                    color = 'white'
-                self.canvas.itemconfig(self.cells[self.start], fill=color)
+                self.renderer.set_cell(self.start, self.base_color(*self.start))
         self.start = (r, c)
         self.draw_start_end_icons()
         self.draw_fuel_stations()
@@ -463,28 +473,22 @@ class EcoBotNavigatorApp(ctk.CTk):
         r, c = self.pixel_to_cell(event.x, event.y)
         if r is None or not (0 <= r < self.grid_size and 0 <= c < self.grid_size):
             return
-        if self.grid_data is not None and self.grid_data[r][c] == 1:
-            return
+        if self.grid_data is not None:
+            r, c = self.snap.nearest((r, c))
         if self.start == (r, c):
             return
-        old_terrain = None
-        if self.end is not None and self.terrain_data is not None:
-            old_terrain = self.terrain_data[self.end[0]][self.end[1]]
-        if self.end is not None and self.end != self.start:
+        if self.renderer.in_grid(self.end) and self.end != self.start:
             if self.grid_data is not None:
-                if self.grid_data[self.end[0]][self.end[1]] == 1:
-                    color = 'black'
-                elif old_terrain:
-                    color = old_terrain['color']
-                else:
-                    color = 'white'
-                self.canvas.itemconfig(self.cells[self.end], fill=color)
+                self.renderer.set_cell(self.end, self.base_color(*self.end))
         self.end = (r, c)
         self.draw_start_end_icons()
         self.draw_fuel_stations()
 
     def on_reset(self):
+        self.stop_search()
         self.grid_data = None
+        self.components = None
+        self.snap = None
         self.terrain_data = None
         self.fuel_stations = []
         self.start = None
@@ -495,8 +499,11 @@ class EcoBotNavigatorApp(ctk.CTk):
         self.update_information_panel()
 
     def generate_maze(self):
+        self.stop_search()
         n = self.grid_size
-        self.grid_data = logic.generate_maze(n, self.maze_type.get(), 'EcoBot Navigator')
+        self.grid_data = self.maze_pool.get(n, self.maze_type.get(), 'EcoBot Navigator')
+        self.components = ComponentIndex(self.grid_data)
+        self.snap = logic.NearestOpenIndex(self.grid_data)
         self.terrain_data = [[TERRAIN_TYPES['DEFAULT'] for _ in range(n)] for _ in range(n)]
         terrain_density = int(self.terrain_slider.get()) / 100.0
         path_cells = [(r, c) for r in range(n) for c in range(n) if self.grid_data[r][c] == 0]
@@ -513,6 +520,7 @@ class EcoBotNavigatorApp(ctk.CTk):
         self.current_fuel = self.max_fuel
         self.update_fuel_display()
         self.fuel_consumption_label.configure(text='Last Move: 0 fuel')
+        self.stations_visited = 0
         self.fuel_stations_visited_label.configure(text='Stations Visited: 0')
         self.final_fuel_label.configure(text='20')
         self.draw_grid(n)
@@ -526,80 +534,102 @@ class EcoBotNavigatorApp(ctk.CTk):
     def start_pathfinding(self):
         if not self.start or not self.end:
             return
+        self.stop_search()
         self.visited_count = 0
         self.path_length = 0
+        self.last_move = None
+        self.search_message = None
         self.start_time = time.time()
-        for (r, c), rect in self.cells.items():
-            if self.grid_data and self.grid_data[r][c] == 1:
-                self.canvas.itemconfig(rect, fill='black')
-            elif self.terrain_data and self.terrain_data[r][c]:
-                self.canvas.itemconfig(rect, fill=self.terrain_data[r][c]['color'])
-            else:
-                self.canvas.itemconfig(rect, fill='white')
+        self.renderer.layout(self.grid_size, self.base_color)
         self.draw_start_end_icons()
         self.draw_fuel_stations()
         grid = self.grid_data if self.grid_data is not None else [[0] * self.grid_size for _ in range(self.grid_size)]
-        self.step_gen = self.astar_generator(grid, self.start, self.end)
-        # Kiểm tra nếu không tìm được đường đi thì báo lên UI
-        try:
-            first = next(self.step_gen)
-            self.step_gen = self._prepend_first(first, self.step_gen)
-            self.after(self.delay, self.step)
-        except StopIteration:
-            self.time_label.configure(text='No path found!')
-            self.visited_label.configure(text='0')
-            self.path_length_label.configure(text='0')
-            self.remaining_fuel_label.configure(text=f'Remaining Fuel: {self.current_fuel}')
-            self.final_fuel_label.configure(text=str(self.current_fuel))
-
-    def step(self):
-        try:
-            typ, cell = next(self.step_gen)
-            if typ == 'visit':
-                self.visited_count += 1
-                if cell != self.start and cell != self.end:
-                    if not (self.grid_data and self.grid_data[cell[0]][cell[1]] == 1):
-                        self.canvas.itemconfig(self.cells[cell], fill='#ADD8E6')
-                self.visited_label.configure(text=str(self.visited_count))
-                self.time_label.configure(text=f"{time.time() - self.start_time:.2f}")
-            else:  # 'path'
-                self.path_length += 1
-                if cell != self.start and cell != self.end:
-                    if not (self.grid_data and self.grid_data[cell[0]][cell[1]] == 1):
-                        if self.terrain_data and self.terrain_data[cell[0]][cell[1]]:
-                            base_color = self.terrain_data[cell[0]][cell[1]]['color']
-                            self.canvas.itemconfig(self.cells[cell], fill=self.blend_colors(base_color, 'blue'))
-                        else:
-                            self.canvas.itemconfig(self.cells[cell], fill=self.blend_colors('white', 'blue', alpha=0.5))
-                    if self.terrain_data and self.terrain_data[cell[0]][cell[1]]:
-                        terrain = self.terrain_data[cell[0]][cell[1]]
-                    else:
-                        terrain = TERRAIN_TYPES['DEFAULT']
-                    fuel_cost = terrain['fuel_cost']
-                    self.current_fuel -= fuel_cost
-                    self.fuel_consumption_label.configure(
-                        text=f'Last Move: {fuel_cost} fuel ({terrain.get("name", "Unknown")})'
-                    )
-                    if cell in self.fuel_stations:
-                        self.current_fuel = min(self.max_fuel, self.current_fuel + 20)
-                        stations_visited = int(self.fuel_stations_visited_label.cget("text").split(": ")[1]) + 1
-                        self.fuel_stations_visited_label.configure(
-                            text=f'Stations Visited: {stations_visited}'
-                        )
-                    self.update_fuel_display()
-                self.path_length_label.configure(text=str(self.path_length))
-                self.time_label.configure(text=f"{time.time() - self.start_time:.2f}")
-            self.after(self.delay, self.step)
-        except StopIteration:
-            elapsed = time.time() - self.start_time
-            self.visited_label.configure(text=str(self.visited_count))
-            self.path_length_label.configure(text=str(self.path_length))
-            self.time_label.configure(text=f"{elapsed:.2f}")
-            self.remaining_fuel_label.configure(text=f'Remaining Fuel: {self.current_fuel}')
-            self.final_fuel_label.configure(text=str(self.current_fuel))
-            # Không gọi lại self.after nữa nếu generator đã hết
-
-    def astar_generator(self, grid, start, goal):
+        self.stats = logic.SearchStats()
+        self.stats_label.configure(text=self.stats.summary())
+        # Thuật toán chạy ở luồng nền; giao diện chỉ rút sự kiện theo khung hình
+        self.worker = SearchWorker(logic.timed_steps(self.astar_generator(grid, self.start, self.end, self.stats),
+                                                     self.stats)).start()
+        self.scheduler = FrameScheduler(self, self.worker.events(), self.apply_event, on_frame=self.update_metrics,
+                                        on_done=self.on_search_done, rate=self.rate).start()
+
+    def stop_search(self):
+        """Huỷ lần tìm đường đang chạy (nếu có)."""
+        if self.scheduler is not None:
+            self.scheduler.stop()
+            self.scheduler = None
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+        self.pause_btn.configure(text='Pause')
+
+    def on_pause(self):
+        if self.worker is None:
+            return
+        if self.worker.paused:
+            self.worker.resume()
+            self.scheduler.start()
+            self.pause_btn.configure(text='Pause')
+        else:
+            self.worker.pause()
+            self.scheduler.stop()
+            self.pause_btn.configure(text='Resume')
+
+    def apply_event(self, typ, cell):
+        """Áp dụng một sự kiện vào bộ đệm và trạng thái nhiên liệu; nhãn được cập nhật theo khung hình."""
+        if typ == 'visit':
+            self.visited_count += 1
+            if cell != self.start and cell != self.end:
+                if not (self.grid_data and self.grid_data[cell[0]][cell[1]] == 1):
+                    self.renderer.set_cell(cell, '#ADD8E6')
+            return
+        self.path_length += 1
+        if cell != self.start and cell != self.end:
+            if not (self.grid_data and self.grid_data[cell[0]][cell[1]] == 1):
+                if self.terrain_data and self.terrain_data[cell[0]][cell[1]]:
+                    base_color = self.terrain_data[cell[0]][cell[1]]['color']
+                    self.renderer.set_cell(cell, self.blend_colors(base_color, 'blue'))
+                else:
+                    self.renderer.set_cell(cell, self.blend_colors('white', 'blue', alpha=0.5))
+            if self.terrain_data and self.terrain_data[cell[0]][cell[1]]:
+                terrain = self.terrain_data[cell[0]][cell[1]]
+            else:
+                terrain = TERRAIN_TYPES['DEFAULT']
+            fuel_cost = terrain['fuel_cost']
+            self.current_fuel -= fuel_cost
+            self.last_move = (fuel_cost, terrain.get("name", "Unknown"))
+            if cell in self.fuel_stations:
+                self.current_fuel = min(self.max_fuel, self.current_fuel + 20)
+                self.stations_visited += 1
+
+    def update_metrics(self):
+        """Cập nhật nhãn một lần mỗi khung hình."""
+        self.visited_label.configure(text=str(self.visited_count))
+        self.path_length_label.configure(text=str(self.path_length))
+        self.time_label.configure(text=f"{time.time() - self.start_time:.2f}")
+        if self.last_move is not None:
+            fuel_cost, name = self.last_move
+            self.fuel_consumption_label.configure(text=f'Last Move: {fuel_cost} fuel ({name})')
+            self.fuel_stations_visited_label.configure(text=f'Stations Visited: {self.stations_visited}')
+            self.update_fuel_display()
+
+    def on_search_done(self):
+        if self.worker.error is not None:
+            self.search_message = f'Error: {self.worker.error}'
+        self.scheduler = None
+        self.worker = None
+        self.pause_btn.configure(text='Pause')
+        if self.path_length == 0:
+            self.time_label.configure(text=self.search_message or 'No path found!')
+        elif self.search_message:
+            self.time_label.configure(text=self.search_message)
+        self.remaining_fuel_label.configure(text=f'Remaining Fuel: {self.current_fuel}')
+        self.final_fuel_label.configure(text=str(self.current_fuel))
+        self.stats_label.configure(text=self.stats.summary())
+
+    def astar_generator(self, grid, start, goal, stats=None):
+        if self.components is not None and not self.components.connected(start, goal, 8):
+            self.search_message = 'No path: start and goal are in different regions'
+            return
         n = len(grid)
         g_score = {start: 0}  # Distance from start
         f_score = {start: logic.get_heuristic(start, goal, 'Manhattan')}  # Use Manhattan for direct paths
@@ -608,22 +638,25 @@ class EcoBotNavigatorApp(ctk.CTk):
         closed = set()
         fuel_at_node = {start: self.current_fuel}  # Track fuel at each node
         fuel_efficiency = {start: 0}  # Track fuel efficiency at each node
+        if stats is not None:
+            stats.heuristic_evals += 1
+            stats.pushes += 1
+            stats.peak_open = max(stats.peak_open, 1)
         is_direct_path = all(grid[r][c] == 0 for r in range(n) for c in range(n))
-        max_steps = n * n * 2  # Giảm giới hạn số bước duyệt tối đa
-        steps = 0
         while open_set:
-            steps += 1
-            if steps > max_steps:
-                print(f"[EcoBot] Pathfinding stopped: exceeded max_steps={max_steps}")
-                if hasattr(self, 'time_label'):
-                    self.time_label.configure(text='Pathfinding took too long or no path found!')
-                return  # Tránh block UI nếu thuật toán chạy quá lâu
             _, current = heapq.heappop(open_set)
+            if stats is not None:
+                stats.pops += 1
             if current == goal:
                 break
             if current in closed:
+                if stats is not None:
+                    stats.stale_pops += 1
                 continue
             closed.add(current)
+            if stats is not None:
+                stats.expansions += 1
+                stats.peak_closed = len(closed)
             yield 'visit', current
             current_fuel = fuel_at_node[current]
             if is_direct_path:
@@ -685,6 +718,11 @@ class EcoBotNavigatorApp(ctk.CTk):
                                 h_score *= (1 + nearest_station_dist * 0.1)
                     f_score[v] = tentative_g + h_score
                     heapq.heappush(open_set, (f_score[v], v))
+                    if stats is not None:
+                        stats.heuristic_evals += 1
+                        stats.pushes += 1
+                        if len(open_set) > stats.peak_open:
+                            stats.peak_open = len(open_set)
         # Nếu không tìm được đường đi thì dừng generator ngay
         if goal not in came_from and start != goal:
             return
@@ -700,32 +738,25 @@ class EcoBotNavigatorApp(ctk.CTk):
             while node != start:
                 if node in visited_reconstruct:
                     print("[EcoBot] Infinite loop detected in reconstruct path!")
-                    if hasattr(self, 'time_label'):
-                        self.time_label.configure(text='Error: Infinite loop in reconstruct path!')
+                    self.search_message = 'Error: Infinite loop in reconstruct path!'
                     return
                 visited_reconstruct.add(node)
                 path.append(node)
                 print(f"[EcoBot] Reconstructing: {node} -> {came_from.get(node)}")
                 if node not in came_from:
                     print("[EcoBot] Reconstruct failed: node not in came_from")
-                    if hasattr(self, 'time_label'):
-                        self.time_label.configure(text='Error: Cannot reconstruct path!')
+                    self.search_message = 'Error: Cannot reconstruct path!'
                     return
                 node = came_from[node]
             path.append(start)
             found_path = True
         if not found_path or len(path) == 0:
             print("[EcoBot] No path found or reconstruct failed!")
-            if hasattr(self, 'time_label'):
-                self.time_label.configure(text='No path found or reconstruct failed!')
+            self.search_message = 'No path found or reconstruct failed!'
             return
         for cell in reversed(path):
             yield 'path', cell
 
-    def _prepend_first(self, first, gen):
-        yield first
-        yield from gen
-
 if __name__ == '__main__':
     app = EcoBotNavigatorApp()
     app.mainloop() 
\ No newline at end of file
@@ -0,0 +1,209 @@
+"""Trường dòng chảy (flow field) hướng về một đích chung cho nhiều robot.
+
+Nhiều robot cùng đi về một đích thì chạy astar_generator cho từng robot là
+lặp lại gần như cùng một công việc. FlowField tính một lần Dijkstra ngược từ
+đích trên toàn lưới, lưu khoảng cách và hướng đi kế tiếp của mọi ô vào mảng
+kiểu cố định; mỗi robot chỉ cần đọc bước kế tiếp của ô mình đang đứng, O(1).
+
+    field = FlowField(grid, goal)           # moves=8: chi phí như get_neighbors_cost
+    nxt = field.next_move(robot_pos)        # None nếu đã tới đích / không có đường
+    path = field.path_from(robot_pos)
+
+Khi lưới thay đổi (ví dụ tường mọc lên / bị phá), gọi field.update(cells) với
+các ô vừa đổi: chỉ vùng có đường đi đi qua các ô đó được tính lại, phần còn
+lại của trường giữ nguyên.
+"""
+import heapq
+from array import array
+from collections import deque
+
+import WOM_MAZE_LOGIC as logic
+
+INF = float('inf')
+NO_DIR = -1
+
+
+def _step_table(moves):
+    """(dr, dc, cost) lấy từ get_neighbors / get_neighbors_cost của WOM_MAZE_LOGIC."""
+    if moves == 8:
+        return [(r - 1, c - 1, cost) for (r, c), cost in logic.get_neighbors_cost((1, 1), 3)]
+    if moves == 4:
+        return [(r - 1, c - 1, 1) for r, c in logic.get_neighbors((1, 1), 3)]
+    raise ValueError(f'moves must be 4 or 8, got {moves!r}')
+
+
+class FlowField:
+    """Khoảng cách đến goal và hướng đi kế tiếp của mọi ô, lưu trong mảng phẳng n*n."""
+
+    def __init__(self, grid, goal, moves=8):
+        self.grid = grid
+        self.n = n = len(grid)
+        self.goal = tuple(goal)
+        self.moves = moves
+        self.steps = _step_table(moves)
+        # Hướng ngược lại của từng hướng (để lần theo "ô nào trỏ vào tôi")
+        index = {(dr, dc): k for k, (dr, dc, _) in enumerate(self.steps)}
+        self._opposite = [index[(-dr, -dc)] for dr, dc, _ in self.steps]
+        self.walls = bytearray(n * n)
+        for r, row in enumerate(grid):
+            self.walls[r * n:(r + 1) * n] = bytes(1 if v == 1 else 0 for v in row)
+        self.dist = array('d', [INF]) * (n * n)
+        self.dir = array('b', [NO_DIR]) * (n * n)  # chỉ số trong self.steps, NO_DIR = không đi tiếp
+        self.recompute()
+
+    # --- Tính toán ---
+    def recompute(self):
+        """Tính lại toàn bộ trường bằng Dijkstra ngược từ goal."""
+        size = self.n * self.n
+        self.dist = array('d', [INF]) * size
+        self.dir = array('b', [NO_DIR]) * size
+        g = self.goal[0] * self.n + self.goal[1]
+        if self.walls[g]:
+            return  # đích là tường: không ô nào tới được (như các solver)
+        self.dist[g] = 0.0
+        self._propagate([(0.0, g)])
+
+    def _propagate(self, heap):
+        """Dijkstra giảm dần từ các ô trong heap; chỉ ghi đè khi tìm được đường ngắn hơn."""
+        n, walls, dist, dirs = self.n, self.walls, self.dist, self.dir
+        steps, opposite = self.steps, self._opposite
+        heapq.heapify(heap)
+        heappop, heappush = heapq.heappop, heapq.heappush
+        while heap:
+            d, u = heappop(heap)
+            if d > dist[u]:
+                continue
+            r, c = divmod(u, n)
+            for k, (dr, dc, cost) in enumerate(steps):
+                nr, nc = r + dr, c + dc
+                if not (0 <= nr < n and 0 <= nc < n):
+                    continue
+                v = nr * n + nc
+                if walls[v]:
+                    continue
+                nd = d + cost
+                if nd < dist[v]:
+                    dist[v] = nd
+                    dirs[v] = opposite[k]  # từ v đi ngược hướng k thì về u
+                    heappush(heap, (nd, v))
+
+    def update(self, cells):
+        """Cập nhật trường sau khi các ô `cells` của self.grid đổi giá trị (tường <-> lối đi).
+
+        Ô bị chặn: mọi ô có đường đi qua nó bị xoá rồi nối lại từ rìa vùng
+        còn hợp lệ. Ô được mở: lan truyền các khoảng cách ngắn hơn qua nó.
+        Trả về số ô đã bị tính lại.
+        """
+        n, walls, dist, dirs, grid = self.n, self.walls, self.dist, self.dir, self.grid
+        steps, opposite = self.steps, self._opposite
+        blocked, opened = [], []
+        for r, c in cells:
+            u = r * n + c
+            wall = 1 if grid[r][c] == 1 else 0
+            if wall == walls[u]:
+                continue
+            walls[u] = wall
+            (blocked if wall else opened).append(u)
+        if not blocked and not opened:
+            return 0
+        g = self.goal[0] * n + self.goal[1]
+        if walls[g] or g in opened:
+            self.recompute()
+            return n * n
+        # 1. Xoá cây con của các ô bị chặn: những ô có hướng đi dẫn qua chúng
+        invalid = set()
+        queue = deque()
+        for u in blocked:
+            if dist[u] < INF:
+                invalid.add(u)
+                queue.append(u)
+            dist[u] = INF
+            dirs[u] = NO_DIR
+        while queue:
+            u = queue.popleft()
+            r, c = divmod(u, n)
+            for k, (dr, dc, _) in enumerate(steps):
+                nr, nc = r + dr, c + dc
+                if not (0 <= nr < n and 0 <= nc < n):
+                    continue
+                v = nr * n + nc
+                # v trỏ vào u nghĩa là bước hướng opposite[k] từ v tới u
+                if v not in invalid and dirs[v] == opposite[k]:
+                    invalid.add(v)
+                    queue.append(v)
+        for u in invalid:
+            dist[u] = INF
+            dirs[u] = NO_DIR
+        # 2. Gieo lại: ô bị xoá và ô vừa mở lấy giá trị tốt nhất từ hàng xóm còn hợp lệ
+        heap = []
+        for u in list(invalid) + opened:
+            if walls[u]:
+                continue
+            r, c = divmod(u, n)
+            best, best_k = INF, NO_DIR
+            for k, (dr, dc, cost) in enumerate(steps):
+                nr, nc = r + dr, c + dc
+                if not (0 <= nr < n and 0 <= nc < n):
+                    continue
+                v = nr * n + nc
+                if dist[v] + cost < best:
+                    best, best_k = dist[v] + cost, k
+            if best < dist[u]:
+                dist[u] = best
+                dirs[u] = best_k
+                heap.append((best, u))
+        # 3. Lan truyền các giá trị mới (chỉ giảm, vì phần tăng đã được xoá ở bước 1)
+        self._propagate(heap)
+        return len(invalid) + len(opened)
+
+    # --- Truy vấn O(1) cho robot ---
+    def distance(self, cell):
+        """Chi phí còn lại đến goal (inf nếu không tới được)."""
+        r, c = cell
+        if self.walls[r * self.n + c]:
+            return self._exit_wall(cell)[0]
+        return self.dist[r * self.n + c]
+
+    def next_move(self, cell):
+        """Ô kế tiếp trên đường ngắn nhất tới goal; None nếu đã ở goal hoặc không có đường."""
+        r, c = cell
+        u = r * self.n + c
+        if self.walls[u]:
+            # Robot đứng trên tường (như điểm đầu trên tường của solver) vẫn được bước ra
+            return self._exit_wall(cell)[1]
+        k = self.dir[u]
+        if k == NO_DIR:
+            return None
+        dr, dc, _ = self.steps[k]
+        return (r + dr, c + dc)
+
+    def _exit_wall(self, cell):
+        r, c = cell
+        n = self.n
+        best, best_cell = INF, None
+        for dr, dc, cost in self.steps:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < n and 0 <= nc < n and not self.walls[nr * n + nc]:
+                d = self.dist[nr * n + nc] + cost
+                if d < best:
+                    best, best_cell = d, (nr, nc)
+        return best, best_cell
+
+    def next_moves(self, cells):
+        return [self.next_move(cell) for cell in cells]
+
+    def path_from(self, cell):
+        """Đường đi từ cell tới goal theo trường (rỗng nếu không tới được)."""
+        cell = tuple(cell)
+        if cell == self.goal:
+            return [cell]
+        if self.distance(cell) == INF:
+            return []
+        path = [cell]
+        while cell != self.goal:
+            cell = self.next_move(cell)
+            path.append(cell)
+        return path
+
+    def reachable(self, cell):
+        return self.distance(cell) < INF
@@ -1,5 +1,7 @@
 import random
 import heapq
+import time
+from array import array
 from collections import deque
 
 # --- Tiện ích cho thuật toán tìm đường ---
@@ -39,22 +41,203 @@ def get_heuristic(a, b, method):
         return (dx*dx + dy*dy) ** 0.5 * (1 + 1e-3)
     return 0
 
+# Heuristic không vượt quá chi phí thật của mô hình 8 hướng (thẳng 1, chéo √2)
+ADMISSIBLE_HEURISTICS = frozenset({'Octile', 'Euclidean', 'Chebyshev'})
+
+def find_nearest_empty(grid, pos):
+    """Trả về ô trống gần pos nhất (BFS 4 hướng, được đi xuyên tường)."""
+    n = len(grid)
+    seen = {pos}
+    queue = deque([pos])
+    while queue:
+        u = queue.popleft()
+        if grid[u[0]][u[1]] == 0:
+            return u
+        for v in get_neighbors(u, n):
+            if v not in seen:
+                seen.add(v)
+                queue.append(v)
+    return pos
+
+class NearestOpenIndex:
+    """
+    Ô trống gần nhất của mọi ô (4 hướng, được đi xuyên tường như find_nearest_empty),
+    tính một lần cho mỗi mê cung bằng BFS nhiều nguồn từ mọi ô trống; tra cứu O(1).
+    Khi ô đổi, update(cells) chỉ tính lại vùng quanh các ô đó.
+    Khoảng cách luôn nhỏ nhất; khi nhiều ô trống cách đều, ô được chọn có thể khác
+    find_nearest_empty.
+    Dựng chỉ mục tốn một BFS trên cả n² ô (hơn 1 giây ở n=1000): chỉ đáng khi tra
+    và vá nhiều lần trên cùng mê cung (giao diện); tra một lần thì dùng find_nearest_empty.
+    """
+    def __init__(self, grid):
+        self.grid = grid
+        self.n = len(grid)
+        self.open = bytearray(1 if v == 0 else 0 for row in grid for v in row)
+        self.rebuild()
+
+    def rebuild(self):
+        size = self.n * self.n
+        self.source = array('i', [-1]) * size  # chỉ số phẳng của ô trống gần nhất, -1 = lưới không có ô trống
+        self.dist = array('i', [-1]) * size
+        queue = deque()
+        for u in range(size):
+            if self.open[u]:
+                self.source[u] = u
+                self.dist[u] = 0
+                queue.append(u)
+        self._spread(queue)
+
+    def _neighbors(self, u):
+        n = self.n
+        r, c = divmod(u, n)
+        if r + 1 < n:
+            yield u + n
+        if r > 0:
+            yield u - n
+        if c + 1 < n:
+            yield u + 1
+        if c > 0:
+            yield u - 1
+
+    def _spread(self, queue):
+        source, dist = self.source, self.dist
+        while queue:
+            u = queue.popleft()
+            nd = dist[u] + 1
+            for v in self._neighbors(u):
+                if dist[v] < 0 or nd < dist[v]:
+                    dist[v] = nd
+                    source[v] = source[u]
+                    queue.append(v)
+
+    def update(self, cells):
+        """Đồng bộ với self.grid tại các ô vừa đổi; trả về số ô đã tính lại."""
+        n, source, dist = self.n, self.source, self.dist
+        opened, closed = [], []
+        for r, c in cells:
+            u = r * n + c
+            now = 1 if self.grid[r][c] == 0 else 0
+            if now != self.open[u]:
+                self.open[u] = now
+                (opened if now else closed).append(u)
+        # Ô đóng lại: xoá vùng các ô đang lấy nó làm ô trống gần nhất (vùng này liền một khối)
+        invalid = set()
+        for s in closed:
+            if source[s] != s:
+                continue
+            stack = [s]
+            invalid.add(s)
+            while stack:
+                u = stack.pop()
+                for v in self._neighbors(u):
+                    if v not in invalid and source[v] == s:
+                        invalid.add(v)
+                        stack.append(v)
+        for u in invalid:
+            source[u] = -1
+            dist[u] = -1
+        for u in opened:
+            source[u] = u
+            dist[u] = 0
+        # Lan lại từ ô vừa mở và từ rìa còn hợp lệ của vùng bị xoá, gần trước xa sau
+        seeds = set(opened)
+        for u in invalid:
+            for v in self._neighbors(u):
+                if dist[v] >= 0:
+                    seeds.add(v)
+        self._spread(deque(sorted(seeds, key=dist.__getitem__)))
+        return len(invalid) + len(opened)
+
+    def nearest(self, pos):
+        """Ô trống gần pos nhất (chính pos nếu nó trống, hoặc nếu lưới không có ô trống)."""
+        s = self.source[pos[0] * self.n + pos[1]]
+        return tuple(pos) if s < 0 else divmod(s, self.n)
+
+    def distance(self, pos):
+        return self.dist[pos[0] * self.n + pos[1]]
+
+# --- Thống kê tìm đường ---
+class SearchStats:
+    """Bộ đếm cho một lần tìm đường.
+
+    Chỉ được điền khi truyền vào solver qua tham số stats; khi stats=None các
+    solver không đếm gì cả.
+    """
+    __slots__ = ('expansions', 'pushes', 'pops', 'stale_pops', 'peak_open',
+                 'peak_closed', 'heuristic_evals', 'cpu_time')
+
+    def __init__(self):
+        self.expansions = 0
+        self.pushes = 0
+        self.pops = 0
+        self.stale_pops = 0
+        self.peak_open = 0
+        self.peak_closed = 0
+        self.heuristic_evals = 0
+        self.cpu_time = 0.0
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def summary(self):
+        """Chuỗi nhiều dòng để hiển thị trên giao diện."""
+        return (f'Expansions: {self.expansions}\n'
+                f'Push / Pop: {self.pushes} / {self.pops}\n'
+                f'Stale pops: {self.stale_pops}\n'
+                f'Peak open / closed: {self.peak_open} / {self.peak_closed}\n'
+                f'Heuristic evals: {self.heuristic_evals}\n'
+                f'CPU time: {self.cpu_time * 1000:.2f} ms')
+
+    def __repr__(self):
+        fields = ', '.join(f'{k}={v!r}' for k, v in self.as_dict().items())
+        return f'SearchStats({fields})'
+
+def timed_steps(gen, stats):
+    """Bọc generator để cộng dồn thời gian CPU của riêng thuật toán vào stats.cpu_time.
+
+    Dùng đồng hồ của luồng hiện tại, nên vẫn đúng khi thuật toán chạy ở luồng nền.
+    """
+    clock = time.thread_time
+    while True:
+        t0 = clock()
+        try:
+            event = next(gen)
+        except StopIteration:
+            stats.cpu_time += clock() - t0
+            return
+        stats.cpu_time += clock() - t0
+        yield event
+
 # --- Thuật toán tìm đường ---
-def bfs_generator(grid, start, goal):
+def bfs_generator(grid, start, goal, stats=None, components=None):
+    if components is not None and not components.connected(start, goal, 4):
+        return
     n = len(grid)
     visited = {start}
     parent = {start: None}
     queue = deque([start])
+    if stats is not None:
+        stats.pushes += 1
+        stats.peak_open = max(stats.peak_open, 1)
     while queue:
         u = queue.popleft()
+        if stats is not None:
+            stats.pops += 1
         yield 'visit', u
         if u == goal:
             break
+        if stats is not None:
+            stats.expansions += 1
+            stats.peak_closed = stats.expansions
         for v in get_neighbors(u, n):
             if v not in visited and grid[v[0]][v[1]] == 0:
                 visited.add(v)
                 parent[v] = u
                 queue.append(v)
+                if stats is not None:
+                    stats.pushes += 1
+                    if len(queue) > stats.peak_open:
+                        stats.peak_open = len(queue)
                 yield 'visit', v
     else:
         return
@@ -66,23 +249,91 @@ def bfs_generator(grid, start, goal):
     for cell in reversed(path):
         yield 'path', cell
 
-def dfs_generator(grid, start, goal):
+def bidirectional_bfs_generator(grid, start, goal, stats=None, components=None):
+    """BFS hai chiều (4 hướng): mở rộng từng tầng của phía có frontier nhỏ hơn,
+    dừng ở lần gặp nhau đầu tiên; đường đi vẫn ngắn nhất như BFS."""
+    if components is not None and not components.connected(start, goal, 4, wall_goal=True):
+        return
+    n = len(grid)
+    parents = ({start: None}, {goal: None})
+    queues = (deque([start]), deque([goal]))
+    if stats is not None:
+        stats.pushes += 2
+        stats.peak_open = max(stats.peak_open, 2)
+    meet = start if start == goal else None
+    while meet is None and queues[0] and queues[1]:
+        side = 0 if len(queues[0]) <= len(queues[1]) else 1
+        queue, seen, other = queues[side], parents[side], parents[1 - side]
+        for _ in range(len(queue)):
+            u = queue.popleft()
+            if stats is not None:
+                stats.pops += 1
+                stats.expansions += 1
+                stats.peak_closed = stats.expansions
+            yield 'visit', u
+            for v in get_neighbors(u, n):
+                if v not in seen and grid[v[0]][v[1]] == 0:
+                    seen[v] = u
+                    if stats is not None:
+                        stats.pushes += 1
+                    yield 'visit', v
+                    if v in other:
+                        meet = v
+                        break
+                    queue.append(v)
+            if meet is not None:
+                break
+            if stats is not None and len(queues[0]) + len(queues[1]) > stats.peak_open:
+                stats.peak_open = len(queues[0]) + len(queues[1])
+    if meet is None:
+        return
+    # start -> meet theo cây phía đầu, rồi meet -> goal theo cây phía cuối
+    path = []
+    node = meet
+    while node is not None:
+        path.append(node)
+        node = parents[0][node]
+    path.reverse()
+    node = parents[1][meet]
+    while node is not None:
+        path.append(node)
+        node = parents[1][node]
+    for cell in path:
+        yield 'path', cell
+
+def dfs_generator(grid, start, goal, stats=None, components=None):
+    if components is not None and not components.connected(start, goal, 4):
+        return
     n = len(grid)
     visited = set()
     parent = {start: None}
     stack = [start]
+    if stats is not None:
+        stats.pushes += 1
+        stats.peak_open = max(stats.peak_open, 1)
     while stack:
         u = stack.pop()
+        if stats is not None:
+            stats.pops += 1
         if u in visited:
+            if stats is not None:
+                stats.stale_pops += 1
             continue
         visited.add(u)
         yield 'visit', u
         if u == goal:
             break
+        if stats is not None:
+            stats.expansions += 1
+            stats.peak_closed = len(visited)
         for v in get_neighbors(u, n):
             if v not in visited and grid[v[0]][v[1]] == 0:
                 parent[v] = u
                 stack.append(v)
+                if stats is not None:
+                    stats.pushes += 1
+                    if len(stack) > stats.peak_open:
+                        stats.peak_open = len(stack)
                 yield 'visit', v
     else:
         return
@@ -94,20 +345,32 @@ def dfs_generator(grid, start, goal):
     for cell in reversed(path):
         yield 'path', cell
 
-def dijkstra_generator(grid, start, goal):
+def dijkstra_generator(grid, start, goal, stats=None, components=None):
+    if components is not None and not components.connected(start, goal, 8):
+        return
     n = len(grid)
     dist = {start: 0}
     parent = {}
     visited = set()
     heap = [(0, start)]
+    if stats is not None:
+        stats.pushes += 1
+        stats.peak_open = max(stats.peak_open, 1)
     while heap:
         d, u = heapq.heappop(heap)
+        if stats is not None:
+            stats.pops += 1
         if u in visited:
+            if stats is not None:
+                stats.stale_pops += 1
             continue
         visited.add(u)
         yield 'visit', u
         if u == goal:
             break
+        if stats is not None:
+            stats.expansions += 1
+            stats.peak_closed = len(visited)
         for v, cost in get_neighbors_cost(u, n):
             if grid[v[0]][v[1]] == 1:
                 continue
@@ -116,6 +379,10 @@ def dijkstra_generator(grid, start, goal):
                 dist[v] = nd
                 parent[v] = u
                 heapq.heappush(heap, (nd, v))
+                if stats is not None:
+                    stats.pushes += 1
+                    if len(heap) > stats.peak_open:
+                        stats.peak_open = len(heap)
     if goal not in parent and start != goal:
         return
     path = []
@@ -127,20 +394,33 @@ def dijkstra_generator(grid, start, goal):
     for cell in reversed(path):
         yield 'path', cell
 
-def astar_generator(grid, start, goal, heuristic):
+def astar_generator(grid, start, goal, heuristic, stats=None, components=None):
+    if components is not None and not components.connected(start, goal, 8):
+        return
     n = len(grid)
     g_score = {start: 0}
     f_score = {start: get_heuristic(start, goal, heuristic)}
     open_set = [(f_score[start], start)]
     came_from = {}
     closed = set()
+    if stats is not None:
+        stats.heuristic_evals += 1
+        stats.pushes += 1
+        stats.peak_open = max(stats.peak_open, 1)
     while open_set:
         _, current = heapq.heappop(open_set)
+        if stats is not None:
+            stats.pops += 1
         if current == goal:
             break
         if current in closed:
+            if stats is not None:
+                stats.stale_pops += 1
             continue
         closed.add(current)
+        if stats is not None:
+            stats.expansions += 1
+            stats.peak_closed = len(closed)
         yield 'visit', current
         for v, cost in get_neighbors_cost(current, n):
             if grid[v[0]][v[1]] == 1:
@@ -152,6 +432,11 @@ def astar_generator(grid, start, goal, heuristic):
             g_score[v] = tentative_g
             f_score[v] = tentative_g + get_heuristic(v, goal, heuristic)
             heapq.heappush(open_set, (f_score[v], v))
+            if stats is not None:
+                stats.heuristic_evals += 1
+                stats.pushes += 1
+                if len(open_set) > stats.peak_open:
+                    stats.peak_open = len(open_set)
     if goal not in came_from and start != goal:
         return
     path = []
@@ -163,44 +448,303 @@ def astar_generator(grid, start, goal, heuristic):
     for cell in reversed(path):
         yield 'path', cell
 
-# Thêm lại các hàm trả về đường đi cuối cùng (dùng cho logic nội bộ)
-def bfs(grid, start, goal):
-    gen = bfs_generator(grid, start, goal)
-    path = []
-    for typ, cell in gen:
-        if typ == 'path':
-            path.append(cell)
-    return path
+def ara_star(grid, start, goal, heuristic='Octile', epsilon=5.0, step=1.0, deadline=None, stats=None,
+             components=None):
+    """
+    Anytime Repairing A* (ARA*): A* có trọng số với hệ số thổi phồng epsilon giảm dần.
+    Mỗi lần tìm được đường tốt hơn, sinh dict {path, cost, epsilon, bound, elapsed};
+    bound là cận trên đã chứng minh của cost / cost tối ưu (1.0 = tối ưu), None
+    nếu heuristic không nằm trong ADMISSIBLE_HEURISTICS (không chứng minh được gì).
+    Nếu có stats, thời gian CPU được cộng vào stats.cpu_time như timed_steps.
+    Công sức giữa các vòng được dùng lại: chỉ các ô không nhất quán (INCONS)
+    và tập mở được sắp lại, không tìm lại từ đầu.
+    deadline: thời điểm perf_counter() phải dừng; vòng đầu luôn chạy đến khi có
+    đường (hoặc chắc chắn không có), các vòng sau dừng ngay khi quá hạn.
+    """
+    gen = _ara_star(grid, start, goal, heuristic, epsilon, step, deadline, stats, components)
+    if stats is not None:
+        gen = timed_steps(gen, stats)
+    return gen
 
-def dfs(grid, start, goal):
-    gen = dfs_generator(grid, start, goal)
-    path = []
-    for typ, cell in gen:
-        if typ == 'path':
-            path.append(cell)
-    return path
+def _ara_star(grid, start, goal, heuristic, epsilon, step, deadline, stats, components):
+    if components is not None and not components.connected(start, goal, 8):
+        return
+    n = len(grid)
+    clock = time.perf_counter
+    t_start = clock()
+    h_cache = {}
+    proven = heuristic in ADMISSIBLE_HEURISTICS
+
+    def h(cell):
+        value = h_cache.get(cell)
+        if value is None:
+            value = h_cache[cell] = get_heuristic(cell, goal, heuristic)
+            if stats is not None:
+                stats.heuristic_evals += 1
+        return value
+
+    g = {start: 0}
+    parent = {}
+    open_heap = []
+    open_set = set()
+    closed = set()
+    incons = set()
+
+    def push(cell):
+        # Khi khoá bằng nhau, ưu tiên ô có g lớn hơn (gần goal hơn)
+        heapq.heappush(open_heap, (g[cell] + epsilon * h(cell), -g[cell], cell))
+        open_set.add(cell)
+        if stats is not None:
+            stats.pushes += 1
+            if len(open_heap) > stats.peak_open:
+                stats.peak_open = len(open_heap)
+
+    def improve_path(may_abort):
+        """Mở rộng đến khi goal tốt hơn mọi khoá trong tập mở; False nếu bị cắt vì quá hạn."""
+        pops = 0
+        while open_heap:
+            key, neg_g, u = open_heap[0]
+            if goal in g and g[goal] <= key:
+                return True
+            heapq.heappop(open_heap)
+            if stats is not None:
+                stats.pops += 1
+            if u in closed or -neg_g != g[u]:
+                if stats is not None:
+                    stats.stale_pops += 1
+                continue
+            open_set.discard(u)
+            closed.add(u)
+            if stats is not None:
+                stats.expansions += 1
+                stats.peak_closed = max(stats.peak_closed, len(closed))
+            pops += 1
+            if may_abort and deadline is not None and pops % 256 == 0 and clock() >= deadline:
+                return False
+            gu = g[u]
+            for v, cost in get_neighbors_cost(u, n):
+                if grid[v[0]][v[1]] == 1:
+                    continue
+                nv = gu + cost
+                if nv < g.get(v, float('inf')):
+                    g[v] = nv
+                    parent[v] = u
+                    if v in closed:
+                        incons.add(v)
+                    else:
+                        push(v)
+        return True
+
+    def current_bound():
+        """min(epsilon, g(goal) / min(g + h) trên OPEN ∪ INCONS)."""
+        low = min((g[c] + h(c) for c in open_set | incons), default=None)
+        if low is None or low <= 0:
+            return 1.0 if low is None else epsilon
+        return max(1.0, min(epsilon, g[goal] / low))
+
+    def solution():
+        path = [goal]
+        node = goal
+        while node != start:
+            node = parent[node]
+            path.append(node)
+        path.reverse()
+        # Cha của các ô trên đường có thể đã được cải thiện sau khi goal được gán g,
+        # nên chi phí thật của đường lần theo cha có thể nhỏ hơn g(goal)
+        cost = sum(1 if a[0] == b[0] or a[1] == b[1] else 2**0.5 for a, b in zip(path, path[1:]))
+        return {'path': path, 'cost': cost, 'epsilon': epsilon, 'bound': current_bound() if proven else None,
+                'elapsed': clock() - t_start}
+
+    if start == goal:
+        yield {'path': [start], 'cost': 0, 'epsilon': 1.0, 'bound': 1.0, 'elapsed': clock() - t_start}
+        return
+    push(start)
+    improve_path(may_abort=False)
+    if goal not in g:
+        return
+    best = g[goal]
+    yield solution()
+    while epsilon > 1.0:
+        if deadline is not None and clock() >= deadline:
+            return
+        epsilon = max(1.0, epsilon - step)
+        # Gộp INCONS vào tập mở và sắp lại theo epsilon mới; CLOSED làm rỗng
+        cells = open_set | incons
+        open_heap.clear()
+        open_set.clear()
+        incons.clear()
+        closed.clear()
+        for cell in cells:
+            push(cell)
+        if not improve_path(may_abort=True):
+            return
+        if g[goal] < best or epsilon == 1.0:
+            best = g[goal]
+            yield solution()
+
+def anytime_astar(grid, start, goal, heuristic='Octile', time_limit=0.005, epsilon=5.0, step=1.0, stats=None,
+                  components=None):
+    """
+    Trả về lời giải tốt nhất của ara_star trong time_limit giây (dict như ara_star,
+    hoặc None nếu không có đường). Luôn có đường đầu tiên nếu tồn tại, kể cả khi
+    vòng đầu vượt quá time_limit.
+    """
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    best = None
+    for best in ara_star(grid, start, goal, heuristic, epsilon, step, deadline, stats, components):
+        pass
+    return best
+
+# --- Bảng ánh xạ các thuật toán tìm đường ---
+SOLVER_GENERATORS = {
+    'BFS': bfs_generator,
+    'Bidirectional BFS': bidirectional_bfs_generator,
+    'DFS': dfs_generator,
+    'Dijkstra': dijkstra_generator,
+    'A*': astar_generator
+}
+
+def solver_generator(algorithm, grid, start, goal, heuristic='Manhattan', stats=None, components=None):
+    """
+    Tạo generator sự kiện ('visit' | 'path', ô) cho thuật toán được chọn.
+    Nếu có stats, generator được bọc để đo thêm thời gian CPU.
+    components: ComponentIndex (WOM_MAZE_COMPONENTS) của grid; khi start và goal
+    khác vùng, generator kết thúc ngay mà không tìm.
+    """
+    try:
+        gen_func = SOLVER_GENERATORS[algorithm]
+    except KeyError:
+        raise ValueError(f'Unknown algorithm: {algorithm}')
+    if gen_func is astar_generator:
+        gen = gen_func(grid, start, goal, heuristic, stats=stats, components=components)
+    else:
+        gen = gen_func(grid, start, goal, stats=stats, components=components)
+    if stats is not None:
+        gen = timed_steps(gen, stats)
+    return gen
 
-def dijkstra(grid, start, goal):
-    gen = dijkstra_generator(grid, start, goal)
+def _collect_path(gen, stats=None):
+    if stats is not None:
+        gen = timed_steps(gen, stats)
     path = []
     for typ, cell in gen:
         if typ == 'path':
             path.append(cell)
     return path
 
-def astar(grid, start, goal, heuristic):
-    gen = astar_generator(grid, start, goal, heuristic)
-    path = []
-    for typ, cell in gen:
-        if typ == 'path':
-            path.append(cell)
+# Thêm lại các hàm trả về đường đi cuối cùng (dùng cho logic nội bộ)
+def bfs(grid, start, goal, stats=None):
+    return _collect_path(bfs_generator(grid, start, goal, stats), stats)
+
+def dfs(grid, start, goal, stats=None):
+    return _collect_path(dfs_generator(grid, start, goal, stats), stats)
+
+def dijkstra(grid, start, goal, stats=None):
+    return _collect_path(dijkstra_generator(grid, start, goal, stats), stats)
+
+def astar(grid, start, goal, heuristic, stats=None):
+    return _collect_path(astar_generator(grid, start, goal, heuristic, stats), stats)
+
+def solve(grid, start, goal, algorithm='BFS', heuristic='Manhattan', components=None):
+    """Giải một truy vấn và trả về (đường đi, SearchStats)."""
+    stats = SearchStats()
+    path = _collect_path(solver_generator(algorithm, grid, start, goal, heuristic, stats, components))
+    return path, stats
+
+def time_solver(grid, start, goal, algorithm='BFS', heuristic='Manhattan', repeat=5):
+    """
+    Đo thời gian thực của thuật toán, không hoạt hình và không bộ đếm:
+    chạy repeat lần bằng perf_counter_ns, trả về dict trung vị / nhỏ nhất / lớn nhất (ns).
+    """
+    clock = time.perf_counter_ns
+    times = []
+    path_length = 0
+    for _ in range(max(1, repeat)):
+        path_length = 0
+        t0 = clock()
+        for typ, _ in solver_generator(algorithm, grid, start, goal, heuristic):
+            if typ == 'path':
+                path_length += 1
+        times.append(clock() - t0)
+    times.sort()
+    mid = len(times) // 2
+    median = times[mid] if len(times) % 2 else (times[mid - 1] + times[mid]) // 2
+    return {
+        'runs': len(times),
+        'median_ns': median,
+        'min_ns': times[0],
+        'max_ns': times[-1],
+        'spread_ns': times[-1] - times[0],
+        'path_length': path_length,
+    }
+
+def format_timing(timing):
+    """Chuỗi ngắn cho giao diện: trung vị và khoảng dao động, đơn vị ms."""
+    return (f"{timing['median_ns'] / 1e6:.2f} ms "
+            f"(±{timing['spread_ns'] / 2e6:.2f}, n={timing['runs']})")
+
+# --- Bản đồ khoảng cách từ nhiều nguồn ---
+def distance_field(grid, sources, moves=4, backend=None):
+    """
+    Số bước từ mọi ô tới nguồn gần nhất (BFS nhiều nguồn, mỗi bước tính 1).
+    Trả về (dist, pred): dist[r][c] = -1 nếu không tới được; pred[r][c] là chỉ
+    số trong WAVEFRONT_DIRECTIONS của bước về phía nguồn (-1 ở nguồn).
+    backend: None = NumPy (WOM_MAZE_WAVEFRONT) nếu cài được, ngược lại thuần
+    Python; 'numpy' / 'python' để chọn hẳn. Bản NumPy trả về mảng int32.
+    """
+    if backend not in (None, 'numpy', 'python'):
+        raise ValueError(f'Unknown backend: {backend}')
+    if backend != 'python':
+        try:
+            import WOM_MAZE_WAVEFRONT as wavefront
+        except ImportError:
+            if backend == 'numpy':
+                raise
+        else:
+            return wavefront.distance_field(grid, sources, moves)
+    if moves not in (4, 8):
+        raise ValueError(f'moves must be 4 or 8, got {moves!r}')
+    n = len(grid)
+    dirs = WAVEFRONT_DIRECTIONS[:moves]
+    back = [WAVEFRONT_DIRECTIONS.index((-dr, -dc)) for dr, dc in dirs]
+    dist = [[-1] * n for _ in range(n)]
+    pred = [[-1] * n for _ in range(n)]
+    queue = deque()
+    for r, c in sources:
+        if dist[r][c] == -1:
+            dist[r][c] = 0
+            queue.append((r, c))
+    while queue:
+        r, c = queue.popleft()
+        d = dist[r][c] + 1
+        for k, (dr, dc) in enumerate(dirs):
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < n and 0 <= nc < n and dist[nr][nc] == -1 and grid[nr][nc] != 1:
+                dist[nr][nc] = d
+                pred[nr][nc] = back[k]
+                queue.append((nr, nc))
+    return dist, pred
+
+# Cùng thứ tự với get_neighbors (4 hướng đầu) và get_neighbors_cost
+WAVEFRONT_DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+def path_to_source(dist, pred, cell):
+    """Lần theo pred của distance_field từ cell về nguồn gần nhất; rỗng nếu không tới được."""
+    r, c = cell
+    if dist[r][c] == -1:
+        return []
+    path = [(r, c)]
+    while pred[r][c] != -1:
+        dr, dc = WAVEFRONT_DIRECTIONS[pred[r][c]]
+        r, c = r + dr, c + dc
+        path.append((r, c))
     return path
 
 # --- Sinh mê cung ---
-def add_loops(grid, n, loops):
+def add_loops(grid, n, loops, rng=random):
     """Thêm các vòng lặp để tạo nhiều đường đi hơn."""
     walls = [(r, c) for r in range(1, n-1) for c in range(1, n-1) if grid[r][c] == 1]
-    random.shuffle(walls)
+    rng.shuffle(walls)
     removed = 0
     for r, c in walls:
         if removed >= loops:
@@ -234,29 +778,37 @@ def add_targeted_loops(grid, start, end, loops=1):
         grid[r][c] = 0
     return grid
 
-def maze_recursive_backtracking(n):
+def maze_recursive_backtracking(n, rng=random):
     """Sinh mê cung bằng đệ quy quay lui."""
     grid = [[1] * n for _ in range(n)]
-    def carve(r, c):
+    def shuffled_dirs():
         dirs = [(2, 0), (-2, 0), (0, 2), (0, -2)]
-        random.shuffle(dirs)
+        rng.shuffle(dirs)
+        return dirs
+    # Dùng ngăn xếp tường minh thay cho đệ quy để không vượt giới hạn đệ quy khi n lớn
+    # (thứ tự gọi random giữ nguyên nên mê cung sinh ra giống hệt bản đệ quy).
+    sr = rng.randrange(0, n-2, 2)
+    sc = rng.randrange(0, n-2, 2)
+    grid[sr][sc] = 0
+    stack = [(sr, sc, iter(shuffled_dirs()))]
+    while stack:
+        r, c, dirs = stack[-1]
         for dr, dc in dirs:
             nr, nc = r + dr, c + dc
             if 0 <= nr < n and 0 <= nc < n and grid[nr][nc] == 1:
                 grid[r + dr//2][c + dc//2] = 0
                 grid[nr][nc] = 0
-                carve(nr, nc)
-    sr = random.randrange(0, n-2, 2)
-    sc = random.randrange(0, n-2, 2)
-    grid[sr][sc] = 0
-    carve(sr, sc)
+                stack.append((nr, nc, iter(shuffled_dirs())))
+                break
+        else:
+            stack.pop()
     return grid
 
-def maze_prim(n):
+def maze_prim(n, rng=random):
     """Sinh mê cung bằng thuật toán Prim."""
     grid = [[1] * n for _ in range(n)]
-    sr = random.randrange(0, n-2, 2)
-    sc = random.randrange(0, n-2, 2)
+    sr = rng.randrange(0, n-2, 2)
+    sc = rng.randrange(0, n-2, 2)
     grid[sr][sc] = 0
     walls = []
     for dr, dc in [(2, 0), (-2, 0), (0, 2), (0, -2)]:
@@ -264,7 +816,7 @@ def maze_prim(n):
         if 0 <= nr < n and 0 <= nc < n:
             walls.append((nr, nc, (sr, sc)))
     while walls:
-        idx = random.randrange(len(walls))
+        idx = rng.randrange(len(walls))
         r, c, (pr, pc) = walls.pop(idx)
         if grid[r][c] == 1 and grid[pr][pc] == 0:
             grid[(r+pr)//2][(c+pc)//2] = 0
@@ -275,7 +827,7 @@ def maze_prim(n):
                     walls.append((nr, nc, (r, c)))
     return grid
 
-def maze_kruskal(n):
+def maze_kruskal(n, rng=random):
     """Sinh mê cung bằng thuật toán Kruskal."""
     parent = {}
     def find(x):
@@ -285,7 +837,7 @@ def maze_kruskal(n):
         return x
     def union(a, b):
         parent[find(a)] = find(b)
-    cells = [(r, c) for r in range(0, n-1, 2) for c in range(0, n-1, 2)]
+    cells = [(r, c) for r in range(0, n, 2) for c in range(0, n, 2)]
     for cell in cells:
         parent[cell] = cell
     edges = []
@@ -294,7 +846,7 @@ def maze_kruskal(n):
             edges.append(((r, c), (r+2, c)))
         if c + 2 < n:
             edges.append(((r, c), (r, c+2)))
-    random.shuffle(edges)
+    rng.shuffle(edges)
     grid = [[1] * n for _ in range(n)]
     for r, c in cells:
         grid[r][c] = 0
@@ -306,7 +858,7 @@ def maze_kruskal(n):
             grid[(ar+br)//2][(ac+bc)//2] = 0
     return grid
 
-def maze_eller(n):
+def maze_eller(n, rng=random):
     """Sinh mê cung bằng thuật toán Eller (theo từng hàng)."""
     grid = [[1] * n for _ in range(n)]
     if n < 3:
@@ -326,7 +878,7 @@ def maze_eller(n):
             x = cell_cols[i]
             x2 = cell_cols[i+1]
             if sets[(y, x)] != sets[(y, x2)]:
-                if is_last or random.choice([True, False]):
+                if is_last or rng.choice([True, False]):
                     grid[y][x+1] = 0
                     old_id = sets[(y, x2)]
                     new_id = sets[(y, x)]
@@ -341,9 +893,9 @@ def maze_eller(n):
                 groups.setdefault(sid, []).append(x)
             new_sets = {}
             for sid, xs in groups.items():
-                choices = [x for x in xs if random.choice([True, False])]
+                choices = [x for x in xs if rng.choice([True, False])]
                 if not choices:
-                    choices = [random.choice(xs)]
+                    choices = [rng.choice(xs)]
                 for x in choices:
                     grid[y+1][x] = 0
                     grid[next_y][x] = 0
@@ -365,18 +917,20 @@ MAZE_GENERATORS = {
     'Eller': maze_eller
 }
 
-def generate_maze(n, algorithm='Recursive Backtracking', variant=None):
+def generate_maze(n, algorithm='Recursive Backtracking', variant=None, rng=random):
     """
     Sinh mê cung kích thước n x n.
     algorithm: ['Recursive Backtracking','Prim','Kruskal','Eller'].
     variant: tuỳ chọn biến thể (chưa dùng).
+    rng: nguồn ngẫu nhiên (mặc định module random); truyền random.Random(seed)
+    để sinh lại đúng mê cung đó mà không đụng tới trạng thái toàn cục.
     Trả về lưới 2D với 0=lối đi, 1=tường.
     """
     try:
         gen_func = MAZE_GENERATORS[algorithm]
     except KeyError:
         raise ValueError(f'Unknown algorithm: {algorithm}')
-    grid = gen_func(n)
+    grid = gen_func(n, rng)
     loops = max(1, n // 10)
-    grid = add_loops(grid, n, loops)
+    grid = add_loops(grid, n, loops, rng)
     return grid
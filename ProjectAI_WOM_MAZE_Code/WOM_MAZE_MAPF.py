@@ -0,0 +1,432 @@
+"""Tìm đường cho nhiều robot cùng lúc, không va chạm (multi-agent pathfinding).
+
+Mỗi robot đi 4 hướng (get_neighbors) hoặc đứng yên, mỗi bước mất 1 đơn vị
+thời gian. Kế hoạch của các robot đã lập được ghi vào bảng đặt chỗ không-thời
+gian (ReservationTable); robot sau tìm đường bằng A* trên không gian
+(ô, thời điểm) và tránh mọi ô/cạnh đã bị đặt:
+    - 'WHCA*'      : Windowed Hierarchical Cooperative A*, chỉ lập kế hoạch
+                     `window` bước, đi `step` bước rồi lập lại, xoay vòng ưu tiên;
+    - 'Prioritized': lập kế hoạch đầy đủ theo thứ tự ưu tiên, robot đã tới đích
+                     giữ chỗ ở đích; thất bại thì đưa robot đó lên đầu và thử lại.
+plan() chạy WHCA* trước, nếu bế tắc hoặc có va chạm thì chuyển sang Prioritized.
+
+    agents = random_agents(grid, 20)                # [(start, goal), ...]
+    result = plan(grid, agents)
+    result.paths[i][t]                              # vị trí robot i ở thời điểm t
+
+Heuristic mặc định là khoảng cách thật tới đích (WOM_MAZE_FLOW, 4 hướng), hoặc
+một heuristic của get_heuristic (ví dụ 'Manhattan').
+
+    python WOM_MAZE_MAPF.py --size 41 --agents 5 10 20 40
+"""
+import argparse
+import heapq
+import random
+import sys
+import time
+from collections import deque
+
+import WOM_MAZE_LOGIC as logic
+from WOM_MAZE_FLOW import FlowField, INF
+
+METHODS = ('WHCA*', 'Prioritized')
+TRUE_DISTANCE = 'True distance'
+
+
+class ReservationTable:
+    """Bảng đặt chỗ không-thời gian; mọi khoá là số nguyên trong set (băm gọn).
+
+    vertex: t*size + ô        - ô bị chiếm ở thời điểm t
+    edge  : (t*size + u)*size + v - có robot đi u -> v trong khoảng (t, t+1)
+    parked: ô -> t            - robot đứng yên ở ô (đích) từ t trở đi
+    """
+
+    def __init__(self, n):
+        self.size = n * n
+        self.vertex = set()
+        self.edge = set()
+        self.parked = {}
+        self.last = {}  # ô -> thời điểm muộn nhất ô bị đặt (để biết có dừng lại được không)
+
+    def is_free(self, cell, t):
+        parked = self.parked.get(cell)
+        if parked is not None and t >= parked:
+            return False
+        return t * self.size + cell not in self.vertex
+
+    def can_move(self, u, v, t):
+        """Đi u -> v (hoặc đứng yên nếu u == v) từ t đến t+1."""
+        if not self.is_free(v, t + 1):
+            return False
+        size = self.size
+        return u == v or (t * size + v) * size + u not in self.edge  # không đổi chỗ cho nhau
+
+    def can_park(self, cell, t):
+        """Đứng yên ở cell mãi mãi kể từ t mà không chặn ai."""
+        return self.last.get(cell, -1) < t and cell not in self.parked
+
+    def reserve(self, path, t0=0, park=False):
+        """Đặt chỗ cho đường đi path (các chỉ số ô) bắt đầu ở thời điểm t0."""
+        size = self.size
+        for k, cell in enumerate(path):
+            t = t0 + k
+            self.vertex.add(t * size + cell)
+            if self.last.get(cell, -1) < t:
+                self.last[cell] = t
+            if k:
+                self.edge.add(((t - 1) * size + path[k - 1]) * size + cell)
+        if park and path:
+            self.parked[path[-1]] = t0 + len(path) - 1
+
+    def __len__(self):
+        return len(self.vertex) + len(self.edge) + len(self.parked)
+
+
+class MAPFResult:
+    """Kết quả lập kế hoạch: paths[i][t] = (hàng, cột), đã kéo dài đến makespan."""
+
+    def __init__(self, agents, paths, method, success, expansions, cpu_time, replans=0, failed=None):
+        self.agents = agents
+        self.paths = paths
+        self.method = method
+        self.success = success
+        self.expansions = expansions
+        self.cpu_time = cpu_time
+        self.replans = replans
+        self.failed = failed or []
+
+    @property
+    def makespan(self):
+        return max((len(p) - 1 for p in self.paths), default=0)
+
+    @property
+    def sum_of_costs(self):
+        """Tổng thời điểm mỗi robot tới đích lần cuối (không rời đi nữa)."""
+        total = 0
+        for (start, goal), path in zip(self.agents, self.paths):
+            t = len(path) - 1
+            while t > 0 and path[t - 1] == goal:
+                t -= 1
+            total += t
+        return total
+
+    def as_dict(self):
+        return {'agents': len(self.agents), 'method': self.method, 'success': self.success,
+                'makespan': self.makespan, 'sum_of_costs': self.sum_of_costs,
+                'expansions': self.expansions, 'cpu_ms': self.cpu_time * 1000, 'replans': self.replans}
+
+
+# --- A* không-thời gian ---
+class _Context:
+    """Dữ liệu dùng chung khi lập kế hoạch trên một lưới: tường phẳng, heuristic theo đích."""
+
+    def __init__(self, grid, heuristic):
+        self.grid = grid
+        self.n = n = len(grid)
+        self.walls = bytearray(1 if v == 1 else 0 for row in grid for v in row)
+        self.heuristic = heuristic
+        self.fields = {}
+        self.neighbors = [None] * (n * n)
+        self.expansions = 0
+
+    def moves(self, u):
+        """Các ô có thể tới từ u trong một bước: đứng yên + hàng xóm 4 hướng không phải tường."""
+        nb = self.neighbors[u]
+        if nb is None:
+            n = self.n
+            nb = [u] + [r * n + c for r, c in logic.get_neighbors(divmod(u, n), n)
+                        if not self.walls[r * n + c]]
+            self.neighbors[u] = nb
+        return nb
+
+    def h_table(self, goal):
+        """Hàm u -> ước lượng số bước tới goal."""
+        field = self.fields.get(goal)
+        if field is None:
+            n = self.n
+            gcell = divmod(goal, n)
+            if self.heuristic == TRUE_DISTANCE:
+                flow = FlowField(self.grid, gcell, moves=4)
+                field = flow.dist
+            else:
+                method = self.heuristic
+                field = [logic.get_heuristic(divmod(u, n), gcell, method) for u in range(n * n)]
+            self.fields[goal] = field
+        return field
+
+    def search(self, start, goal, table, t0, horizon, window=None):
+        """A* trên (ô, t). Trả về danh sách ô từ t0, hoặc None nếu không tìm được.
+
+        window=None: phải tới goal và dừng lại được ở đó (can_park).
+        window=W   : dừng khi tới goal (còn trống đến hết cửa sổ) hoặc khi đã đi đủ W bước.
+        """
+        h = self.h_table(goal)
+        if h[start] == INF:
+            return None
+        size = self.n * self.n
+        end_t = t0 + (window if window is not None else horizon)
+        start_key = t0 * size + start
+        parent = {start_key: None}
+        heap = [(h[start], 0, t0, start)]
+        tie = 0
+        while heap:
+            _, _, t, u = heapq.heappop(heap)
+            self.expansions += 1
+            key = t * size + u
+            if u == goal and self._can_stop(table, u, t, t0, window):
+                return self._unwind(parent, key, size)
+            if window is not None and t >= end_t:
+                return self._unwind(parent, key, size)
+            if t >= end_t:
+                continue
+            for v in self.moves(u):
+                nkey = (t + 1) * size + v
+                if nkey in parent or h[v] == INF:
+                    continue
+                if not table.can_move(u, v, t):
+                    continue
+                parent[nkey] = key
+                tie += 1
+                # Ưu tiên nút sâu hơn khi f bằng nhau (ít mở rộng hơn)
+                heapq.heappush(heap, (t + 1 - t0 + h[v], -tie, t + 1, v))
+        return None
+
+    @staticmethod
+    def _can_stop(table, u, t, t0, window):
+        if window is None:
+            return table.can_park(u, t)
+        return all(table.is_free(u, k) for k in range(t + 1, t0 + window + 1))
+
+    @staticmethod
+    def _unwind(parent, key, size):
+        path = []
+        while key is not None:
+            path.append(key % size)
+            key = parent[key]
+        path.reverse()
+        return path
+
+
+def _horizon(ctx, cells):
+    """Giới hạn thời gian cho tìm kiếm: đủ cho đường dài nhất cộng thời gian nhường đường."""
+    longest = 0
+    for start, goal in cells:
+        d = ctx.h_table(goal)[start]
+        if d != INF and d > longest:
+            longest = int(d)
+    return 2 * longest + 4 * len(cells) + 16
+
+
+def _to_cells(ctx, agents):
+    n = ctx.n
+    return [(s[0] * n + s[1], g[0] * n + g[1]) for s, g in agents]
+
+
+def _finish(ctx, agents, index_paths, method, success, t0, replans=0, failed=None):
+    n = ctx.n
+    makespan = max((len(p) for p in index_paths), default=1)
+    paths = []
+    for p in index_paths:
+        p = p + [p[-1]] * (makespan - len(p))
+        paths.append([divmod(u, n) for u in p])
+    return MAPFResult(agents, paths, method, success, ctx.expansions, time.thread_time() - t0, replans, failed)
+
+
+# --- Lập kế hoạch theo thứ tự ưu tiên (đầy đủ) ---
+def plan_prioritized(grid, agents, heuristic=TRUE_DISTANCE, restarts=5, horizon=None, _ctx=None):
+    """Mỗi robot lập kế hoạch đầy đủ theo thứ tự; robot xa đích nhất đi trước."""
+    t0 = time.thread_time()
+    ctx = _ctx or _Context(grid, heuristic)
+    cells = _to_cells(ctx, agents)
+    horizon = horizon or _horizon(ctx, cells)
+    order = sorted(range(len(cells)), key=lambda i: -ctx.h_table(cells[i][1])[cells[i][0]])
+    failed = []
+    for attempt in range(restarts + 1):
+        table = ReservationTable(ctx.n)
+        paths = [None] * len(cells)
+        failed = []
+        for i in order:
+            start, goal = cells[i]
+            path = ctx.search(start, goal, table, 0, horizon)
+            if path is None:
+                failed.append(i)
+                continue
+            table.reserve(path, 0, park=True)
+            paths[i] = path
+        if not failed:
+            return _finish(ctx, agents, paths, 'Prioritized', True, t0, attempt)
+        # Robot thất bại được ưu tiên cao hơn ở lần sau
+        order = failed + [i for i in order if i not in failed]
+    # Vẫn trả về kế hoạch dở dang: robot thất bại đứng yên ở chỗ xuất phát
+    paths = [p if p is not None else [cells[i][0]] for i, p in enumerate(paths)]
+    return _finish(ctx, agents, paths, 'Prioritized', False, t0, restarts, failed)
+
+
+# --- WHCA* ---
+def plan_whca(grid, agents, window=8, step=None, heuristic=TRUE_DISTANCE, max_steps=None, _ctx=None):
+    """Lập kế hoạch theo cửa sổ: mỗi vòng lập `window` bước cho mọi robot, đi `step` bước."""
+    t0 = time.thread_time()
+    ctx = _ctx or _Context(grid, heuristic)
+    cells = _to_cells(ctx, agents)
+    step = step or max(1, window // 2)
+    max_steps = max_steps or _horizon(ctx, cells)
+    k = len(cells)
+    positions = [s for s, _ in cells]
+    paths = [[s] for s in positions]
+    order = list(range(k))
+    t = 0
+    replans = 0
+    while t < max_steps and any(positions[i] != cells[i][1] for i in range(k)):
+        table = ReservationTable(ctx.n)
+        plans = [None] * k
+        # Robot chưa tới đích được ưu tiên; thứ tự xoay vòng để tránh một robot luôn nhường
+        ranked = sorted(order, key=lambda i: positions[i] == cells[i][1])
+        for i in ranked:
+            path = ctx.search(positions[i], cells[i][1], table, t, max_steps, window=window)
+            if path is None:
+                return _finish(ctx, agents, paths, 'WHCA*', False, t0, replans, [i])
+            path = path + [path[-1]] * (window + 1 - len(path))
+            table.reserve(path, t)
+            plans[i] = path
+        for i in range(k):
+            paths[i].extend(plans[i][1:step + 1])
+            positions[i] = plans[i][step]
+        t += step
+        replans += 1
+        order = order[1:] + order[:1]
+    success = all(positions[i] == cells[i][1] for i in range(k))
+    failed = [i for i in range(k) if positions[i] != cells[i][1]]
+    # Cắt phần đứng yên thừa ở cuối
+    makespan = max((_arrival(p) for p in paths), default=0)
+    paths = [p[:makespan + 1] for p in paths]
+    return _finish(ctx, agents, paths, 'WHCA*', success, t0, replans, failed)
+
+
+def _arrival(path):
+    t = len(path) - 1
+    while t > 0 and path[t - 1] == path[-1]:
+        t -= 1
+    return t
+
+
+def plan(grid, agents, method='WHCA*', window=8, heuristic=TRUE_DISTANCE):
+    """WHCA* (nhanh, có thể bế tắc); nếu thất bại hoặc có va chạm thì chuyển sang Prioritized."""
+    if method not in METHODS:
+        raise ValueError(f'unknown method {method!r}, expected one of {METHODS}')
+    ctx = _Context(grid, heuristic)
+    if method == 'WHCA*':
+        result = plan_whca(grid, agents, window, heuristic=heuristic, _ctx=ctx)
+        if result.success and not find_conflicts(result.paths):
+            return result
+    return plan_prioritized(grid, agents, heuristic, _ctx=ctx)
+
+
+# --- Kiểm tra và dữ liệu thử ---
+def find_conflicts(paths):
+    """Danh sách (t, i, j, 'vertex' | 'swap') - rỗng nếu kế hoạch không có va chạm."""
+    conflicts = []
+    makespan = max((len(p) for p in paths), default=0)
+
+    def at(path, t):
+        return path[t] if t < len(path) else path[-1]
+
+    for t in range(makespan):
+        seen = {}
+        for i, path in enumerate(paths):
+            cell = at(path, t)
+            if cell in seen:
+                conflicts.append((t, seen[cell], i, 'vertex'))
+            seen[cell] = i
+        if t + 1 < makespan:
+            moves = {}
+            for i, path in enumerate(paths):
+                u, v = at(path, t), at(path, t + 1)
+                if u != v:
+                    j = moves.get((v, u))
+                    if j is not None:
+                        conflicts.append((t, j, i, 'swap'))
+                    moves[(u, v)] = i
+    return conflicts
+
+
+def random_agents(grid, count, rng=random):
+    """count cặp (start, goal) trên các ô trống, điểm đầu khác nhau, đích khác nhau, cùng vùng liên thông."""
+    free = _largest_region(grid)
+    if len(free) < count:
+        raise ValueError(f'only {len(free)} connected open cells for {count} agents')
+    starts = rng.sample(free, count)
+    goals = rng.sample(free, count)
+    return list(zip(starts, goals))
+
+
+def _largest_region(grid):
+    """Các ô trống của vùng liên thông 4 hướng lớn nhất (để mọi robot đều có đường)."""
+    n = len(grid)
+    seen = set()
+    best = []
+    for r in range(n):
+        for c in range(n):
+            if grid[r][c] != 0 or (r, c) in seen:
+                continue
+            seen.add((r, c))
+            region = [(r, c)]
+            queue = deque(region)
+            while queue:
+                u = queue.popleft()
+                for v in logic.get_neighbors(u, n):
+                    if v not in seen and grid[v[0]][v[1]] == 0:
+                        seen.add(v)
+                        region.append(v)
+                        queue.append(v)
+            if len(region) > len(best):
+                best = region
+    return best
+
+
+# --- Benchmark: tăng dần số robot ---
+def benchmark(size=41, counts=(5, 10, 20, 40), seed=2025, generator='Recursive Backtracking',
+              loops=None, methods=METHODS, window=8, log=print):
+    random.seed(seed)
+    grid = logic.generate_maze(size, generator)
+    logic.add_loops(grid, size, loops if loops is not None else size * size // 20)
+    rows = []
+    for count in counts:
+        agents = random_agents(grid, count, random.Random(seed + count))
+        for method in methods:
+            start = time.perf_counter()
+            if method == 'WHCA*':
+                result = plan_whca(grid, agents, window)
+            else:
+                result = plan_prioritized(grid, agents)
+            row = result.as_dict()
+            row['wall_ms'] = (time.perf_counter() - start) * 1000
+            row['conflicts'] = len(find_conflicts(result.paths))
+            rows.append(row)
+            if log:
+                log(f"{count:4d} agents  {method:<12} {'ok  ' if row['success'] else 'FAIL'} "
+                    f"makespan {row['makespan']:4d}  SoC {row['sum_of_costs']:6d}  "
+                    f"expansions {row['expansions']:8d}  {row['wall_ms']:9.1f} ms  conflicts {row['conflicts']}")
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='WOM MAZE multi-agent benchmark')
+    parser.add_argument('--size', type=int, default=41)
+    parser.add_argument('--agents', type=int, nargs='+', default=[5, 10, 20, 40])
+    parser.add_argument('--generator', default='Recursive Backtracking', choices=list(logic.MAZE_GENERATORS))
+    parser.add_argument('--loops', type=int, help='extra openings (default: size*size/20)')
+    parser.add_argument('--methods', nargs='+', choices=METHODS, default=list(METHODS))
+    parser.add_argument('--window', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=2025)
+    parser.add_argument('--output', help='write the rows to this JSON file')
+    args = parser.parse_args(argv)
+    rows = benchmark(args.size, args.agents, args.seed, args.generator, args.loops, args.methods, args.window)
+    if args.output:
+        import json
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, indent=2)
+    return 0 if all(row['success'] and not row['conflicts'] for row in rows) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,237 @@
+import customtkinter as ctk
+import tkinter as tk
+import colorsys
+import random
+import WOM_MAZE_LOGIC as logic
+import WOM_MAZE_MAPF as mapf
+from WOM_MAZE_RENDER import GridRenderer, FrameScheduler, speed_to_rate
+from WOM_MAZE_WORKER import MazePool, run_in_background
+
+ctk.set_appearance_mode('light')
+ctk.set_default_color_theme('green')
+
+BASE_COLORS = {0: 'white', 1: 'black'}  # giá trị ô -> màu nền
+RESIZE_DELAY_MS = 250  # thanh trượt kích thước đứng yên chừng này thì mới tạo mê cung
+METRICS = ['Phương pháp', 'Thành công', 'Makespan', 'Sum of costs', 'Expansions', 'CPU (ms)', 'Thời điểm']
+
+
+def agent_colors(count):
+    """count màu dễ phân biệt (chia đều vòng màu) và màu nhạt tương ứng cho vệt đi."""
+    colors = []
+    for i in range(count):
+        r, g, b = colorsys.hsv_to_rgb(i / max(1, count), 0.85, 0.9)
+        tr, tg, tb = (0.65 + 0.35 * v for v in (r, g, b))
+        colors.append(('#%02x%02x%02x' % (int(r * 255), int(g * 255), int(b * 255)),
+                       '#%02x%02x%02x' % (int(tr * 255), int(tg * 255), int(tb * 255))))
+    return colors
+
+
+class MazeMAPFApp(ctk.CTk):
+    def __init__(self):
+        super().__init__()
+        self.title('Nhiều robot trong mê cung')
+        self.state('zoomed')
+        self.grid_size = 31
+        self.agent_count = 10
+        self.window = 8
+        self.speed = 5
+        self.grid_data = None
+        self.agents = []
+        self.result = None
+        self.colors = []
+        self.time_step = 0
+        self.scheduler = None
+        self.plan_token = 0
+        # Mê cung cho kích thước đang chọn được sinh trước ở luồng nền
+        self.maze_pool = MazePool(logic.generate_maze)
+        self.resize_job = None
+
+        # --- Panel điều khiển ---
+        control = ctk.CTkFrame(self, width=320, fg_color='#00a000')
+        control.pack(side=tk.LEFT, fill=tk.Y, padx=0, pady=0)
+        ctk.CTkLabel(control, text='Nhiều robot', font=('Arial', 20, 'bold'), text_color='white').pack(pady=(20,10))
+        self.size_slider, self.size_label = self.add_slider(control, 'Kích thước lưới', 11, 81, 35, self.grid_size, self.update_size)
+        self.agent_slider, self.agent_label = self.add_slider(control, 'Số robot', 1, 60, 59, self.agent_count, self.update_agents)
+        self.window_slider, self.window_label = self.add_slider(control, 'Cửa sổ WHCA*', 2, 32, 30, self.window, self.update_window)
+        ctk.CTkLabel(control, text='Phương pháp', text_color='white').pack(pady=(10,2))
+        self.combo_method = ctk.CTkComboBox(control, values=list(mapf.METHODS), width=260)
+        self.combo_method.set('WHCA*')
+        self.combo_method.pack(pady=(0,10))
+        self.speed_slider, self.speed_label = self.add_slider(control, 'Tốc độ', 1, 10, 9, self.speed, self.update_speed)
+        self.btn_maze = ctk.CTkButton(control, text='Tạo mê cung', command=self.generate_maze, fg_color='white', text_color='black', hover_color='red', width=260)
+        self.btn_maze.pack(pady=(20,5))
+        self.btn_agents = ctk.CTkButton(control, text='Đổi vị trí robot', command=self.place_agents, fg_color='white', text_color='black', hover_color='red', width=260)
+        self.btn_agents.pack(pady=5)
+        self.btn_plan = ctk.CTkButton(control, text='Lập kế hoạch', command=self.start_planning, fg_color='white', text_color='black', hover_color='red', width=260)
+        self.btn_plan.pack(pady=5)
+        self.btn_stop = ctk.CTkButton(control, text='Dừng', command=self.stop_animation, fg_color='white', text_color='black', hover_color='red', width=260)
+        self.btn_stop.pack(pady=(5,20))
+
+        # --- Canvas và bảng số liệu ---
+        main_frame = ctk.CTkFrame(self, fg_color='white')
+        main_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        metrics_frame = ctk.CTkFrame(main_frame, fg_color='#004d00', corner_radius=10)
+        metrics_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=10)
+        self.metric_labels = {}
+        for col, metric in enumerate(METRICS):
+            ctk.CTkLabel(metrics_frame, text=metric, text_color='white', font=('Arial', 12, 'bold')).grid(row=0, column=col, padx=12)
+            lbl = ctk.CTkLabel(metrics_frame, text='-', text_color='white')
+            lbl.grid(row=1, column=col, padx=12)
+            self.metric_labels[metric] = lbl
+        self.canvas = tk.Canvas(main_frame, bg='white')
+        self.canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.renderer = GridRenderer(self.canvas)
+        # Con lăn chuột: zoom quanh con trỏ; kéo chuột giữa: di chuyển khung nhìn
+        self.renderer.bind_viewport(self.draw_agents)
+        self.canvas.bind('<Configure>', lambda e: self.draw_grid())
+        self.generate_maze()
+
+    def add_slider(self, parent, text, lo, hi, steps, value, command):
+        ctk.CTkLabel(parent, text=text, text_color='white').pack(pady=(10,2))
+        slider = ctk.CTkSlider(parent, from_=lo, to=hi, number_of_steps=steps, command=command)
+        slider.set(value)
+        slider.pack(pady=(0,5))
+        label = ctk.CTkLabel(parent, text=str(value), text_color='white')
+        label.pack()
+        return slider, label
+
+    def update_size(self, val):
+        self.grid_size = int(val)
+        self.size_label.configure(text=str(self.grid_size))
+        # Kéo thanh trượt: chỉ sinh trước ở luồng nền, tạo mê cung khi thanh trượt dừng
+        self.maze_pool.select(self.grid_size, 'Recursive Backtracking')
+        if self.resize_job is not None:
+            self.after_cancel(self.resize_job)
+        self.resize_job = self.after(RESIZE_DELAY_MS, self.generate_maze)
+
+    def update_agents(self, val):
+        self.agent_count = int(val)
+        self.agent_label.configure(text=str(self.agent_count))
+        self.place_agents()
+
+    def update_window(self, val):
+        self.window = int(val)
+        self.window_label.configure(text=str(self.window))
+
+    def update_speed(self, val):
+        self.speed = int(val)
+        self.speed_label.configure(text=str(self.speed))
+        if self.scheduler is not None:
+            self.scheduler.set_rate(speed_to_rate(self.speed))
+
+    # --- Mê cung và robot ---
+    def generate_maze(self):
+        self.stop_animation()
+        n = self.grid_size
+        self.grid_data = self.maze_pool.get(n, 'Recursive Backtracking')
+        # Mê cung hoàn hảo chỉ có hành lang rộng 1 ô: mở thêm lối để các robot nhường nhau được
+        logic.add_loops(self.grid_data, n, n * n // 20)
+        self.place_agents()
+
+    def place_agents(self):
+        self.stop_animation()
+        try:
+            self.agents = mapf.random_agents(self.grid_data, self.agent_count, random)
+        except ValueError:
+            self.agents = []
+        self.colors = agent_colors(len(self.agents))
+        self.result = None
+        self.time_step = 0
+        for lbl in self.metric_labels.values():
+            lbl.configure(text='-')
+        self.draw_grid()
+
+    # --- Vẽ ---
+    def draw_grid(self):
+        if self.canvas.winfo_width() < 10 or self.canvas.winfo_height() < 10:
+            return  # canvas chưa hiển thị; sự kiện <Configure> sẽ vẽ lại
+        self.renderer.layout_values(self.grid_data, BASE_COLORS)
+        if self.result is not None:
+            for i, path in enumerate(self.result.paths):
+                self.renderer.set_cells(path[:self.time_step + 1], self.colors[i][1])
+        self.draw_agents()
+
+    def positions(self):
+        if self.result is None:
+            return [start for start, _ in self.agents]
+        return [path[min(self.time_step, len(path) - 1)] for path in self.result.paths]
+
+    def draw_agents(self):
+        """Đích là ô vuông viền màu, robot là hình tròn cùng màu."""
+        self.canvas.delete('agent')
+        self.canvas.delete('goal')
+        cell = self.renderer.cell_size
+        if not cell:
+            return
+        for i, (_, goal) in enumerate(self.agents):
+            x, y = self.renderer.cell_origin(goal)
+            self.canvas.create_rectangle(x + cell*0.15, y + cell*0.15, x + cell*0.85, y + cell*0.85,
+                                         outline=self.colors[i][0], width=2, tags='goal')
+        self.agent_items = []
+        for i, pos in enumerate(self.positions()):
+            x, y = self.renderer.cell_origin(pos)
+            item = self.canvas.create_oval(x + cell*0.2, y + cell*0.2, x + cell*0.8, y + cell*0.8,
+                                           fill=self.colors[i][0], outline='black', tags='agent')
+            self.agent_items.append(item)
+
+    # --- Lập kế hoạch (luồng nền) và hoạt hình ---
+    def start_planning(self):
+        self.stop_animation()
+        if not self.agents:
+            return
+        self.plan_token += 1
+        token = self.plan_token
+        self.result = None
+        self.time_step = 0
+        self.draw_grid()
+        self.metric_labels['Phương pháp'].configure(text='...')
+
+        def finished(result, error):
+            if token != self.plan_token:
+                return  # mê cung / robot đã đổi trong lúc lập kế hoạch
+            if error is not None:
+                self.metric_labels['Phương pháp'].configure(text='error')
+                return
+            self.on_planned(result)
+
+        run_in_background(self, mapf.plan, finished, self.grid_data, self.agents,
+                          self.combo_method.get(), self.window)
+
+    def on_planned(self, result):
+        self.result = result
+        self.metric_labels['Phương pháp'].configure(text=result.method)
+        self.metric_labels['Thành công'].configure(text='có' if result.success else 'không')
+        self.metric_labels['Makespan'].configure(text=str(result.makespan))
+        self.metric_labels['Sum of costs'].configure(text=str(result.sum_of_costs))
+        self.metric_labels['Expansions'].configure(text=str(result.expansions))
+        self.metric_labels['CPU (ms)'].configure(text=f'{result.cpu_time * 1000:.1f}')
+        events = (('step', t) for t in range(1, result.makespan + 1))
+        self.scheduler = FrameScheduler(self, events, self.apply_step, on_frame=self.update_time_label,
+                                        on_done=self.on_done, rate=speed_to_rate(self.speed)).start()
+
+    def apply_step(self, typ, t):
+        """Một thời điểm: mọi robot cùng bước, để lại vệt màu nhạt."""
+        self.time_step = t
+        cell = self.renderer.cell_size
+        for i, path in enumerate(self.result.paths):
+            pos = path[min(t, len(path) - 1)]
+            self.renderer.set_cell(pos, self.colors[i][1])
+            x, y = self.renderer.cell_origin(pos)
+            self.canvas.coords(self.agent_items[i], x + cell*0.2, y + cell*0.2, x + cell*0.8, y + cell*0.8)
+
+    def update_time_label(self):
+        self.metric_labels['Thời điểm'].configure(text=f'{self.time_step} / {self.result.makespan}')
+
+    def on_done(self):
+        self.scheduler = None
+        self.update_time_label()
+
+    def stop_animation(self):
+        self.plan_token += 1
+        if self.scheduler is not None:
+            self.scheduler.stop()
+            self.scheduler = None
+
+if __name__ == '__main__':
+    app = MazeMAPFApp()
+    app.mainloop()
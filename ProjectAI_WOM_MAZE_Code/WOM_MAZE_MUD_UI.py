@@ -1,15 +1,23 @@
 import customtkinter as ctk
 import tkinter as tk
 import WOM_MAZE_LOGIC as logic
+from WOM_MAZE_RENDER import GridRenderer, FrameScheduler, speed_to_rate
+from WOM_MAZE_WORKER import SearchWorker, MazePool
+from WOM_MAZE_BITBOARD import Bitboard
+from WOM_MAZE_COMPONENTS import ComponentIndex
 import time
 import heapq
 import random
-import threading
 
 # Configure CustomTkinter theme
 ctk.set_appearance_mode('light')
 ctk.set_default_color_theme('green')
 
+# The maze mutates while the search runs, so the worker may only run a few events
+# ahead of the animation: a deep queue would let A* finish before the first mutation.
+WORKER_QUEUE = dict(batch_size=4, max_batches=1)
+BASE_COLORS = {0: 'white', 1: '#4A2F1B'}  # path, wall
+
 class MudMazeApp(ctk.CTk):
     """Cửa sổ giải bài toán Mud Maze."""
     def __init__(self):
@@ -20,13 +28,20 @@ class MudMazeApp(ctk.CTk):
         self.max_grid_size = 100  # Maximum grid size
         self.grid_data = None
         self.terrain_data = None  # Store terrain information
+        self.board = None  # Bitboard of open cells, kept in sync with grid_data
+        self.components = None  # ComponentIndex of grid_data, lets the solver reject unreachable goals
+        self.snap = None  # NearestOpenIndex of grid_data, for endpoint snapping
         self.start = None
         self.end = None
         self.cell_size = None
         self.pad_x = None
         self.pad_y = None
         self.speed = 5  # Default animation speed
-        self.delay = 200  # Animation delay in ms
+        self.rate = speed_to_rate(self.speed)  # Animation events per second (None = unlimited)
+        self.scheduler = None
+        self.worker = None
+        # Mazes for the selected size / algorithm are generated ahead in a background thread
+        self.maze_pool = MazePool(logic.generate_maze)
 
         # Main container
         main_container = ctk.CTkFrame(self)
@@ -72,6 +87,7 @@ class MudMazeApp(ctk.CTk):
                                        width=200)
         self.maze_type.set('Recursive Backtracking')
         self.maze_type.pack(pady=(0, 10))
+        self.maze_type.configure(command=lambda choice: self.prefetch_maze())
 
         # Generate button
         self.generate_btn = ctk.CTkButton(control, text='Generate Maze',
@@ -96,6 +112,12 @@ class MudMazeApp(ctk.CTk):
                                          width=200)
         self.find_path_btn.pack(pady=5)
 
+        # Pause / resume button (the search runs in a background thread)
+        self.pause_btn = ctk.CTkButton(control, text='Pause',
+                                       command=self.on_pause,
+                                       width=200)
+        self.pause_btn.pack(pady=5)
+
         # Reset Maze button
         self.reset_btn = ctk.CTkButton(control, text='Reset Maze',
                                        command=self.reset_maze,
@@ -127,12 +149,22 @@ class MudMazeApp(ctk.CTk):
                                      text_color='white')
         self.time_label.pack()
 
+        # Search statistics (cộng dồn qua các lần replan)
+        ctk.CTkLabel(metrics_frame, text='Search Stats:',
+                    text_color='white').pack(pady=(5, 2))
+        self.stats_label = ctk.CTkLabel(metrics_frame, text=logic.SearchStats().summary(),
+                                      text_color='white', justify='left')
+        self.stats_label.pack()
+
         # Canvas area (no right control panel)
         canvas_frame = ctk.CTkFrame(content, fg_color='white')
         canvas_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
         self.canvas = tk.Canvas(canvas_frame, bg='white')
         self.canvas.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.renderer = GridRenderer(self.canvas, outline='#E0E0E0')
+        # Mouse wheel zooms around the pointer, middle-drag pans
+        self.renderer.bind_viewport(self.on_view_change)
 
         # Bind events
         self.canvas.bind('<Configure>', lambda e: self.draw_grid(self.grid_size))
@@ -145,11 +177,8 @@ class MudMazeApp(ctk.CTk):
     # ====== Tiện ích vẽ và thao tác lưới ======
     def clear_path_effects(self):
         """Xóa hiệu ứng màu của đường đi cũ và visited cũ, chỉ giữ lại tường và icon start/end."""
-        for (r, c), rect in self.cells.items():
-            if self.grid_data and self.grid_data[r][c] == 1:
-                self.canvas.itemconfig(rect, fill='#4A2F1B')
-            else:
-                self.canvas.itemconfig(rect, fill='white')
+        if self.renderer.n:
+            self.draw_base(self.renderer.n)
         self.draw_start_end_icons()
         self.visited_count = 0
         self.path_length = 0
@@ -158,100 +187,105 @@ class MudMazeApp(ctk.CTk):
         self.time_label.configure(text='0.00')
 
     def randomly_update_maze(self):
-        """Randomly open/close some walls in the maze, except start/end, and always keep a path from start to end."""
+        """Randomly open/close some walls in the maze, except start/end, and always keep a path from start to end.
+
+        Returns the cells whose wall/path state actually changed (empty if the change was undone).
+        """
         if not self.grid_data:
-            return
+            return []
         n = self.grid_size
-        old_grid = [row[:] for row in self.grid_data]
         num_changes = max(1, n // 5)
+        toggled = []
+        before = {}
         for _ in range(num_changes):
             r = random.randint(0, n-1)
             c = random.randint(0, n-1)
             if (r, c) == self.start or (r, c) == self.end:
                 continue
+            before.setdefault((r, c), self.grid_data[r][c])
+            # The search worker reads this same grid from its thread on purpose (see
+            # _start_worker): the maze is meant to change under the running A*. Each
+            # write is a single list item store, and a stale read only makes A* expand
+            # or skip one cell; a path cell that turned into a wall triggers a replan.
             self.grid_data[r][c] = 0 if self.grid_data[r][c] == 1 else 1
+            toggled.append((r, c))
+        self.board.update(toggled)
         if not self._has_path():
-            self.grid_data = old_grid
-        self.draw_grid(n)
+            # Undo in reverse order (a cell may have been toggled twice)
+            for r, c in reversed(toggled):
+                self.grid_data[r][c] = 0 if self.grid_data[r][c] == 1 else 1
+            self.board.update(toggled)
+        # A cell toggled twice is back where it started
+        changed = [(r, c) for (r, c), value in before.items() if self.grid_data[r][c] != value]
+        self.components.update(changed)
+        self.snap.update(changed)
+        return changed
+
+    def apply_maze_changes(self, cells):
+        """Recolour only the mutated cells; the visited/path colouring elsewhere is kept."""
+        if self.renderer.n != self.grid_size:
+            self.draw_grid(self.grid_size)
+            return
+        for cell in cells:
+            self.renderer.set_cell(cell, self.base_color(*cell))
 
     def _has_path(self):
-        """Kiểm tra còn đường đi từ start đến end không (BFS)."""
-        from collections import deque
-        n = self.grid_size
-        visited = set()
-        queue = deque([self.start])
-        while queue:
-            r, c = queue.popleft()
-            if (r, c) == self.end:
-                return True
-            for dr, dc in [(-1,0),(1,0),(0,-1),(0,1)]:
-                nr, nc = r + dr, c + dc
-                if 0 <= nr < n and 0 <= nc < n and (nr, nc) not in visited:
-                    if self.grid_data[nr][nc] == 0:
-                        visited.add((nr, nc))
-                        queue.append((nr, nc))
-        return False
+        """Kiểm tra còn đường đi từ start đến end không (loang trên bitboard)."""
+        return self.board.reachable(self.start, self.end)
+
+    def base_color(self, r, c):
+        """Màu nền của ô: tường hoặc lối đi."""
+        if self.grid_data is not None and self.grid_data[r][c] == 1:
+            return '#4A2F1B'  # Wall
+        return 'white'        # Path
+
+    def draw_base(self, n):
+        """Paint walls and paths; a maze of size n is painted by value in PIL."""
+        if self.grid_data is not None and len(self.grid_data) == n:
+            self.renderer.layout_values(self.grid_data, BASE_COLORS)
+        else:
+            self.renderer.layout(n, self.base_color)
 
     def draw_grid(self, n):
         w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
         if w < 10 or h < 10:
             self.after(50, lambda: self.draw_grid(n))
             return
-        self.canvas.delete('all')
-        cell = min(w / n, h / n)
-        total = cell * n
-        pad_x = (w - total) / 2
-        pad_y = (h - total) / 2
-        self.cell_size = cell
-        self.pad_x = pad_x
-        self.pad_y = pad_y
-        self.cells = {}
-        for row in range(n):
-            for col in range(n):
-                x1 = pad_x + col * cell
-                y1 = pad_y + row * cell
-                x2 = x1 + cell
-                y2 = y1 + cell
-                if self.grid_data is None:
-                    fill_color = 'white'
-                elif self.grid_data[row][col] == 1:
-                    fill_color = '#4A2F1B'  # Wall
-                else:
-                    fill_color = 'white'    # Path
-                rect = self.canvas.create_rectangle(x1, y1, x2, y2, fill=fill_color, outline='#E0E0E0', width=1)
-                self.cells[(row, col)] = rect
-        if self.start not in self.cells:
+        self.draw_base(n)
+        self.cell_size = self.renderer.cell_size
+        self.pad_x = self.renderer.pad_x
+        self.pad_y = self.renderer.pad_y
+        if not self.renderer.in_grid(self.start):
             self.start = (0, 0)
-        if self.end not in self.cells:
+        if not self.renderer.in_grid(self.end):
             self.end = (n-1, n-1)
         self.draw_start_end_icons()
-        self.canvas.update_idletasks()
-        self.canvas.update()
+
+    def on_view_change(self):
+        """Zoom / pan changed the cell size and position: redraw the icons on top."""
+        self.cell_size = self.renderer.cell_size
+        self.draw_start_end_icons()
 
     def draw_start_end_icons(self):
         """Draw start and end icons on the grid."""
-        if not hasattr(self, 'cells'):
+        if not self.renderer.n:
             return
-        for item in self.canvas.find_all():
-            if item not in self.cells.values():
-                self.canvas.delete(item)
+        self.canvas.delete('icon')
         # Start icon
-        if self.start in self.cells:
-            x = self.pad_x + self.start[1] * self.cell_size
-            y = self.pad_y + self.start[0] * self.cell_size
+        if self.renderer.visible(self.start):
+            x, y = self.renderer.cell_origin(self.start)
             self.canvas.create_line(x + self.cell_size*0.2, y + self.cell_size*0.2,
                                   x + self.cell_size*0.2, y + self.cell_size*0.8,
-                                  fill='#8B4513', width=2)
+                                  fill='#8B4513', width=2, tags='icon')
             points = [
                 x + self.cell_size*0.2, y + self.cell_size*0.2,
                 x + self.cell_size*0.7, y + self.cell_size*0.4,
                 x + self.cell_size*0.2, y + self.cell_size*0.6
             ]
-            self.canvas.create_polygon(points, fill='#8B4513', outline='#8B4513')
+            self.canvas.create_polygon(points, fill='#8B4513', outline='#8B4513', tags='icon')
         # End icon
-        if self.end in self.cells:
-            x = self.pad_x + self.end[1] * self.cell_size
-            y = self.pad_y + self.end[0] * self.cell_size
+        if self.renderer.visible(self.end):
+            x, y = self.renderer.cell_origin(self.end)
             center_x = x + self.cell_size/2
             center_y = y + self.cell_size/2
             max_radius = int(self.cell_size * 0.4)
@@ -259,21 +293,17 @@ class MudMazeApp(ctk.CTk):
             for r in range(max_radius, 0, -step):
                 self.canvas.create_oval(center_x-r, center_y-r,
                                      center_x+r, center_y+r,
-                                     outline='#8B4513', width=2)
+                                     outline='#8B4513', width=2, tags='icon')
             dot_radius = max(1, int(self.cell_size * 0.1))
             self.canvas.create_oval(center_x-dot_radius,
                                   center_y-dot_radius,
                                   center_x+dot_radius,
                                   center_y+dot_radius,
-                                  fill='#8B4513', outline='#8B4513')
+                                  fill='#8B4513', outline='#8B4513', tags='icon')
 
     def pixel_to_cell(self, x, y):
         """Convert canvas coordinates to grid cell indices."""
-        if self.cell_size is None:
-            return None, None
-        col = int((x - self.pad_x) / self.cell_size)
-        row = int((y - self.pad_y) / self.cell_size)
-        return row, col
+        return self.renderer.pixel_to_cell(x, y)
 
     # ====== Xử lý sự kiện và logic chính ======
     def on_canvas_left_click(self, event):
@@ -281,8 +311,8 @@ class MudMazeApp(ctk.CTk):
         r, c = self.pixel_to_cell(event.x, event.y)
         if r is None or not (0 <= r < self.grid_size and 0 <= c < self.grid_size):
             return
-        if self.grid_data is not None and self.grid_data[r][c] == 1:
-            return  # Do not allow setting start on a wall
+        if self.grid_data is not None:
+            r, c = self.find_nearest_empty((r, c))  # A click on a wall snaps to the nearest open cell
         if self.end == (r, c):
             return
         # Xóa hiệu ứng cũ
@@ -300,8 +330,8 @@ class MudMazeApp(ctk.CTk):
         r, c = self.pixel_to_cell(event.x, event.y)
         if r is None or not (0 <= r < self.grid_size and 0 <= c < self.grid_size):
             return
-        if self.grid_data is not None and self.grid_data[r][c] == 1:
-            return  # Do not allow setting end on a wall
+        if self.grid_data is not None:
+            r, c = self.find_nearest_empty((r, c))  # A click on a wall snaps to the nearest open cell
         if self.start == (r, c):
             return
         # Xóa hiệu ứng cũ
@@ -323,27 +353,38 @@ class MudMazeApp(ctk.CTk):
         self.grid_size = new_size
         self.size_label.configure(text=str(new_size))
         self.draw_grid(new_size)
+        self.prefetch_maze()
+
+    def prefetch_maze(self):
+        """Start generating mazes for the current selection before Generate is pressed."""
+        self.maze_pool.select(min(self.grid_size, self.max_grid_size), self.maze_type.get(), 'Mud Maze')
 
     def update_speed(self, value):
         """Update animation speed from slider."""
         self.speed = int(value)
         self.speed_label.configure(text=str(self.speed))
-        self.delay = int(200 / self.speed)  # Lower delay = faster speed
+        self.rate = speed_to_rate(self.speed)  # 10 = as fast as rendering allows
+        if self.scheduler is not None:
+            self.scheduler.set_rate(self.rate)
 
     def generate_maze(self):
         """Generate a new maze (walls and paths only, no special terrain)."""
+        self.stop_search()
         n = self.grid_size
         if n > self.max_grid_size:
             n = self.max_grid_size
             self.grid_size = n
             self.size_slider.set(n)
             self.size_label.configure(text=str(n))
-        self.grid_data = logic.generate_maze(n, self.maze_type.get(), 'Mud Maze')
+        self.grid_data = self.maze_pool.get(n, self.maze_type.get(), 'Mud Maze')
         self.terrain_data = None  # No special terrain
         # Add loops for alternative paths
         if self.start is not None and self.end is not None:
             loops = min(3, n // 20)
             self.grid_data = logic.add_targeted_loops(self.grid_data, self.start, self.end, loops=loops)
+        self.board = Bitboard(self.grid_data)
+        self.components = ComponentIndex(self.grid_data)
+        self.snap = logic.NearestOpenIndex(self.grid_data)
         # Ensure start/end are not on a wall
         self.start = self.find_nearest_empty((0, 0))
         self.end = self.find_nearest_empty((n-1, n-1))
@@ -361,7 +402,11 @@ class MudMazeApp(ctk.CTk):
 
     def reset_maze(self):
         """Reset the maze to its initial state."""
+        self.stop_search()
         self.grid_data = None
+        self.board = None
+        self.components = None
+        self.snap = None
         n = self.grid_size
         start = self.find_nearest_empty((0, 0))
         end = self.find_nearest_empty((n-1, n-1))
@@ -391,93 +436,118 @@ class MudMazeApp(ctk.CTk):
         """Start the A* pathfinding animation (always reset effects and generator)."""
         if not self.start or not self.end:
             return
+        self.stop_search()
         # Xóa hiệu ứng cũ trước khi tìm đường mới
         self.clear_path_effects()
         # Reset metrics
         self.visited_count = 0
         self.path_length = 0
         self.start_time = time.time()
-        # Reset grid colors nhưng giữ tường
-        for (r, c), rect in self.cells.items():
-            if self.grid_data and self.grid_data[r][c] == 1:
-                self.canvas.itemconfig(rect, fill='#4A2F1B')
-            else:
-                self.canvas.itemconfig(rect, fill='white')
-        # Redraw start/end icons
-        self.draw_start_end_icons()
         # Reset _avoid để replan đúng
         if hasattr(self, '_avoid'):
             del self._avoid
+        self.stats = logic.SearchStats()
+        self.stats_label.configure(text=self.stats.summary())
+        self._last_maze_update = time.time()
+        self._start_worker(self.start)
+        self.scheduler = FrameScheduler(self, self.worker.events(), self.apply_event,
+                                        on_frame=self.update_metrics, on_done=self.on_search_done,
+                                        rate=self.rate).start()
+
+    def _start_worker(self, start, avoid=None):
+        """Run A* from start to the end in a background worker, counting into self.stats.
+
+        The worker reads self.grid_data itself, not a copy, so it sees the walls that
+        randomly_update_maze toggles on the Tk thread (WORKER_QUEUE keeps it close behind).
+        """
         # Nếu chưa có mê cung, tạo grid toàn đường đi
         if self.grid_data is None:
             grid = [[0] * self.grid_size for _ in range(self.grid_size)]
         else:
             grid = self.grid_data
-        self.step_gen = astar_generator(grid, self.start, self.end)
-        self._last_maze_update = time.time()
-        self.after(self.delay, self.step)
-
-    def step(self):
-        """Step animation with replan if path is blocked, maze changes only during visit phase."""
-        try:
-            typ, cell = next(self.step_gen)
-            is_wall = self.grid_data is not None and self.grid_data[cell[0]][cell[1]] == 1
-            if typ == 'visit':
-                self.visited_count += 1
-                if cell != self.start and cell != self.end:
-                    if not is_wall:
-                        self.canvas.itemconfig(self.cells[cell], fill='#ADD8E6')
-                self.visited_label.configure(text=str(self.visited_count))
-                self.time_label.configure(text=f"{time.time() - self.start_time:.2f}")
-                # Chỉ thay đổi mê cung trong giai đoạn visit
-                now = time.time()
-                if not hasattr(self, '_last_maze_update'):
-                    self._last_maze_update = now
-                if now - self._last_maze_update >= 1.0:
-                    self.randomly_update_maze()
-                    self._last_maze_update = now
-            else:  # 'path'
-                # Khi bắt đầu vẽ đường đi ngắn nhất thì dừng thay đổi mê cung
-                self._last_maze_update = float('inf')
-                if is_wall:
-                    if not hasattr(self, '_avoid'): self._avoid = set()
-                    self._avoid.add(cell)
-                    self.step_gen = astar_generator(self.grid_data if self.grid_data is not None else [[0]*self.grid_size for _ in range(self.grid_size)], cell, self.end, avoid=self._avoid)
-                    return self.after(self.delay, self.step)
-                self.path_length += 1
-                if cell != self.start and cell != self.end:
-                    if not is_wall:
-                        self.canvas.itemconfig(self.cells[cell], fill='blue')
-                self.path_length_label.configure(text=str(self.path_length))
-                self.time_label.configure(text=f"{time.time() - self.start_time:.2f}")
-            self.after(self.delay, self.step)
-        except StopIteration:
+        events = astar_generator(grid, start, self.end, avoid=avoid, stats=self.stats, components=self.components)
+        self.worker = SearchWorker(logic.timed_steps(events, self.stats), **WORKER_QUEUE).start()
+        return self.worker
+
+    def stop_search(self):
+        """Cancel the running search (if any)."""
+        if self.scheduler is not None:
+            self.scheduler.stop()
+            self.scheduler = None
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+        self.pause_btn.configure(text='Pause')
+
+    def on_pause(self):
+        """Pause or resume the running search."""
+        if self.worker is None:
+            return
+        if self.worker.paused:
+            self.worker.resume()
+            self.scheduler.start()
+            self.pause_btn.configure(text='Pause')
+        else:
+            self.worker.pause()
+            self.scheduler.stop()
+            self.pause_btn.configure(text='Resume')
+
+    def apply_event(self, typ, cell):
+        """Apply one search event; replan if the path is blocked, maze changes only during visit phase."""
+        is_wall = self.grid_data is not None and self.grid_data[cell[0]][cell[1]] == 1
+        if typ == 'visit':
+            self.visited_count += 1
+            if cell != self.start and cell != self.end:
+                if not is_wall:
+                    self.renderer.set_cell(cell, '#ADD8E6')
+            # Chỉ thay đổi mê cung trong giai đoạn visit
+            now = time.time()
+            if not hasattr(self, '_last_maze_update'):
+                self._last_maze_update = now
+            if now - self._last_maze_update >= 1.0:
+                self.apply_maze_changes(self.randomly_update_maze())
+                self._last_maze_update = now
+        else:  # 'path'
+            # Khi bắt đầu vẽ đường đi ngắn nhất thì dừng thay đổi mê cung
             self._last_maze_update = float('inf')
-            elapsed = time.time() - self.start_time
-            self.visited_label.configure(text=str(self.visited_count))
-            self.path_length_label.configure(text=str(self.path_length))
-            self.time_label.configure(text=f"{elapsed:.2f}")
+            if is_wall:
+                if not hasattr(self, '_avoid'): self._avoid = set()
+                self._avoid.add(cell)
+                # Huỷ lần tìm cũ, bộ lập lịch rút sự kiện tiếp theo từ worker mới
+                self.worker.cancel()
+                self.scheduler.events = self._start_worker(cell, self._avoid).events()
+                return
+            self.path_length += 1
+            if cell != self.start and cell != self.end:
+                self.renderer.set_cell(cell, 'blue')
+
+    def update_metrics(self):
+        """Refresh the counters once per frame."""
+        self.visited_label.configure(text=str(self.visited_count))
+        self.path_length_label.configure(text=str(self.path_length))
+        self.time_label.configure(text=f"{time.time() - self.start_time:.2f}")
+
+    def on_search_done(self):
+        self._last_maze_update = float('inf')
+        self.update_metrics()
+        if self.worker.error is not None:
+            self.time_label.configure(text=f'Error: {self.worker.error}')
+        self.scheduler = None
+        self.worker = None
+        self.pause_btn.configure(text='Pause')
+        self.stats_label.configure(text=self.stats.summary())
 
     def find_nearest_empty(self, pos):
         """Tìm ô trống (không phải tường) gần nhất từ vị trí pos."""
-        from collections import deque
-        n = self.grid_size
-        visited = set()
-        queue = deque([pos])
-        while queue:
-            r, c = queue.popleft()
-            if self.grid_data is None or self.grid_data[r][c] == 0:
-                return (r, c)
-            for dr, dc in [(-1,0),(1,0),(0,-1),(0,1)]:
-                nr, nc = r+dr, c+dc
-                if 0 <= nr < n and 0 <= nc < n and (nr, nc) not in visited:
-                    visited.add((nr, nc))
-                    queue.append((nr, nc))
-        return pos
-
-def astar_generator(grid, start, goal, heuristic='Manhattan', avoid=None):
+        if self.grid_data is None:
+            return pos
+        return self.snap.nearest(pos)
+
+def astar_generator(grid, start, goal, heuristic='Manhattan', avoid=None, stats=None, components=None):
     import heapq
     from WOM_MAZE_LOGIC import get_neighbors_cost, get_heuristic
+    if components is not None and not components.connected(start, goal, 8):
+        return
     n = len(grid)
     if avoid is None:
         avoid = set()
@@ -486,15 +556,28 @@ def astar_generator(grid, start, goal, heuristic='Manhattan', avoid=None):
     open_set = [(f_score[start], start)]
     came_from = {}
     closed = set()
+    if stats is not None:
+        stats.heuristic_evals += 1
+        stats.pushes += 1
+        stats.peak_open = max(stats.peak_open, 1)
     while open_set:
         _, current = heapq.heappop(open_set)
+        if stats is not None:
+            stats.pops += 1
         if grid[current[0]][current[1]] == 1 or current in avoid:
+            if stats is not None:
+                stats.stale_pops += 1
             continue
         if current == goal:
             break
         if current in closed:
+            if stats is not None:
+                stats.stale_pops += 1
             continue
         closed.add(current)
+        if stats is not None:
+            stats.expansions += 1
+            stats.peak_closed = max(stats.peak_closed, len(closed))
         yield 'visit', current
         for v, cost in get_neighbors_cost(current, n):
             if grid[v[0]][v[1]] == 1 or v in avoid:
@@ -506,6 +589,11 @@ def astar_generator(grid, start, goal, heuristic='Manhattan', avoid=None):
             g_score[v] = tentative_g
             f_score[v] = tentative_g + get_heuristic(v, goal, heuristic)
             heapq.heappush(open_set, (f_score[v], v))
+            if stats is not None:
+                stats.heuristic_evals += 1
+                stats.pushes += 1
+                if len(open_set) > stats.peak_open:
+                    stats.peak_open = len(open_set)
     if goal not in came_from and start != goal:
         return
     path = []
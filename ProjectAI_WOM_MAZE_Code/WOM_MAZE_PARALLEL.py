@@ -0,0 +1,244 @@
+"""Bộ giải danh mục (portfolio): chạy song song nhiều cấu hình thuật toán, lấy kết quả đầu tiên.
+
+Với một truy vấn, ta thường không biết trước BFS, BFS hai chiều, A* Octile hay
+Dijkstra sẽ xong trước trên hình dạng mê cung này. PortfolioSolver giữ một
+tiến trình sống lâu cho mỗi cấu hình; lưới được chép một lần vào bộ nhớ
+dùng chung (WOM_MAZE_SHARED) và các tiến trình đọc trực tiếp từ đó qua
+memoryview theo hàng, không phải pickle lưới cho mỗi truy vấn.
+Kết quả chấp nhận được đầu tiên thắng; các tiến trình còn lại thấy cờ huỷ
+và bỏ truy vấn đó. Mỗi truy vấn có thể được ghi (JSON lines) để thống kê số
+lần thắng của từng cấu hình.
+
+    with PortfolioSolver(log_path='portfolio.jsonl') as portfolio:
+        portfolio.set_grid(grid)
+        result = portfolio.solve(start, goal)
+        print(result['winner'], len(result['path']))
+
+Lưu ý: BFS / BFS hai chiều đi 4 hướng và tối ưu theo số bước, còn Dijkstra /
+A* đi 8 hướng (cắt góc) và tối ưu theo chi phí octile. 'optimal' của kết quả
+luôn hiểu theo mô hình của chính cấu hình thắng ('moves': 4 hoặc 8), không so
+sánh giữa hai mô hình. "Không có đường" của cấu hình 4 hướng chỉ được nhận khi
+cả danh mục cùng đi 4 hướng: đi 8 hướng vẫn có thể lách qua góc tường.
+"""
+import json
+import multiprocessing as mp
+import queue
+import time
+
+import WOM_MAZE_LOGIC as logic
+from WOM_MAZE_SHARED import SharedArray, share_grid
+
+# (thuật toán, heuristic)
+DEFAULT_PORTFOLIO = [('BFS', None), ('Bidirectional BFS', None), ('A*', 'Octile'), ('Dijkstra', None)]
+# Mô hình di chuyển của từng thuật toán (giống logic.solver_generator)
+MOVES = {'BFS': 4, 'Bidirectional BFS': 4, 'DFS': 4, 'Dijkstra': 8, 'A*': 8}
+CANCEL_CHECK = 1024  # số sự kiện giữa hai lần kiểm tra cờ huỷ
+
+
+def config_name(config):
+    algorithm, heuristic = config
+    return f'{algorithm} {heuristic}' if heuristic else algorithm
+
+
+def is_optimal(config):
+    """Cấu hình có đảm bảo đường đi ngắn nhất theo mô hình của nó hay không (4 hướng: số bước, 8 hướng: octile)."""
+    algorithm, heuristic = config
+    if algorithm in ('BFS', 'Bidirectional BFS', 'Dijkstra'):
+        return True
+    return algorithm == 'A*' and heuristic in logic.ADMISSIBLE_HEURISTICS
+
+
+# --- Tiến trình con ---
+def _worker_main(index, config, tasks, results, acks, cancelled):
+    algorithm, heuristic = config
+    shared, rows = None, []
+    while True:
+        msg = tasks.get()
+        if msg is None:
+            break
+        if msg[0] == 'grid':
+            if shared is not None:
+                shared.release()
+            shared = SharedArray.attach(msg[1])
+            rows = shared.rows()
+            acks.put(index)
+            continue
+        _, qid, start, goal = msg
+        stats = logic.SearchStats()
+        path = []
+        aborted = False
+        error = None
+        t0 = time.perf_counter()
+        try:
+            events = logic.solver_generator(algorithm, rows, start, goal, heuristic or 'Manhattan', stats)
+            for i, (typ, cell) in enumerate(events):
+                if typ == 'path':
+                    path.append(cell)
+                elif i % CANCEL_CHECK == 0 and cancelled.value >= qid:
+                    aborted = True
+                    break
+        except Exception as e:
+            error = repr(e)
+        results.put((qid, index, path, stats.expansions, time.perf_counter() - t0, aborted, error))
+    if shared is not None:
+        shared.release()
+
+
+# --- Điều phối ---
+class PortfolioSolver:
+    """Một nhóm tiến trình, mỗi tiến trình chạy một cấu hình trên cùng lưới dùng chung."""
+
+    def __init__(self, configs=DEFAULT_PORTFOLIO, require_optimal=True, log_path=None):
+        self.configs = [tuple(c) for c in configs]
+        self.names = [config_name(c) for c in self.configs]
+        self.require_optimal = require_optimal
+        # "Không có đường" chỉ chắc chắn khi đến từ mô hình đi được nhiều nhất của danh mục
+        self.widest = max(MOVES[algorithm] for algorithm, _ in self.configs)
+        self.log_path = log_path
+        ctx = mp.get_context()
+        self._results = ctx.Queue()
+        self._acks = ctx.Queue()
+        self._cancelled = ctx.Value('q', 0, lock=False)  # id truy vấn lớn nhất đã bị huỷ
+        self._tasks = []
+        self._procs = []
+        for i, config in enumerate(self.configs):
+            tasks = ctx.Queue()
+            proc = ctx.Process(target=_worker_main, args=(i, config, tasks, self._results, self._acks, self._cancelled),
+                               name=f'portfolio-{self.names[i]}', daemon=True)
+            proc.start()
+            self._tasks.append(tasks)
+            self._procs.append(proc)
+        self._grid = None
+        self._n = 0
+        self._qid = 0
+
+    def set_grid(self, grid):
+        """Đưa một lưới mới cho mọi tiến trình (chép một lần vào shared memory)."""
+        old = self._grid
+        self._grid = share_grid(grid)
+        self._n = len(grid)
+        for tasks in self._tasks:
+            tasks.put(('grid', self._grid.handle))
+        # Chờ mọi tiến trình gắn xong khối mới (và đã nhả khối cũ) rồi mới gỡ khối cũ
+        for _ in self._procs:
+            self._acks.get()
+        if old is not None:
+            old.release()
+
+    def solve(self, start, goal, timeout=None):
+        """Trả về kết quả chấp nhận được đầu tiên; các cấu hình khác bị huỷ.
+
+        Kết quả là dict: winner, moves, path, expansions, solve_s (trong tiến
+        trình thắng), wall_s (tính cả điều phối), optimal (theo mô hình moves).
+        None nếu hết thời gian.
+        """
+        if self._grid is None:
+            raise RuntimeError('call set_grid() before solve()')
+        self._qid += 1
+        qid = self._qid
+        t0 = time.perf_counter()
+        for tasks in self._tasks:
+            tasks.put(('solve', qid, tuple(start), tuple(goal)))
+        pending = len(self._procs)
+        winner = fallback = None
+        while pending:
+            remaining = None if timeout is None else timeout - (time.perf_counter() - t0)
+            if remaining is not None and remaining <= 0:
+                break
+            try:
+                rqid, index, path, expansions, solve_s, aborted, error = self._results.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if rqid != qid:
+                continue  # kết quả muộn của truy vấn trước
+            pending -= 1
+            if aborted or error is not None:
+                continue
+            moves = MOVES[self.configs[index][0]]
+            result = {
+                'winner': self.names[index],
+                'moves': moves,
+                'path': path,
+                'expansions': expansions,
+                'solve_s': solve_s,
+                'optimal': is_optimal(self.configs[index]),
+            }
+            if not path and moves < self.widest:
+                # Đi 4 hướng bị chặn chưa chắc đi 8 hướng cũng bị chặn: chờ cấu hình 8 hướng
+                result['optimal'] = False
+                if fallback is None:
+                    fallback = result
+                continue
+            if result['optimal'] or not self.require_optimal:
+                winner = result
+                break
+            if fallback is None:
+                fallback = result
+        self._cancelled.value = qid
+        winner = winner or fallback
+        if winner is not None:
+            winner['wall_s'] = time.perf_counter() - t0
+        if self.log_path:
+            self._log(start, goal, winner)
+        return winner
+
+    def _log(self, start, goal, result):
+        entry = {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'n': self._n,
+            'start': list(start),
+            'goal': list(goal),
+            'configs': self.names,
+            'winner': result['winner'] if result else None,
+            'wall_s': result['wall_s'] if result else None,
+            'path_length': len(result['path']) if result else None,
+        }
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+
+    def close(self):
+        for tasks in self._tasks:
+            tasks.put(None)
+        for proc in self._procs:
+            proc.join(timeout=1)
+            if proc.is_alive():
+                proc.terminate()
+        self._procs = []
+        if self._grid is not None:
+            self._grid.release()
+            self._grid = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def solve_portfolio(grid, start, goal, configs=DEFAULT_PORTFOLIO, require_optimal=True,
+                    timeout=None, log_path=None):
+    """Giải một truy vấn duy nhất (tạo rồi đóng nhóm tiến trình)."""
+    with PortfolioSolver(configs, require_optimal, log_path) as portfolio:
+        portfolio.set_grid(grid)
+        return portfolio.solve(start, goal, timeout)
+
+
+def win_stats(log_path):
+    """Tổng hợp file log: {cấu hình: {'runs', 'wins', 'win_rate', 'mean_wall_s'}} khi thắng."""
+    table = {}
+    with open(log_path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            for name in entry['configs']:
+                row = table.setdefault(name, {'runs': 0, 'wins': 0, 'wall_s': 0.0})
+                row['runs'] += 1
+                if name == entry['winner']:
+                    row['wins'] += 1
+                    row['wall_s'] += entry['wall_s']
+    for row in table.values():
+        total = row.pop('wall_s')
+        row['win_rate'] = row['wins'] / row['runs'] if row['runs'] else 0.0
+        row['mean_wall_s'] = total / row['wins'] if row['wins'] else None
+    return table
@@ -0,0 +1,258 @@
+"""BFS đồng bộ theo tầng: lưới chia thành dải hàng, mỗi dải do một worker sở hữu.
+
+Mỗi ô của tầng được gắn một khoá = hạng của ô cha trong tầng trước * 8 + hướng:
+thứ tự khoá chính là thứ tự phát hiện của BFS tuần tự. Mỗi tầng, worker của dải
+[r0, r1) nhận các ô frontier của dải mình và của hai hàng kề ngoài dải, cùng
+khoá của cả tầng (để tính hạng toàn cục), rồi tự nhận ô: ghi dist / via thẳng
+vào mảng của nó, duyệt theo hạng tăng dần nên ô thuộc về ô cha có hạng nhỏ
+nhất (cùng cha thì hướng nhỏ nhất), đúng như BFS tuần tự. Không có hai worker
+ghi cùng một ô, nên không cần khoá và không có bước gộp tuần tự: worker chỉ
+trả về frontier tầng sau của dải mình. Đường đi trùng với logic.bfs() và bản
+đồ khoảng cách trùng với logic.distance_field(backend='python').
+
+    with LevelBFS(grid, workers=8) as engine:
+        path = engine.bfs(start, goal)
+        dist, pred = engine.distance_field([goal], moves=8)
+
+Chế độ (mode):
+    - 'thread'  : ThreadPoolExecutor, mặc định trên bản CPython không GIL
+                  (free-threaded, sys._is_gil_enabled() là False);
+    - 'process' : Pool tiến trình, mặc định trên bản có GIL. Lưới, dist và via
+                  nằm trong WOM_MAZE_SHARED, mỗi tầng chỉ gửi frontier và khoá;
+    - 'serial'  : không song song (workers=1), một dải duy nhất.
+Tầng có frontier nhỏ (hành lang của mê cung hoàn hảo) được mở rộng ngay
+trong tiến trình chủ, từng dải một: gửi việc cho worker đắt hơn chính công việc.
+Chưa nhanh hơn bản tuần tự trên máy đo được nên logic.distance_field không
+dùng module này; gọi thẳng LevelBFS / distance_field bên dưới.
+"""
+import multiprocessing as mp
+import os
+import sys
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+
+import WOM_MAZE_LOGIC as logic
+from WOM_MAZE_SHARED import SharedArray
+
+DIRECTIONS = logic.WAVEFRONT_DIRECTIONS
+MODES = ('thread', 'process', 'serial')
+PARALLEL_MIN = 2048  # số ô tối thiểu mỗi worker để tầng được chia
+OPEN, WALL, OTHER = 0, 1, 2  # mã ô: BFS chỉ đi vào OPEN, distance_field đi vào mọi ô khác WALL
+
+
+def free_threaded():
+    """True khi chạy trên CPython không GIL (3.13t trở lên, GIL đang tắt)."""
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def default_mode():
+    return 'thread' if free_threaded() else 'process'
+
+
+def _cell_codes(grid):
+    return array('B', (OPEN if v == 0 else WALL if v == 1 else OTHER for row in grid for v in row))
+
+
+def _expand_strip(cells, dist, via, n, r0, r1, frontier, level, moves, strict):
+    """Nhận các ô chưa thăm của dải [r0, r1) kề frontier [(hạng, ô)] tăng dần theo hạng.
+
+    Trả về (ô mới, khoá) theo thứ tự khoá; khoá = hạng ô cha * 8 + hướng.
+    """
+    found, keys = array('i'), array('q')
+    dirs = DIRECTIONS[:moves]
+    for rank, u in frontier:
+        r, c = divmod(u, n)
+        base = rank * 8
+        for k, (dr, dc) in enumerate(dirs):
+            nr, nc = r + dr, c + dc
+            if r0 <= nr < r1 and 0 <= nc < n:
+                v = nr * n + nc
+                if dist[v] < 0:
+                    cell = cells[v]
+                    if cell == OPEN or (cell == OTHER and not strict):
+                        dist[v] = level
+                        via[v] = k
+                        found.append(v)
+                        keys.append(base + k)
+    return found, keys
+
+
+def _edge(found, keys, n, row):
+    """Phần của (found, keys) nằm trên hàng row: hàng ma gửi cho dải kề."""
+    lo, hi = row * n, (row + 1) * n
+    cells, edge_keys = array('i'), array('q')
+    for v, key in zip(found, keys):
+        if lo <= v < hi:
+            cells.append(v)
+            edge_keys.append(key)
+    return cells, edge_keys
+
+
+def _level(cells, dist, via, n, task):
+    """Một tầng của một dải: xếp hạng frontier theo khoá của cả tầng, nhận ô, tách hàng biên."""
+    r0, r1, frontier, halos, all_keys, level, moves, strict = task
+    if len(all_keys) == 1:
+        ranked = enumerate(frontier[0])  # một dải: frontier đã theo thứ tự khoá, hạng là vị trí
+    else:
+        items = sorted(pair for part in (frontier, *halos) for pair in zip(part[1], part[0]))
+        # Khoá là duy nhất trong một tầng: hạng = số khoá nhỏ hơn trong mọi dải
+        ranked = [(sum(bisect_left(part, key) for part in all_keys), u) for key, u in items]
+    found, keys = _expand_strip(cells, dist, via, n, r0, r1, ranked, level, moves, strict)
+    if len(all_keys) == 1:
+        return found, keys, None, None  # không có dải kề nào cần hàng biên
+    return found, keys, _edge(found, keys, n, r0), _edge(found, keys, n, r1 - 1)
+
+
+# --- Tiến trình con (chế độ 'process') ---
+_proc = {}
+
+
+def _proc_init(cells_handle, dist_handle, via_handle):
+    shared = [SharedArray.attach(h) for h in (cells_handle, dist_handle, via_handle)]
+    _proc.update(shared=shared, n=cells_handle.shape[0])
+
+
+def _proc_level(task):
+    cells, dist, via = (arr.view for arr in _proc['shared'])
+    return _level(cells, dist, via, _proc['n'], task)
+
+
+class LevelBFS:
+    """Bộ máy BFS theo tầng cho một lưới; dùng lại pool / bộ nhớ dùng chung giữa các truy vấn."""
+
+    def __init__(self, grid, workers=None, mode=None):
+        self.n = n = len(grid)
+        self.workers = workers or os.cpu_count() or 1
+        if mode is None:
+            mode = default_mode() if self.workers > 1 else 'serial'
+        if mode not in MODES:
+            raise ValueError(f'Unknown mode: {mode}')
+        self.mode = mode
+        strips = 1 if mode == 'serial' else max(1, min(self.workers, n))
+        self.bounds = [(n * i // strips, n * (i + 1) // strips) for i in range(strips)]
+        self._pool = self._executor = None
+        self._shared = []
+        codes = _cell_codes(grid)
+        if mode == 'process':
+            cells = SharedArray.create((n, n), 'B')
+            cells.view[:] = codes
+            dist = SharedArray.create((n * n,), 'i')
+            via = SharedArray.create((n * n,), 'b')
+            self._shared = [cells, dist, via]
+            self.cells, self.dist, self.via = cells.view, dist.view, via.view
+            self._pool = mp.Pool(self.workers, initializer=_proc_init,
+                                 initargs=(cells.handle, dist.handle, via.handle))
+        else:
+            self.cells, self.dist = codes, array('i', [-1]) * (n * n)
+            self.via = array('b', [-1]) * (n * n)  # hướng (chỉ số DIRECTIONS) của bước từ ô cha tới ô
+            if mode == 'thread':
+                self._executor = ThreadPoolExecutor(self.workers)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        for shared in self._shared:
+            shared.release()
+        self._shared = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Lõi ---
+    def _local_level(self, task):
+        return _level(self.cells, self.dist, self.via, self.n, task)
+
+    def _run_level(self, tasks, size):
+        if self.mode == 'serial' or len(tasks) < 2 or size < PARALLEL_MIN * len(tasks):
+            return [self._local_level(task) for task in tasks]
+        if self.mode == 'thread':
+            return list(self._executor.map(self._local_level, tasks))
+        return self._pool.map(_proc_level, tasks)
+
+    def _run(self, sources, moves, strict, goal=None):
+        """Lan từ sources theo tầng; dừng sớm khi goal đã được thăm."""
+        if moves not in (4, 8):
+            raise ValueError(f'moves must be 4 or 8, got {moves!r}')
+        n, dist, via, bounds = self.n, self.dist, self.via, self.bounds
+        dist[:] = array('i', [-1]) * (n * n)
+        # frontier của từng dải: (ô, khoá), tăng dần theo khoá
+        parts = [(array('i'), array('q')) for _ in bounds]
+        for r, c in sources:
+            u = r * n + c
+            if dist[u] < 0:
+                dist[u] = 0
+                via[u] = -1
+                s = next(i for i, (r0, r1) in enumerate(bounds) if r0 <= r < r1)
+                key = sum(len(part[0]) for part in parts)
+                parts[s][0].append(u)
+                parts[s][1].append(key)
+        edges = [(_edge(*part, n, r0), _edge(*part, n, r1 - 1)) for part, (r0, r1) in zip(parts, bounds)]
+        level = 0
+        last = len(bounds) - 1
+        while not (goal is not None and dist[goal] >= 0):
+            size = sum(len(part[0]) for part in parts)
+            if not size:
+                break
+            level += 1
+            all_keys = [part[1] for part in parts]
+            tasks = []
+            for s, (r0, r1) in enumerate(bounds):
+                # Hàng ma: hàng cuối của dải trên, hàng đầu của dải dưới
+                halos = ([edges[s - 1][1]] if s > 0 else []) + ([edges[s + 1][0]] if s < last else [])
+                tasks.append((r0, r1, parts[s], halos, all_keys, level, moves, strict))
+            results = self._run_level(tasks, size)
+            parts = [(found, keys) for found, keys, _, _ in results]
+            edges = [(top, bottom) for _, _, top, bottom in results]
+
+    # --- Truy vấn ---
+    def bfs(self, start, goal):
+        """Đường đi 4 hướng ngắn nhất từ start tới goal, giống hệt logic.bfs() (rỗng nếu không có)."""
+        n = self.n
+        g = goal[0] * n + goal[1]
+        self._run([start], 4, strict=True, goal=g)
+        if self.dist[g] < 0:
+            return []
+        path = []
+        v = g
+        while True:
+            path.append(divmod(v, n))
+            k = self.via[v]
+            if k < 0:
+                break
+            dr, dc = DIRECTIONS[k]
+            v -= dr * n + dc
+        path.reverse()
+        return path
+
+    def distance_field(self, sources, moves=4):
+        """(dist, pred) dạng list-of-lists, giống logic.distance_field(backend='python')."""
+        self._run(sources, moves, strict=False)
+        n = self.n
+        back = [DIRECTIONS.index((-dr, -dc)) for dr, dc in DIRECTIONS]
+        dist = self.dist.tolist()
+        pred = [-1 if k < 0 else back[k] for k in self.via]
+        for u, d in enumerate(dist):
+            if d < 0:
+                pred[u] = -1  # via còn giá trị của lần chạy trước
+        return ([dist[r * n:(r + 1) * n] for r in range(n)],
+                [pred[r * n:(r + 1) * n] for r in range(n)])
+
+
+def bfs(grid, start, goal, workers=None, mode=None):
+    with LevelBFS(grid, workers, mode) as engine:
+        return engine.bfs(start, goal)
+
+
+def distance_field(grid, sources, moves=4, workers=None, mode=None):
+    with LevelBFS(grid, workers, mode) as engine:
+        return engine.distance_field(sources, moves)
@@ -0,0 +1,419 @@
+"""Vẽ lưới mê cung bằng một ảnh duy nhất thay vì một hình chữ nhật Tk cho mỗi ô.
+
+Mỗi ô là một pixel RGB trong bộ đệm bytearray n x n. Đổi màu ô chỉ ghi 3 byte
+vào bộ đệm; ảnh được phóng to (NEAREST) và đẩy lên canvas một lần mỗi khung
+hình qua after_idle. Icon start/end, trạm nhiên liệu... vẫn là các item Tk vẽ
+chồng lên trên ảnh.
+
+FrameScheduler thay cho vòng `after(delay, step)` một-sự-kiện-mỗi-lần: mỗi khung
+hình nó rút nhiều sự kiện nhất có thể trong một ngân sách thời gian (hoặc theo
+tốc độ ô/giây), áp dụng cả lô rồi mới cập nhật nhãn một lần.
+
+Khung nhìn: con lăn chuột zoom quanh con trỏ, kéo chuột giữa để di chuyển
+(bind_viewport). Mỗi khung hình chỉ phần lưới trong khung nhìn được cắt ra và
+phóng to; khi thu nhỏ tới mức nhiều ô chung một pixel thì lấy từ mipmap (bộ
+đệm thu nhỏ 2, 4, ... 64 lần, cập nhật theo khối khi ô đổi màu), nên mê cung
+5000×5000 vẫn kéo / zoom được. pixel_to_cell và cell_origin theo khung nhìn.
+"""
+import math
+import time
+
+MIP_TILE = 64       # ô; khối cập nhật lại mipmap khi ô đổi màu (chia hết cho mọi hệ số 2**k)
+MIP_LEVELS = 6      # mức mipmap sâu nhất: thu nhỏ 64 lần
+MIN_VISIBLE = 8     # phóng to tối đa: khung nhìn còn chừng này ô mỗi chiều
+ZOOM_STEP = 1.25    # mỗi nấc con lăn chuột
+
+
+class GridRenderer:
+    """Bộ vẽ lưới dựa trên ảnh cho một canvas (hoặc một vùng của canvas)."""
+
+    def __init__(self, canvas, outline='gray', margin_color=None, region=None):
+        self.canvas = canvas
+        self.outline = outline
+        self.margin_color = margin_color
+        self.region = region  # (x, y, w, h) trên canvas; None = cả canvas
+        self.tag = f'grid_{id(self)}'
+        self.frame_tag = f'{self.tag}_frame'
+        self.n = 0
+        self.fit = None        # cạnh ô khi thấy cả lưới (zoom = 1)
+        self.cell_size = None
+        self.pad_x = None
+        self.pad_y = None
+        self.zoom = 1.0
+        self.view_r = 0.0      # ô (thực) ở góc trên-trái khung nhìn
+        self.view_c = 0.0
+        self.on_view = None    # gọi sau mỗi lần zoom / kéo: vẽ lại icon
+        self._pixels = bytearray()
+        self._rgb_cache = {}
+        self._mask = None
+        self._mask_key = None
+        self._levels = None    # mipmap: ảnh PIL thu nhỏ 2, 4, ... lần; tạo khi cần lần đầu
+        self._dirty = set()    # khối MIP_TILE x MIP_TILE ô đổi màu từ lần cập nhật mipmap trước
+        self._drag = None
+        self._photo = None
+        self._image_item = None
+        self._flush_pending = False
+
+    # --- Màu ---
+    def rgb(self, color):
+        """Màu Tk (tên hoặc #rrggbb) -> 3 byte RGB, có cache."""
+        value = self._rgb_cache.get(color)
+        if value is None:
+            r, g, b = self.canvas.winfo_rgb(color)
+            value = self._rgb_cache[color] = bytes((r >> 8, g >> 8, b >> 8))
+        return value
+
+    # --- Bố cục ---
+    def _area(self):
+        if self.region is not None:
+            return self.region
+        return 0, 0, self.canvas.winfo_width(), self.canvas.winfo_height()
+
+    def layout(self, n, color_at):
+        """Tính lại kích thước ô và tô toàn bộ lưới; color_at(r, c) trả về màu của ô."""
+        rgb = self.rgb
+        self._layout(n, bytearray(b''.join(rgb(color_at(r, c)) for r in range(n) for c in range(n))))
+
+    def layout_values(self, grid, colors):
+        """Như layout nhưng tô theo giá trị ô (colors: giá trị -> màu), chạy trong PIL.
+
+        Dùng cho lưới lớn (hàng nghìn ô mỗi cạnh), nơi gọi color_at cho từng ô quá chậm.
+        """
+        from PIL import Image
+        n = len(grid)
+        table = bytearray(256)
+        palette = bytearray(768)
+        for i, (value, color) in enumerate(colors.items()):
+            table[value] = i
+            palette[i * 3:i * 3 + 3] = self.rgb(color)
+        img = Image.frombytes('P', (n, n), b''.join(bytes(row).translate(table) for row in grid))
+        img.putpalette(palette)
+        self._layout(n, bytearray(img.convert('RGB').tobytes()))
+
+    def _layout(self, n, pixels):
+        if n != self.n:
+            self.zoom, self.view_r, self.view_c = 1.0, 0.0, 0.0
+        self.n = n
+        x0, y0, w, h = self._area()
+        self.fit = min(w / n, h / n) if n else 0
+        total = self.fit * n
+        self.pad_x = x0 + (w - total) / 2
+        self.pad_y = y0 + (h - total) / 2
+        self._size = max(1, int(round(total)))
+        self._pixels = pixels
+        self._levels = None
+        self._dirty.clear()
+        self._mask_key = None
+        self._clamp_view()
+        self.canvas.delete(self.tag)
+        self._image_item = self.canvas.create_image(self.pad_x, self.pad_y, anchor='nw', tags=self.tag)
+        # Khung quanh ảnh: lề màu margin_color; khi phóng to được nâng lên trên để che icon tràn ra ngoài
+        mc = self.margin_color or self.canvas.cget('bg')
+        tags = (self.tag, self.frame_tag)
+        self.canvas.create_rectangle(x0, y0, self.pad_x, y0 + h, fill=mc, outline='', tags=tags)
+        self.canvas.create_rectangle(self.pad_x + total, y0, x0 + w, y0 + h, fill=mc, outline='', tags=tags)
+        self.canvas.create_rectangle(self.pad_x, y0, self.pad_x + total, self.pad_y, fill=mc, outline='', tags=tags)
+        self.canvas.create_rectangle(self.pad_x, self.pad_y + total, self.pad_x + total, y0 + h, fill=mc,
+                                     outline='', tags=tags)
+        self.canvas.tag_lower(self.tag)
+        if self.zoom > 1:
+            self.canvas.tag_raise(self.frame_tag)
+        self.flush()
+
+    # --- Cập nhật ô ---
+    def in_grid(self, cell):
+        return cell is not None and 0 <= cell[0] < self.n and 0 <= cell[1] < self.n
+
+    def set_cell(self, cell, color):
+        """Đổi màu một ô trong bộ đệm; ảnh được đẩy lên canvas ở khung hình kế tiếp."""
+        i = (cell[0] * self.n + cell[1]) * 3
+        self._pixels[i:i + 3] = self.rgb(color)
+        if self._levels is not None:
+            self._dirty.add((cell[0] // MIP_TILE, cell[1] // MIP_TILE))
+        self._schedule_flush()
+
+    def set_cells(self, cells, color):
+        value = self.rgb(color)
+        n = self.n
+        pixels = self._pixels
+        for r, c in cells:
+            i = (r * n + c) * 3
+            pixels[i:i + 3] = value
+        if self._levels is not None:
+            self._dirty.update((r // MIP_TILE, c // MIP_TILE) for r, c in cells)
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        if not self._flush_pending:
+            self._flush_pending = True
+            self.canvas.after_idle(self.flush)
+
+    def _region(self, r0, r1, c0, c1):
+        """Byte RGB của các ô [r0, r1) x [c0, c1) trong bộ đệm."""
+        n, pixels = self.n, self._pixels
+        if c0 == 0 and c1 == n:
+            return bytes(pixels[r0 * n * 3:r1 * n * 3])
+        return b''.join(pixels[(r * n + c0) * 3:(r * n + c1) * 3] for r in range(r0, r1))
+
+    def _refresh_levels(self):
+        """Tạo mipmap lần đầu, hoặc tính lại các khối vừa đổi màu ở mọi mức."""
+        from PIL import Image
+        n = self.n
+        if self._levels is None:
+            full = Image.frombytes('RGB', (n, n), bytes(self._pixels))
+            self._levels = [full.reduce(2 ** k) for k in range(1, MIP_LEVELS + 1) if 2 ** k <= n]
+            self._dirty.clear()
+            return
+        for tr, tc in self._dirty:
+            r0, c0 = tr * MIP_TILE, tc * MIP_TILE
+            r1, c1 = min(n, r0 + MIP_TILE), min(n, c0 + MIP_TILE)
+            tile = Image.frombytes('RGB', (c1 - c0, r1 - r0), self._region(r0, r1, c0, c1))
+            for k, level in enumerate(self._levels, 1):
+                f = 2 ** k
+                level.paste(tile.reduce(f), (c0 // f, r0 // f))
+        self._dirty.clear()
+
+    def flush(self):
+        """Cắt phần lưới trong khung nhìn, phóng to và đẩy lên canvas (một lần blit).
+
+        Khi mỗi pixel màn hình phủ từ 2 ô trở lên, ảnh được lấy từ mức mipmap
+        thu nhỏ 2**k lần gần nhất thay cho bộ đệm đầy đủ, nên chi phí mỗi khung
+        hình theo kích thước canvas chứ không theo n².
+        """
+        self._flush_pending = False
+        if not self.n or self._image_item is None:
+            return
+        from PIL import Image, ImageTk
+        n, size = self.n, self._size
+        span = n / self.zoom
+        vr, vc = self.view_r, self.view_c
+        level = 0
+        top = min(MIP_LEVELS, n.bit_length() - 1)
+        while level < top and 2 ** (level + 1) <= span / size:
+            level += 1
+        if level == 0:
+            r0, c0 = int(vr), int(vc)
+            r1, c1 = min(n, math.ceil(vr + span)), min(n, math.ceil(vc + span))
+            src = Image.frombytes('RGB', (c1 - c0, r1 - r0), self._region(r0, r1, c0, c1))
+            box = (vc - c0, vr - r0, vc - c0 + span, vr - r0 + span)
+        else:
+            self._refresh_levels()
+            f = 2 ** level
+            src = self._levels[level - 1]
+            box = (vc / f, vr / f, (vc + span) / f, (vr + span) / f)
+        img = src.resize((size, size), Image.NEAREST, box=box)
+        mask = self._grid_mask()
+        if mask is not None:
+            img.paste(tuple(self.rgb(self.outline)), (0, 0, size, size), mask)
+        self._photo = ImageTk.PhotoImage(img)
+        self.canvas.itemconfig(self._image_item, image=self._photo)
+
+    def _grid_mask(self):
+        """Mặt nạ đường kẻ lưới của khung nhìn: chỉ vẽ khi ô đủ lớn để nhìn thấy."""
+        if not self.outline or self.cell_size < 4:
+            return None
+        key = (self._size, self.zoom, self.view_r, self.view_c)
+        if key != self._mask_key:
+            from PIL import Image, ImageDraw
+            size, cell = self._size, self.cell_size
+            mask = Image.new('L', (size, size), 0)
+            draw = ImageDraw.Draw(mask)
+            for i in range(math.ceil(self.view_c), int(self.view_c + self.n / self.zoom) + 1):
+                p = min(size - 1, int(round((i - self.view_c) * cell)))
+                draw.line([(p, 0), (p, size)], fill=255)
+            for i in range(math.ceil(self.view_r), int(self.view_r + self.n / self.zoom) + 1):
+                p = min(size - 1, int(round((i - self.view_r) * cell)))
+                draw.line([(0, p), (size, p)], fill=255)
+            self._mask, self._mask_key = mask, key
+        return self._mask
+
+    # --- Khung nhìn (zoom / kéo) ---
+    def max_zoom(self):
+        return max(1.0, self.n / MIN_VISIBLE)
+
+    def _clamp_view(self):
+        self.zoom = min(max(1.0, self.zoom), self.max_zoom())
+        self.cell_size = (self.fit or 0) * self.zoom
+        limit = self.n - self.n / self.zoom
+        self.view_r = min(max(0.0, self.view_r), limit)
+        self.view_c = min(max(0.0, self.view_c), limit)
+
+    def _view_changed(self):
+        self._clamp_view()
+        self._schedule_flush()
+        if self.on_view is not None:
+            self.on_view()
+        if self.zoom > 1:
+            self.canvas.tag_raise(self.frame_tag)
+        else:
+            self.canvas.tag_lower(self.tag)
+
+    def zoom_at(self, factor, x, y):
+        """Phóng to (factor > 1) / thu nhỏ quanh điểm canvas (x, y): ô dưới con trỏ đứng yên."""
+        if not self.cell_size:
+            return
+        row = self.view_r + (y - self.pad_y) / self.cell_size
+        col = self.view_c + (x - self.pad_x) / self.cell_size
+        self.zoom *= factor
+        self._clamp_view()
+        self.view_r = row - (y - self.pad_y) / self.cell_size
+        self.view_c = col - (x - self.pad_x) / self.cell_size
+        self._view_changed()
+
+    def pan(self, dx, dy):
+        """Kéo khung nhìn theo dx, dy pixel trên canvas."""
+        if not self.cell_size:
+            return
+        self.view_c -= dx / self.cell_size
+        self.view_r -= dy / self.cell_size
+        self._view_changed()
+
+    def reset_view(self):
+        self.zoom, self.view_r, self.view_c = 1.0, 0.0, 0.0
+        self._view_changed()
+
+    def bind_viewport(self, on_view=None):
+        """Con lăn chuột: zoom quanh con trỏ; kéo chuột giữa: di chuyển; nhấp đúp chuột giữa: xem cả lưới."""
+        self.on_view = on_view
+        canvas = self.canvas
+        canvas.bind('<MouseWheel>', lambda e: self._on_wheel(e, 1 if e.delta > 0 else -1), add='+')
+        canvas.bind('<Button-4>', lambda e: self._on_wheel(e, 1), add='+')
+        canvas.bind('<Button-5>', lambda e: self._on_wheel(e, -1), add='+')
+        canvas.bind('<ButtonPress-2>', self._on_drag_start, add='+')
+        canvas.bind('<B2-Motion>', self._on_drag, add='+')
+        canvas.bind('<Double-Button-2>', lambda e: self.reset_view(), add='+')
+
+    def contains(self, x, y):
+        if not self.cell_size:
+            return False
+        return 0 <= x - self.pad_x < self._size and 0 <= y - self.pad_y < self._size
+
+    def _on_wheel(self, event, direction):
+        if self.contains(event.x, event.y):
+            self.zoom_at(ZOOM_STEP ** direction, event.x, event.y)
+
+    def _on_drag_start(self, event):
+        self._drag = (event.x, event.y) if self.contains(event.x, event.y) else None
+
+    def _on_drag(self, event):
+        if self._drag is not None:
+            x, y = self._drag
+            self._drag = (event.x, event.y)
+            self.pan(event.x - x, event.y - y)
+
+    # --- Toạ độ ---
+    def pixel_to_cell(self, x, y):
+        """Toạ độ canvas -> (hàng, cột) theo khung nhìn hiện tại; (None, None) nếu chưa vẽ."""
+        if not self.cell_size:
+            return None, None
+        col = int(math.floor(self.view_c + (x - self.pad_x) / self.cell_size))
+        row = int(math.floor(self.view_r + (y - self.pad_y) / self.cell_size))
+        return row, col
+
+    def cell_origin(self, cell):
+        """Góc trên-trái của ô trên canvas, dùng để vẽ icon chồng lên."""
+        return (self.pad_x + (cell[1] - self.view_c) * self.cell_size,
+                self.pad_y + (cell[0] - self.view_r) * self.cell_size)
+
+    def visible(self, cell):
+        """Ô có nằm (ít nhất một phần) trong khung nhìn không."""
+        if not self.in_grid(cell):
+            return False
+        span = self.n / self.zoom
+        return (self.view_r - 1 < cell[0] < self.view_r + span and
+                self.view_c - 1 < cell[1] < self.view_c + span)
+
+
+# --- Lập lịch khung hình ---
+def speed_to_rate(speed):
+    """Tốc độ trên slider (1..10) -> số sự kiện mỗi giây; 10 -> None (nhanh nhất có thể).
+
+    Mức 1 giữ nhịp cũ 200 ms mỗi ô (5 ô/s), mỗi mức sau nhanh gấp đôi.
+    """
+    speed = int(round(float(speed)))
+    if speed >= 10:
+        return None
+    return 5 * 2 ** (max(1, speed) - 1)
+
+
+class FrameScheduler:
+    """Rút sự kiện từ generator theo từng khung hình thay vì một sự kiện mỗi callback.
+
+    apply(typ, cell) được gọi cho từng sự kiện (chỉ nên ghi vào bộ đệm của
+    renderer), on_frame() được gọi một lần sau mỗi lô để cập nhật nhãn,
+    on_done() khi generator kết thúc. `events` có thể được gán lại giữa chừng
+    (ví dụ khi Mud Maze lập lại kế hoạch) - lần rút tiếp theo dùng generator mới.
+    Generator sinh None nghĩa là "chưa có sự kiện" (SearchWorker.events): khung
+    hình kết thúc sớm và thử lại ở khung sau.
+    """
+
+    def __init__(self, widget, events, apply, on_frame=None, on_done=None,
+                 rate=None, frame_ms=16, budget_ms=12):
+        self.widget = widget
+        self.events = events
+        self.apply = apply
+        self.on_frame = on_frame
+        self.on_done = on_done
+        self.rate = rate          # sự kiện/giây; None = không giới hạn
+        self.frame_ms = frame_ms
+        self.budget = budget_ms / 1000
+        self.running = False
+        self._job = None
+        self._credit = 0.0
+        self._last = 0.0
+
+    def start(self):
+        self.stop()
+        self.running = True
+        self._credit = 1.0  # sự kiện đầu tiên hiện ngay ở khung hình đầu
+        self._last = time.perf_counter()
+        self._job = self.widget.after(0, self._tick)
+        return self
+
+    def stop(self):
+        self.running = False
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    def set_rate(self, rate):
+        self.rate = rate
+
+    def _tick(self):
+        self._job = None
+        if not self.running:
+            return
+        now = time.perf_counter()
+        deadline = now + self.budget
+        if self.rate is None:
+            quota = None
+        else:
+            # Tích luỹ "tín dụng" theo thời gian thực, giới hạn để không bùng nổ sau khi cửa sổ bị treo
+            self._credit = min(self._credit + (now - self._last) * self.rate, max(1.0, self.rate / 4))
+            quota = int(self._credit)
+        self._last = now
+        count = 0
+        done = False
+        apply = self.apply
+        clock = time.perf_counter
+        try:
+            while quota is None or count < quota:
+                event = next(self.events)
+                if event is None:
+                    break
+                apply(*event)
+                count += 1
+                if not self.running or clock() >= deadline:
+                    break
+        except StopIteration:
+            done = True
+        if quota is not None:
+            self._credit -= count
+        if self.on_frame is not None:
+            self.on_frame()
+        if done:
+            self.running = False
+            if self.on_done is not None:
+                self.on_done()
+        elif self.running:
+            self._job = self.widget.after(self.frame_ms, self._tick)
@@ -0,0 +1,257 @@
+"""Bản đồ khoảng cách Dijkstra cho mê cung khổng lồ, chia dải hàng cho nhiều tiến trình.
+
+Cùng mô hình chi phí với logic.dijkstra_generator (8 hướng, bước thẳng 1, bước
+chéo √2, lấy từ logic.get_neighbors_cost; không vào được ô tường, nguồn nằm
+trên tường vẫn bước ra được). Lưới được chia thành `shards` dải hàng liên
+tiếp, mỗi dải giao cho một tiến trình:
+    1. mỗi tiến trình chạy Dijkstra trong dải của nó, từ các nguồn nằm trong dải;
+    2. mỗi vòng, tiến trình chủ chuyển hàng biên (hàng đầu / hàng cuối của dải)
+       vừa đổi qua Pipe cho dải kề; dải kề lấy hàng đó làm "hàng ma" bên ngoài,
+       gieo lại các ô biên rẻ hơn rồi chạy tiếp Dijkstra (không tính lại từ đầu);
+    3. dừng khi không dải nào còn đổi hàng biên: khoảng cách đã hội tụ.
+Lưới (byte) và bản đồ khoảng cách (double) nằm trong WOM_MAZE_SHARED: mỗi dải
+chỉ ghi vào hàng của nó, qua Pipe chỉ có danh sách nguồn và các hàng biên.
+
+    with ShardedDistanceField(grid, shards=8) as field:
+        rounds = field.compute([goal])
+        field.distance(cell)          # inf nếu không tới được
+        field.path(cell)              # cell -> nguồn gần nhất
+        dist = field.rows()           # memoryview theo hàng, dist[r][c]
+
+Số vòng bằng số lần đường đi ngắn nhất phải đổi qua lại giữa các dải, nên
+mê cung nhiều ngõ vòng qua biên dải hội tụ chậm hơn bản đồ địa hình thoáng.
+"""
+import heapq
+import math
+import multiprocessing as mp
+import os
+from array import array
+
+import WOM_MAZE_LOGIC as logic
+from WOM_MAZE_SHARED import SharedArray, share_grid
+
+INF = math.inf
+# (dr, dc) -> chi phí, đúng thứ tự và chi phí của get_neighbors_cost
+STEPS = [((r - 1, c - 1), cost) for (r, c), cost in logic.get_neighbors_cost((1, 1), 3)]
+_COST = dict(STEPS)
+
+
+class _Shard:
+    """Một dải hàng [r0, r1): Dijkstra cục bộ, gieo lại từ hàng ma của dải kề."""
+
+    def __init__(self, cells, dist, n, r0, r1):
+        self.cells, self.dist, self.n = cells, dist, n
+        self.r0, self.r1 = r0, r1
+        self.sent = [None, None]   # hàng biên (bytes) đã gửi lần trước: trên, dưới
+        self.halo = [None, None]   # hàng ma đã nhận lần trước: phía trên, phía dưới
+
+    def start(self, sources):
+        n, dist = self.n, self.dist
+        lo, hi = self.r0 * n, self.r1 * n
+        dist[lo:hi] = array('d', [INF]) * (hi - lo)
+        self.sent = [None, None]
+        self.halo = [None, None]
+        heap = []
+        for u in sources:
+            if dist[u] != 0:
+                dist[u] = 0.0
+                heap.append((0.0, u))
+        self._relax(heap)
+        return self._borders()
+
+    def exchange(self, above, below):
+        """Nhận hàng ma mới (bytes hoặc None nếu không đổi), chạy tiếp Dijkstra."""
+        heap = []
+        if above is not None:
+            self._seed(heap, 0, self.r0 - 1, self.r0, above)
+        if below is not None:
+            self._seed(heap, 1, self.r1, self.r1 - 1, below)
+        if heap:
+            heapq.heapify(heap)
+            self._relax(heap)
+        return self._borders()
+
+    def _seed(self, heap, side, halo_row, row, data):
+        halo = array('d')
+        halo.frombytes(data)
+        old = self.halo[side]
+        self.halo[side] = halo
+        n, cells, dist = self.n, self.cells, self.dist
+        dr = row - halo_row
+        base = row * n
+        for c in range(n):
+            h = halo[c]
+            if h == INF or (old is not None and old[c] <= h):
+                continue  # chỉ ô ma vừa rẻ đi mới gieo được gì mới
+            for dc in (-1, 0, 1):
+                nc = c + dc
+                if 0 <= nc < n:
+                    v = base + nc
+                    if cells[v] != 1:
+                        nd = h + _COST[(dr, dc)]
+                        if nd < dist[v]:
+                            dist[v] = nd
+                            heap.append((nd, v))
+
+    def _relax(self, heap):
+        n, cells, dist = self.n, self.cells, self.dist
+        r0, r1 = self.r0, self.r1
+        pop, push = heapq.heappop, heapq.heappush
+        while heap:
+            d, u = pop(heap)
+            if d > dist[u]:
+                continue
+            r, c = divmod(u, n)
+            for (dr, dc), cost in STEPS:
+                nr, nc = r + dr, c + dc
+                if r0 <= nr < r1 and 0 <= nc < n:
+                    v = nr * n + nc
+                    if cells[v] != 1:
+                        nd = d + cost
+                        if nd < dist[v]:
+                            dist[v] = nd
+                            push(heap, (nd, v))
+
+    def _borders(self):
+        """Hàng đầu / hàng cuối của dải nếu đổi so với lần gửi trước (ngược lại None)."""
+        n, dist = self.n, self.dist
+        out = []
+        for side, row in enumerate((self.r0, self.r1 - 1)):
+            data = dist[row * n:(row + 1) * n].tobytes()
+            if data == self.sent[side]:
+                out.append(None)
+            else:
+                self.sent[side] = data
+                out.append(data)
+        return out
+
+
+def _shard_main(conn, cells_handle, dist_handle, r0, r1):
+    cells = SharedArray.attach(cells_handle)
+    dist = SharedArray.attach(dist_handle)
+    shard = _Shard(cells.view, dist.view, cells_handle.shape[0], r0, r1)
+    try:
+        while True:
+            msg = conn.recv()
+            if msg is None:
+                break
+            if msg[0] == 'start':
+                conn.send(shard.start(msg[1]))
+            else:
+                conn.send(shard.exchange(msg[1], msg[2]))
+    finally:
+        cells.release()
+        dist.release()
+        conn.close()
+
+
+class ShardedDistanceField:
+    """Nhóm tiến trình giữ một lưới dùng chung; compute() dùng lại được với nguồn khác."""
+
+    def __init__(self, grid, shards=None):
+        self.cells = grid if isinstance(grid, SharedArray) else share_grid(grid)
+        self.n = n = self.cells.handle.shape[0]
+        shards = max(1, min(shards or os.cpu_count() or 1, n))
+        self.bounds = [(n * i // shards, n * (i + 1) // shards) for i in range(shards)]
+        self.dist = SharedArray.create((n, n), 'd')
+        self._owns_cells = self.cells is not grid
+        self._conns, self._procs, self._local = [], [], None
+        if shards == 1:
+            # Một dải: chạy ngay trong tiến trình này, không cần Pipe
+            self._local = _Shard(self.cells.view, self.dist.view, n, 0, n)
+            return
+        ctx = mp.get_context()
+        for r0, r1 in self.bounds:
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=_shard_main, args=(child, self.cells.handle, self.dist.handle, r0, r1),
+                               name=f'shard-{r0}-{r1}', daemon=True)
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+
+    def close(self):
+        for conn in self._conns:
+            conn.send(None)
+        for proc in self._procs:
+            proc.join(timeout=1)
+            if proc.is_alive():
+                proc.terminate()
+        for conn in self._conns:
+            conn.close()
+        self._conns, self._procs = [], []
+        if self.dist is not None:
+            self.dist.release()
+            self.dist = None
+        if self._owns_cells and self.cells is not None:
+            self.cells.release()
+        self.cells = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Tính ---
+    def compute(self, sources):
+        """Khoảng cách Dijkstra từ mọi ô tới nguồn gần nhất; trả về số vòng trao đổi biên."""
+        n = self.n
+        flat = sorted({r * n + c for r, c in sources})
+        if self._local is not None:
+            self._local.start(flat)
+            return 0
+        for conn, (r0, r1) in zip(self._conns, self.bounds):
+            conn.send(('start', [u for u in flat if r0 * n <= u < r1 * n]))
+        borders = [conn.recv() for conn in self._conns]
+        rounds = 0
+        last = len(self._conns) - 1
+        while True:
+            # Hàng ma của dải i: hàng cuối của dải i - 1 và hàng đầu của dải i + 1, nếu vừa đổi
+            msgs = []
+            for i in range(last + 1):
+                above = borders[i - 1][1] if i > 0 else None
+                below = borders[i + 1][0] if i < last else None
+                msgs.append(None if above is None and below is None else ('halo', above, below))
+            if all(msg is None for msg in msgs):
+                return rounds
+            rounds += 1
+            for conn, msg in zip(self._conns, msgs):
+                if msg is not None:
+                    conn.send(msg)
+            borders = [conn.recv() if msg is not None else [None, None]
+                       for conn, msg in zip(self._conns, msgs)]
+
+    # --- Truy vấn ---
+    def distance(self, cell):
+        return self.dist.view[cell[0] * self.n + cell[1]]
+
+    def rows(self):
+        return self.dist.rows()
+
+    def path(self, cell):
+        """Đường đi từ cell về nguồn gần nhất theo bản đồ khoảng cách; rỗng nếu không tới được."""
+        n, dist = self.n, self.dist.view
+        r, c = cell
+        d = dist[r * n + c]
+        if d == INF:
+            return []
+        path = [(r, c)]
+        while d > 0:
+            best = None
+            for (dr, dc), cost in STEPS:
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < n and 0 <= nc < n:
+                    via = dist[nr * n + nc]
+                    if via < d and (best is None or via + cost < best[0]):
+                        best = (via + cost, nr, nc, via)
+            _, r, c, d = best
+            path.append((r, c))
+        return path
+
+
+def distance_field(grid, sources, shards=None):
+    """Khoảng cách Dijkstra (list-of-lists float, inf nếu không tới được) tính theo dải."""
+    with ShardedDistanceField(grid, shards) as field:
+        field.compute(sources)
+        return [list(row) for row in field.rows()]
@@ -0,0 +1,247 @@
+"""Mảng dùng chung giữa các tiến trình (lưới mê cung, bản đồ địa hình, bảng tính sẵn).
+
+Thay vì pickle cả list-of-lists `grid` cho mỗi tiến trình con (hàng trăm MB
+với mê cung 4000×4000), dữ liệu được chép một lần vào
+multiprocessing.shared_memory (hoặc một file mmap). Tiến trình con chỉ nhận
+một SharedHandle nhỏ (tên, kích thước, kiểu) rồi gắn vào mà không chép.
+
+    grid_sa = share_grid(grid)                      # tiến trình chủ
+    pool.map(task, [(grid_sa.handle, s, g) ...])
+    ...
+    rows = attach(handle).rows()                    # tiến trình con: rows[r][c] như list
+    logic.bfs(rows, start, goal)
+
+Vòng đời đếm tham chiếu theo từng tiến trình: acquire()/release(); khi số
+đếm về 0 thì đóng ánh xạ, và nếu là tiến trình tạo ra khối nhớ thì gỡ
+(unlink) luôn. Mọi mảng còn sống được dọn khi tiến trình thoát (atexit).
+Bản thân SharedArray pickle thành handle, nên có thể truyền thẳng vào Pool.
+
+File mmap (path=...) không bị xoá khi giải phóng: dùng cho bảng tính sẵn muốn
+giữ lại giữa các lần chạy; SharedHandle('file', path, ...) mở lại được.
+Có numpy thì numpy.frombuffer(arr.view, ...) cũng không chép dữ liệu.
+"""
+import atexit
+import mmap
+import os
+from array import array
+from multiprocessing import resource_tracker, shared_memory
+
+TYPECODES = 'bBhHiIlLqQfd'
+
+
+class SharedHandle:
+    """Mô tả nhỏ, pickle được, đủ để gắn vào một SharedArray ở tiến trình khác."""
+
+    __slots__ = ('kind', 'name', 'shape', 'typecode')
+
+    def __init__(self, kind, name, shape, typecode='B'):
+        if kind not in ('shm', 'file'):
+            raise ValueError(f'unknown kind {kind!r}, expected shm or file')
+        if typecode not in TYPECODES:
+            raise ValueError(f'unsupported typecode {typecode!r}')
+        self.kind = kind
+        self.name = name
+        self.shape = tuple(shape)
+        self.typecode = typecode
+
+    @property
+    def size(self):
+        count = 1
+        for dim in self.shape:
+            count *= dim
+        return count
+
+    @property
+    def nbytes(self):
+        return self.size * array(self.typecode).itemsize
+
+    def __getstate__(self):
+        return (self.kind, self.name, self.shape, self.typecode)
+
+    def __setstate__(self, state):
+        self.kind, self.name, self.shape, self.typecode = state
+
+    def __eq__(self, other):
+        return isinstance(other, SharedHandle) and self.__getstate__() == other.__getstate__()
+
+    def __hash__(self):
+        return hash(self.__getstate__())
+
+    def __repr__(self):
+        return f'SharedHandle({self.kind!r}, {self.name!r}, {self.shape}, {self.typecode!r})'
+
+
+# --- Quản lý vòng đời trong tiến trình hiện tại ---
+_live = {}                 # (kind, name) -> SharedArray đang mở trong tiến trình này
+_tracker_shared = None     # tiến trình này có dùng chung resource tracker với tiến trình cha không
+
+
+def _untrack_if_private(shm):
+    """Python < 3.13 luôn đăng ký khối nhớ với resource tracker khi gắn vào.
+
+    Nếu tiến trình con dùng chung tracker với tiến trình tạo khối (spawn, hoặc
+    fork sau khi tracker đã chạy), đăng ký thêm là vô hại. Nếu nó tự khởi động
+    tracker riêng (fork trước khi tracker chạy), tracker đó sẽ gỡ khối nhớ khi
+    tiến trình con thoát - nên phải huỷ đăng ký.
+    """
+    if not _tracker_shared:
+        resource_tracker.unregister(shm._name, 'shared_memory')
+
+
+class SharedArray:
+    """Mảng kiểu cố định trong shared memory / file mmap, truy cập qua memoryview."""
+
+    def __init__(self, handle, backing, owner):
+        self.handle = handle
+        # Chỉ tiến trình tạo ra khối nhớ mới unlink (tiến trình fork kế thừa đối tượng thì không)
+        self._owner_pid = os.getpid() if owner else None
+        self.refcount = 1
+        self._backing = backing      # SharedMemory hoặc mmap
+        buf = backing.buf if isinstance(backing, shared_memory.SharedMemory) else memoryview(backing)
+        self._raw = buf
+        self._bytes = buf[:handle.nbytes]
+        self.view = self._bytes.cast(handle.typecode)
+        self._rows = None
+        _live[(handle.kind, handle.name)] = self
+
+    # --- Tạo / gắn ---
+    @classmethod
+    def create(cls, shape, typecode='B', path=None):
+        """Cấp phát mảng mới (giá trị 0). path=None: shared memory; ngược lại: file mmap."""
+        kind = 'shm' if path is None else 'file'
+        handle = SharedHandle(kind, path, shape, typecode)
+        size = max(1, handle.nbytes)
+        if path is None:
+            shm = shared_memory.SharedMemory(create=True, size=size)
+            handle.name = shm.name
+            return cls(handle, shm, owner=True)
+        with open(path, 'w+b') as f:
+            f.truncate(size)
+            mm = mmap.mmap(f.fileno(), size)
+        return cls(handle, mm, owner=True)
+
+    @classmethod
+    def from_rows(cls, rows, typecode='B', path=None):
+        """Chép một list-of-lists (ví dụ grid) vào mảng dùng chung mới."""
+        n_rows = len(rows)
+        n_cols = len(rows[0]) if n_rows else 0
+        arr = cls.create((n_rows, n_cols), typecode, path)
+        flat = arr.view
+        for r, row in enumerate(rows):
+            flat[r * n_cols:(r + 1) * n_cols] = array(typecode, row)
+        return arr
+
+    @classmethod
+    def attach(cls, handle):
+        """Gắn vào mảng đã có (không chép); trong cùng tiến trình thì dùng lại ánh xạ cũ."""
+        global _tracker_shared
+        live = _live.get((handle.kind, handle.name))
+        if live is not None:
+            live.refcount += 1
+            return live
+        if handle.kind == 'file':
+            with open(handle.name, 'r+b') as f:
+                backing = mmap.mmap(f.fileno(), max(1, handle.nbytes))
+            return cls(handle, backing, owner=False)
+        try:
+            shm = shared_memory.SharedMemory(name=handle.name, track=False)
+        except TypeError:  # Python < 3.13
+            if _tracker_shared is None:
+                _tracker_shared = getattr(resource_tracker._resource_tracker, '_fd', None) is not None
+            shm = shared_memory.SharedMemory(name=handle.name)
+            _untrack_if_private(shm)
+        return cls(handle, shm, owner=False)
+
+    # --- Truy cập ---
+    def rows(self):
+        """Danh sách memoryview theo hàng - rows[r][c] đọc/ghi như list-of-lists."""
+        if len(self.handle.shape) != 2:
+            raise ValueError('rows() needs a 2-D array')
+        if self._rows is None:
+            n_cols = self.handle.shape[1]
+            flat = self.view
+            self._rows = [flat[r * n_cols:(r + 1) * n_cols] for r in range(self.handle.shape[0])]
+        return self._rows
+
+    def to_list(self):
+        if len(self.handle.shape) == 2:
+            return [row.tolist() for row in self.rows()]
+        return self.view.tolist()
+
+    @property
+    def owner(self):
+        return self._owner_pid == os.getpid()
+
+    @property
+    def closed(self):
+        return self.refcount <= 0
+
+    # --- Đếm tham chiếu ---
+    def acquire(self):
+        if self.closed:
+            raise ValueError('SharedArray is already released')
+        self.refcount += 1
+        return self
+
+    def release(self):
+        """Giảm số đếm; về 0 thì đóng ánh xạ (và unlink nếu là chủ, trừ file mmap)."""
+        if self.closed:
+            return
+        self.refcount -= 1
+        if self.refcount == 0:
+            self._close()
+
+    def _close(self):
+        _live.pop((self.handle.kind, self.handle.name), None)
+        # Phải nhả mọi memoryview con trước khi đóng khối nhớ
+        for row in self._rows or ():
+            row.release()
+        self._rows = None
+        self.view.release()
+        self._bytes.release()
+        if isinstance(self._backing, shared_memory.SharedMemory):
+            self._backing.close()
+            if self.owner:
+                try:
+                    self._backing.unlink()
+                except FileNotFoundError:
+                    pass
+        else:
+            self._raw.release()
+            self._backing.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def __reduce__(self):
+        # Pickle thành handle: bên nhận gắn vào, không chép dữ liệu
+        return (attach, (self.handle,))
+
+    def __repr__(self):
+        state = 'released' if self.closed else f'refs={self.refcount}'
+        return f'<SharedArray {self.handle.name} {self.handle.shape} {self.handle.typecode!r} {state}>'
+
+
+def attach(handle):
+    return SharedArray.attach(handle)
+
+
+def share_grid(grid, path=None):
+    """Lưới mê cung (0/1, hoặc mã địa hình < 256) -> SharedArray kiểu byte."""
+    return SharedArray.from_rows(grid, 'B', path)
+
+
+def remove_file(handle):
+    """Xoá file của một mảng mmap (file không tự xoá khi giải phóng)."""
+    if handle.kind == 'file' and os.path.exists(handle.name):
+        os.remove(handle.name)
+
+
+@atexit.register
+def _cleanup():
+    for arr in list(_live.values()):
+        arr.refcount = 1
+        arr.release()
@@ -0,0 +1,201 @@
+"""Ghi và phát lại luồng sự kiện tìm đường ('visit' / 'path') dưới dạng nhị phân.
+
+Cấu trúc file (little-endian):
+    header   : magic 'WOMT', version, n, start, goal, số sự kiện, chu kỳ keyframe,
+               offset của lưới / sự kiện / bảng keyframe
+    lưới     : n*n bit theo hàng, bit 1 = tường
+    sự kiện  : mỗi sự kiện là một varint của (chỉ số ô phẳng << 1) | loại (0=visit, 1=path)
+    keyframe : cứ mỗi `keyframe_interval` sự kiện ghi (số thứ tự, offset byte, số visit đã qua)
+
+TraceReader ánh xạ file vào bộ nhớ (mmap) và nhảy tới bước bất kỳ bằng tìm kiếm
+nhị phân trên bảng keyframe, sau đó chỉ giải mã tối đa một chu kỳ keyframe.
+"""
+import mmap
+import struct
+from bisect import bisect_right
+
+MAGIC = b'WOMT'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIIIIIQIQQQ')
+KEYFRAME = struct.Struct('<QQQ')
+EVENT_TYPES = ('visit', 'path')
+
+
+def _write_varint(buf, value):
+    while value >= 0x80:
+        buf.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+def pack_grid(grid):
+    """Đóng gói lưới thành n*n bit (bit 1 = tường)."""
+    n = len(grid)
+    bits = ''.join(''.join('1' if v else '0' for v in row) for row in grid)
+    return int(bits[::-1] or '0', 2).to_bytes((n * n + 7) // 8, 'little')
+
+
+def unpack_grid(data, n):
+    bits = format(int.from_bytes(data, 'little'), f'0{n * n}b')[::-1]
+    return [[int(ch) for ch in bits[r * n:(r + 1) * n]] for r in range(n)]
+
+
+# --- Ghi ---
+class TraceRecorder:
+    """Ghi luồng sự kiện của một lần tìm đường vào file trace."""
+
+    def __init__(self, path, grid, start, goal, keyframe_interval=1024):
+        self.n = len(grid)
+        self.start = start
+        self.goal = goal
+        self.keyframe_interval = keyframe_interval
+        self.count = 0
+        self.visits = 0
+        self.keyframes = []
+        self._buf = bytearray()
+        self._written = 0
+        self._file = open(path, 'wb')
+        self._file.write(b'\0' * HEADER.size)
+        self._grid_offset = HEADER.size
+        self._file.write(pack_grid(grid))
+        self._events_offset = self._file.tell()
+
+    def record(self, typ, cell):
+        if self.count % self.keyframe_interval == 0:
+            self.keyframes.append((self.count, self._written + len(self._buf), self.visits))
+        kind = 0 if typ == 'visit' else 1
+        _write_varint(self._buf, ((cell[0] * self.n + cell[1]) << 1) | kind)
+        self.count += 1
+        self.visits += kind ^ 1
+        if len(self._buf) >= 1 << 16:
+            self._flush()
+
+    def tee(self, events):
+        """Ghi lại từng sự kiện trong khi vẫn chuyển tiếp chúng cho nơi gọi (ví dụ giao diện)."""
+        for typ, cell in events:
+            self.record(typ, cell)
+            yield typ, cell
+
+    def _flush(self):
+        self._file.write(self._buf)
+        self._written += len(self._buf)
+        self._buf.clear()
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._flush()
+        index_offset = self._file.tell()
+        for frame in self.keyframes:
+            self._file.write(KEYFRAME.pack(*frame))
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, 0, self.n, self.start[0], self.start[1],
+                                     self.goal[0], self.goal[1], self.count, self.keyframe_interval,
+                                     self._grid_offset, self._events_offset, index_offset))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def record_trace(path, events, grid, start, goal, keyframe_interval=1024):
+    """Ghi toàn bộ một generator sự kiện vào file; trả về số sự kiện."""
+    with TraceRecorder(path, grid, start, goal, keyframe_interval) as rec:
+        for typ, cell in events:
+            rec.record(typ, cell)
+    return rec.count
+
+
+# --- Phát lại ---
+class TraceReader:
+    """Đọc file trace qua mmap; hỗ trợ nhảy tới bước bất kỳ trong O(log n)."""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, _, self.n, sr, sc, gr, gc, self.count, self.keyframe_interval,
+         self._grid_offset, self._events_offset, index_offset) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} is not a WOM MAZE trace')
+        self.start = (sr, sc)
+        self.goal = (gr, gc)
+        self._events_end = index_offset
+        frames = (len(self._map) - index_offset) // KEYFRAME.size
+        self.keyframes = [KEYFRAME.unpack_from(self._map, index_offset + i * KEYFRAME.size)
+                          for i in range(frames)]
+        self._frame_steps = [f[0] for f in self.keyframes]
+
+    def __len__(self):
+        return self.count
+
+    def grid(self):
+        size = (self.n * self.n + 7) // 8
+        return unpack_grid(self._map[self._grid_offset:self._grid_offset + size], self.n)
+
+    def _locate(self, step):
+        """Trả về (offset byte, số visit) ngay trước sự kiện thứ `step`."""
+        step = max(0, min(step, self.count))
+        i = bisect_right(self._frame_steps, step) - 1
+        if i < 0:
+            return self._events_offset, 0
+        at, offset, visits = self.keyframes[i]
+        pos = self._events_offset + offset
+        data = self._map
+        while at < step:
+            value = 0
+            shift = 0
+            while True:
+                b = data[pos]
+                pos += 1
+                value |= (b & 0x7F) << shift
+                if b < 0x80:
+                    break
+                shift += 7
+            visits += (value & 1) ^ 1
+            at += 1
+        return pos, visits
+
+    def counts_at(self, step):
+        """(số visit, số ô path) sau `step` sự kiện đầu tiên."""
+        step = max(0, min(step, self.count))
+        _, visits = self._locate(step)
+        return visits, step - visits
+
+    def events(self, start=0, stop=None):
+        """Sinh các sự kiện ('visit' | 'path', (r, c)) trong đoạn [start, stop)."""
+        stop = self.count if stop is None else min(stop, self.count)
+        pos, _ = self._locate(start)
+        data = self._map
+        n = self.n
+        for _ in range(max(0, stop - start)):
+            value = 0
+            shift = 0
+            while True:
+                b = data[pos]
+                pos += 1
+                value |= (b & 0x7F) << shift
+                if b < 0x80:
+                    break
+                shift += 7
+            r, c = divmod(value >> 1, n)
+            yield EVENT_TYPES[value & 1], (r, c)
+
+    def state_at(self, step):
+        """Trạng thái tô màu sau `step` sự kiện: dict ô -> 'visit' | 'path'."""
+        state = {}
+        for typ, cell in self.events(0, step):
+            state[cell] = typ
+        return state
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
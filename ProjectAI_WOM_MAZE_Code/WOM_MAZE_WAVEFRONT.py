@@ -0,0 +1,124 @@
+"""Bản đồ khoảng cách (wavefront) bằng NumPy, lan từng mức từ một hoặc nhiều nguồn.
+
+Backend tăng tốc tuỳ chọn cho WOM_MAZE_LOGIC.distance_field: cần numpy, còn
+logic tự quay về bản thuần Python khi không có. Mỗi mức, biên sóng được lan
+sang các ô kề bằng phép dịch mảng boolean và mặt nạ (ô trống, chưa thăm):
+    - biên lớn  : dịch cả lưới boolean theo từng hướng;
+    - biên vừa  : gom/tán theo chỉ số phẳng của các ô trên biên;
+    - biên nhỏ  : vòng lặp Python trên memoryview (hành lang hẹp của mê cung
+                  hoàn hảo, nơi chi phí gọi numpy mỗi mức lớn hơn công việc).
+
+    dist, pred = distance_field(grid, [(0, 0)], moves=8)
+    dist[r, c]      # số bước tới nguồn gần nhất, -1 nếu không tới được
+    pred[r, c]      # chỉ số trong DIRECTIONS: bước về phía nguồn, -1 ở nguồn / ô không tới được
+
+Mỗi bước (kể cả bước chéo khi moves=8) tính là 1, như BFS.
+"""
+import numpy as np
+
+import WOM_MAZE_LOGIC as logic
+
+DIRECTIONS = logic.WAVEFRONT_DIRECTIONS
+path_to_source = logic.path_to_source
+SMALL_FRONTIER = 64       # dưới ngưỡng này: vòng lặp Python
+DENSE_FRACTION = 1 / 32   # biên chiếm hơn tỉ lệ này của lưới: dịch cả mảng
+
+
+def walls_array(grid):
+    """list-of-lists (hoặc mảng) -> mảng bool, True = tường."""
+    return np.asarray(grid) == 1
+
+
+def _opposite(k):
+    dr, dc = DIRECTIONS[k]
+    return DIRECTIONS.index((-dr, -dc))
+
+
+def _shifted(mask, dr, dc):
+    """out[r + dr, c + dc] = mask[r, c] (phần tràn ra ngoài lưới bị bỏ)."""
+    n_rows, n_cols = mask.shape
+    out = np.zeros_like(mask)
+    out[max(dr, 0):n_rows + min(dr, 0), max(dc, 0):n_cols + min(dc, 0)] = \
+        mask[max(-dr, 0):n_rows - max(dr, 0), max(-dc, 0):n_cols - max(dc, 0)]
+    return out
+
+
+def distance_field(grid, sources, moves=4):
+    """Khoảng cách (int32) và hướng về nguồn (int32) của mọi ô tới nguồn gần nhất."""
+    if moves not in (4, 8):
+        raise ValueError(f'moves must be 4 or 8, got {moves!r}')
+    walls = grid if isinstance(grid, np.ndarray) and grid.dtype == bool else walls_array(grid)
+    n_rows, n_cols = walls.shape
+    size = n_rows * n_cols
+    dirs = DIRECTIONS[:moves]
+    back = [_opposite(k) for k in range(moves)]
+    dist = np.full(size, -1, dtype=np.int32)
+    pred = np.full(size, -1, dtype=np.int32)
+    # Ô đã có khoảng cách hoặc là tường: không lan vào nữa. Nguồn nằm trên tường vẫn lan ra được.
+    blocked = walls.reshape(-1).copy()
+    frontier = sorted({r * n_cols + c for r, c in sources})
+    for u in frontier:
+        dist[u] = 0
+        blocked[u] = True
+    level = 0
+    while frontier is not None and len(frontier):
+        level += 1
+        count = len(frontier)
+        if count < SMALL_FRONTIER:
+            frontier = _expand_small(frontier, dirs, back, n_rows, n_cols, dist, pred, blocked, level)
+        elif count < size * DENSE_FRACTION:
+            frontier = _expand_indices(np.asarray(frontier, dtype=np.int64), dirs, back,
+                                       n_rows, n_cols, dist, pred, blocked, level)
+        else:
+            frontier = _expand_dense(frontier, dirs, back, n_rows, n_cols, dist, pred, blocked, level)
+    return dist.reshape(n_rows, n_cols), pred.reshape(n_rows, n_cols)
+
+
+def _expand_small(frontier, dirs, back, n_rows, n_cols, dist, pred, blocked, level):
+    dist_mv, pred_mv, blocked_mv = memoryview(dist), memoryview(pred), memoryview(blocked)
+    out = []
+    for u in (int(x) for x in frontier):
+        r, c = divmod(u, n_cols)
+        for k, (dr, dc) in enumerate(dirs):
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < n_rows and 0 <= nc < n_cols:
+                v = nr * n_cols + nc
+                if not blocked_mv[v]:
+                    blocked_mv[v] = True
+                    dist_mv[v] = level
+                    pred_mv[v] = back[k]
+                    out.append(v)
+    return out
+
+
+def _expand_indices(frontier, dirs, back, n_rows, n_cols, dist, pred, blocked, level):
+    rows, cols = np.divmod(frontier, n_cols)
+    found = []
+    for k, (dr, dc) in enumerate(dirs):
+        ok = (rows + dr >= 0) & (rows + dr < n_rows) & (cols + dc >= 0) & (cols + dc < n_cols)
+        v = frontier[ok] + (dr * n_cols + dc)
+        v = v[~blocked[v]]
+        # Mỗi hướng ánh xạ ô khác nhau tới ô khác nhau, nên không trùng trong cùng một hướng
+        blocked[v] = True
+        dist[v] = level
+        pred[v] = back[k]
+        found.append(v)
+    return np.concatenate(found) if found else None
+
+
+def _expand_dense(frontier, dirs, back, n_rows, n_cols, dist, pred, blocked, level):
+    mask = np.zeros(n_rows * n_cols, dtype=bool)
+    mask[np.asarray(frontier, dtype=np.int64)] = True
+    mask = mask.reshape(n_rows, n_cols)
+    blocked2 = blocked.reshape(n_rows, n_cols)
+    dist2 = dist.reshape(n_rows, n_cols)
+    pred2 = pred.reshape(n_rows, n_cols)
+    new = np.zeros_like(mask)
+    for k, (dr, dc) in enumerate(dirs):
+        cand = _shifted(mask, dr, dc) & ~blocked2
+        blocked2 |= cand
+        dist2[cand] = level
+        pred2[cand] = back[k]
+        new |= cand
+    return np.flatnonzero(new)
+
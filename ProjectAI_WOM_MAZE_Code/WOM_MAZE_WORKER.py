@@ -0,0 +1,240 @@
+"""Chạy thuật toán tìm đường ở luồng nền, đẩy sự kiện theo lô qua hàng đợi có giới hạn.
+
+Luồng Tk không bao giờ gọi next() trên generator của thuật toán nữa; nó chỉ
+rút các lô đã sẵn có (SearchWorker.events) mỗi khung hình. Hàng đợi có giới
+hạn nên luồng nền tự chờ khi giao diện vẽ chậm hơn tốc độ tìm kiếm, và bộ nhớ
+không phình ra với mê cung lớn.
+
+    worker = SearchWorker(logic.solver_generator('BFS', grid, s, g)).start()
+    FrameScheduler(widget, worker.events(), apply, ...).start()
+    worker.pause(); worker.resume(); worker.cancel()
+
+MazePool giữ sẵn vài mê cung sinh ở luồng nền cho lựa chọn hiện tại, để nút
+"Tạo mê cung" lấy ra ngay thay vì sinh trên luồng Tk:
+
+    pool = MazePool(logic.generate_maze)
+    pool.select(n, algorithm)       # khi thanh trượt / combobox đổi: bắt đầu sinh trước
+    grid = pool.get(n, algorithm)   # khi bấm nút
+
+Lưu ý: mọi thao tác với widget Tk phải ở luồng chính; generator chạy trong
+SearchWorker không được cấu hình nhãn hay vẽ canvas.
+"""
+import queue
+import threading
+from collections import deque
+
+_DONE = object()
+
+
+class SearchCancelled(Exception):
+    pass
+
+
+class SearchWorker:
+    """Một lần tìm đường chạy trong luồng daemon riêng."""
+
+    def __init__(self, events, batch_size=256, max_batches=64):
+        self._source = events
+        self.batch_size = batch_size
+        self.queue = queue.Queue(max_batches)
+        self.error = None
+        self.finished = False     # luồng nền đã chạy xong (hoặc bị huỷ)
+        self._cancel = threading.Event()
+        self._running = threading.Event()   # xoá = đang tạm dừng
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, name='SearchWorker', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    # --- Luồng nền ---
+    def _put(self, item):
+        # Chờ theo từng nhịp ngắn để vẫn phản hồi được lệnh huỷ khi hàng đợi đầy
+        while not self._cancel.is_set():
+            try:
+                self.queue.put(item, timeout=0.05)
+                return
+            except queue.Full:
+                pass
+        raise SearchCancelled
+
+    def _run(self):
+        batch = []
+        try:
+            for event in self._source:
+                batch.append(event)
+                if len(batch) >= self.batch_size:
+                    self._put(batch)
+                    batch = []
+                if not self._running.is_set():
+                    if batch:
+                        self._put(batch)
+                        batch = []
+                    while not self._running.wait(0.05):
+                        if self._cancel.is_set():
+                            raise SearchCancelled
+                if self._cancel.is_set():
+                    raise SearchCancelled
+            if batch:
+                self._put(batch)
+        except SearchCancelled:
+            pass
+        except Exception as e:  # báo lỗi về luồng giao diện thay vì làm chết luồng im lặng
+            self.error = e
+        finally:
+            close = getattr(self._source, 'close', None)
+            if close is not None:
+                close()
+            self.finished = True
+            try:
+                self.queue.put_nowait(_DONE)
+            except queue.Full:
+                pass
+
+    # --- Điều khiển từ luồng giao diện ---
+    def pause(self):
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    @property
+    def paused(self):
+        return not self._running.is_set()
+
+    def cancel(self, wait=True):
+        """Dừng tìm kiếm; mặc định chờ luồng nền thoát hẳn."""
+        self._cancel.set()
+        self._running.set()
+        if wait and self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def events(self):
+        """Generator không chặn cho FrameScheduler: sinh các sự kiện đã có sẵn,
+        sinh None khi hàng đợi tạm rỗng, kết thúc khi luồng nền xong."""
+        get = self.queue.get_nowait
+        while True:
+            try:
+                batch = get()
+            except queue.Empty:
+                if self.finished and self.queue.empty():
+                    return
+                yield None
+                continue
+            if batch is _DONE:
+                return
+            yield from batch
+
+
+def run_in_background(widget, func, callback, *args, poll_ms=50):
+    """Chạy func(*args) ở luồng nền rồi gọi callback(kết quả, lỗi) trên luồng Tk.
+
+    Dùng cho các việc chạy một lần không cần hoạt hình (ví dụ đo thời gian
+    thuật toán); luồng Tk chỉ kiểm tra định kỳ bằng widget.after.
+    """
+    box = {}
+
+    def target():
+        try:
+            box['result'] = func(*args)
+        except Exception as e:
+            box['error'] = e
+
+    thread = threading.Thread(target=target, name='BackgroundTask', daemon=True)
+    thread.start()
+
+    def poll():
+        if thread.is_alive():
+            widget.after(poll_ms, poll)
+        else:
+            callback(box.get('result'), box.get('error'))
+
+    widget.after(poll_ms, poll)
+    return thread
+
+
+class MazePool:
+    """Mê cung sinh sẵn ở luồng nền cho một lựa chọn (các tham số của factory).
+
+    Luồng nền giữ tối đa depth mê cung cho lựa chọn hiện tại và sinh bù sau
+    mỗi lần get(). Đổi lựa chọn thì bỏ các mê cung đã sinh cho lựa chọn cũ;
+    mê cung đang sinh dở cho lựa chọn cũ cũng bị bỏ khi xong.
+    """
+
+    def __init__(self, factory, depth=2):
+        self.factory = factory
+        self.depth = depth
+        self.hits = self.misses = 0
+        self.error = None
+        self._key = None
+        self._epoch = 0          # tăng mỗi lần đổi lựa chọn: kết quả của epoch cũ bị bỏ
+        self._failed = -1        # epoch mà factory ném lỗi ở luồng nền: không sinh lại nữa
+        self._ready = deque()
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='MazePool', daemon=True)
+        self._thread.start()
+
+    def _select(self, key):
+        if key != self._key:
+            self._key = key
+            self._epoch += 1
+            self._ready.clear()
+            self._cond.notify_all()
+
+    def select(self, *key):
+        """Đổi lựa chọn hiện tại; luồng nền bắt đầu sinh trước cho lựa chọn này."""
+        with self._cond:
+            self._select(key)
+
+    def get(self, *key):
+        """Một mê cung mới cho key: lấy ngay nếu đã sinh sẵn, ngược lại chờ mê cung đang sinh."""
+        with self._cond:
+            self._select(key)
+            if self._ready:
+                self.hits += 1
+            else:
+                self.misses += 1
+            while not self._ready and self._failed != self._epoch and not self._closed:
+                self._cond.wait()
+            if self._ready:
+                grid = self._ready.popleft()
+                self._cond.notify_all()
+                return grid
+        # Luồng nền lỗi hoặc đã đóng: sinh ngay tại đây để lỗi (nếu có) hiện ra ở nơi gọi
+        return self.factory(*key)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed and (self._key is None or len(self._ready) >= self.depth
+                                            or self._failed == self._epoch):
+                    self._cond.wait()
+                if self._closed:
+                    return
+                key, epoch = self._key, self._epoch
+            try:
+                grid = self.factory(*key)
+            except Exception as e:
+                with self._cond:
+                    if epoch == self._epoch:
+                        self._failed = epoch
+                        self.error = e
+                    self._cond.notify_all()
+                continue
+            with self._cond:
+                if epoch == self._epoch:
+                    self._ready.append(grid)
+                    self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._ready.clear()
+            self._cond.notify_all()
+        self._thread.join(timeout=1)
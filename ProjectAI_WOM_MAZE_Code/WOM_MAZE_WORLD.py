@@ -0,0 +1,170 @@
+"""Thế giới mê cung không giới hạn, ghép từ các chunk sinh khi cần, giữ trong cache LRU.
+
+Chunk (cx, cy) là một mê cung chunk_size x chunk_size sinh bằng
+logic.generate_maze với random.Random(f'{seed}:{cx}:{cy}'): cùng seed luôn
+cho đúng chunk đó, nên chunk bị đẩy khỏi cache được sinh lại y hệt khi cần.
+chunk_size chẵn nên ô của mê cung nằm ở toạ độ chẵn, hàng và cột cuối của
+chunk toàn tường: đó là đường nối với chunk bên dưới / bên phải. Mỗi chunk tự
+đục `doors` cửa trên cột cuối và hàng cuối của nó (ở hàng / cột chẵn, thẳng
+hàng với ô của chunk kề), nên đường nối khớp mà không cần đọc chunk hàng xóm,
+và cả thế giới liên thông.
+
+    world = ChunkedWorld(seed=7, chunk_size=32, max_chunks=64)
+    world.cell(-5, 1000)                    # 0 = lối đi, 1 = tường; toạ độ âm cũng được
+    path, stats = world.solve((0, 0), (40, 300), algorithm='A*')
+    grid = world.view(top, left, n)         # lưới n x n dùng thẳng cho các solver của logic
+
+Chunk được lưu dạng bytes (chunk_size² byte); quá max_chunks thì chunk dùng
+lâu nhất bị bỏ, nên bộ nhớ bị chặn bởi max_chunks * chunk_size² byte.
+"""
+import random
+import threading
+from collections import OrderedDict
+
+import WOM_MAZE_LOGIC as logic
+
+
+class _Row:
+    """Một hàng của view: grid[r][c] đọc ô tương ứng của thế giới."""
+    __slots__ = ('world', 'r', 'left', 'n')
+
+    def __init__(self, world, r, left, n):
+        self.world, self.r, self.left, self.n = world, r, left, n
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, c):
+        if not 0 <= c < self.n:
+            raise IndexError(c)
+        return self.world.cell(self.r, self.left + c)
+
+
+class WorldView:
+    """Cửa sổ n x n của thế giới, giả làm list-of-lists (chỉ đọc); chunk được sinh khi ô được đọc."""
+
+    def __init__(self, world, top, left, n):
+        self.world, self.top, self.left, self.n = world, top, left, n
+        self._rows = [_Row(world, top + r, left, n) for r in range(n)]
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, r):
+        return self._rows[r]
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def to_local(self, pos):
+        return pos[0] - self.top, pos[1] - self.left
+
+    def to_world(self, pos):
+        return pos[0] + self.top, pos[1] + self.left
+
+
+class ChunkedWorld:
+    """Mê cung vô hạn: chunk sinh tất định theo (seed, cx, cy), cache LRU tối đa max_chunks chunk."""
+
+    def __init__(self, seed=0, chunk_size=32, algorithm='Recursive Backtracking', max_chunks=64, doors=2):
+        if chunk_size < 4 or chunk_size % 2:
+            raise ValueError(f'chunk_size must be an even number >= 4, got {chunk_size!r}')
+        if algorithm not in logic.MAZE_GENERATORS:
+            raise ValueError(f'Unknown algorithm: {algorithm}')
+        if max_chunks < 1:
+            raise ValueError(f'max_chunks must be >= 1, got {max_chunks!r}')
+        self.seed = seed
+        self.size = chunk_size
+        self.algorithm = algorithm
+        self.max_chunks = max_chunks
+        self.doors = max(1, min(doors, chunk_size // 2))
+        self._chunks = OrderedDict()
+        self._last = (None, None)  # (khoá, chunk) dùng gần nhất: đọc liên tiếp trong một chunk khỏi tra cache
+        self._lock = threading.Lock()
+        self.hits = self.generated = self.evicted = 0
+
+    # --- Chunk ---
+    def make_chunk(self, cx, cy):
+        """Sinh chunk (cx, cy): bytes chunk_size² theo hàng, đã đục cửa ở cạnh phải và cạnh dưới."""
+        size = self.size
+        rng = random.Random(f'{self.seed}:{cx}:{cy}')
+        grid = logic.generate_maze(size, self.algorithm, rng=rng)
+        edge = size - 1
+        for r in rng.sample(range(0, edge, 2), self.doors):
+            grid[r][edge] = 0
+        for c in rng.sample(range(0, edge, 2), self.doors):
+            grid[edge][c] = 0
+        return bytes(v for row in grid for v in row)
+
+    def chunk(self, cx, cy):
+        key = (cx, cy)
+        last_key, data = self._last
+        if last_key == key:
+            return data
+        with self._lock:
+            data = self._chunks.get(key)
+            if data is not None:
+                self._chunks.move_to_end(key)
+                self.hits += 1
+            else:
+                data = self.make_chunk(cx, cy)
+                self._chunks[key] = data
+                self.generated += 1
+                while len(self._chunks) > self.max_chunks:
+                    self._chunks.popitem(last=False)
+                    self.evicted += 1
+            self._last = (key, data)
+        return data
+
+    def cached(self):
+        """Các chunk đang trong cache, từ dùng lâu nhất tới mới nhất."""
+        return list(self._chunks)
+
+    def chunk_of(self, pos):
+        """(cx, cy) của chunk chứa ô pos = (r, c)."""
+        return pos[1] // self.size, pos[0] // self.size
+
+    # --- Ô ---
+    def cell(self, r, c):
+        size = self.size
+        cy, lr = divmod(r, size)
+        cx, lc = divmod(c, size)
+        return self.chunk(cx, cy)[lr * size + lc]
+
+    def is_open(self, pos):
+        return self.cell(pos[0], pos[1]) == 0
+
+    def view(self, top, left, n):
+        return WorldView(self, top, left, n)
+
+    def region(self, top, left, n):
+        """Bản sao list-of-lists của cửa sổ n x n (để vẽ hoặc sửa)."""
+        return [[self.cell(r, c) for c in range(left, left + n)] for r in range(top, top + n)]
+
+    # --- Tìm đường ---
+    def window(self, start, goal, margin=1):
+        """(top, left, n): cửa sổ vuông khớp biên chunk, phủ start, goal và thêm margin chunk mỗi phía."""
+        size = self.size
+        (sx, sy), (gx, gy) = self.chunk_of(start), self.chunk_of(goal)
+        top = (min(sy, gy) - margin) * size
+        left = (min(sx, gx) - margin) * size
+        span = max(abs(sy - gy), abs(sx - gx)) + 1 + 2 * margin
+        return top, left, span * size
+
+    def solve(self, start, goal, algorithm='A*', heuristic='Manhattan', margin=1, max_margin=8):
+        """Tìm đường trong thế giới; trả về (đường đi theo toạ độ thế giới, SearchStats).
+
+        Solver chạy trên view của một cửa sổ quanh start và goal, chunk chỉ được
+        sinh khi solver đọc tới. Không có đường trong cửa sổ (đường phải vòng ra
+        ngoài) thì margin tăng gấp đôi, tới max_margin thì chịu thua và trả về [].
+        """
+        start, goal = tuple(start), tuple(goal)
+        if not self.is_open(goal):
+            return [], logic.SearchStats()
+        while True:
+            top, left, n = self.window(start, goal, margin)
+            grid = self.view(top, left, n)
+            path, stats = logic.solve(grid, grid.to_local(start), grid.to_local(goal), algorithm, heuristic)
+            if path or margin >= max_margin:
+                return [grid.to_world(p) for p in path], stats
+            margin = min(max(1, margin * 2), max_margin)
@@ -0,0 +1,275 @@
+"""Điểm vào dòng lệnh không giao diện cho WOM MAZE.
+
+    python -m wom_maze generate --size 100 --generator Prim --seed 1 -o maze.txt
+    python -m wom_maze solve --maze maze.txt --algorithm A* --heuristic Octile
+    python -m wom_maze solve --size 100 --seed 1 --record run.womt
+    python -m wom_maze solve --size 1000 --algorithm A* --heuristic Octile --deadline 5
+    python -m wom_maze replay run.womt --step 500
+    python -m wom_maze batch --maze maze.txt --queries queries.txt --processes 4
+    python -m wom_maze bench --sizes 50 100
+    python -m wom_maze mapf --size 41 --agents 10 20 40
+
+Chỉ nạp tầng logic; giao diện (customtkinter, tkinter, PIL) không bao giờ
+được import ở đây, các module phụ (benchmark, json) chỉ nạp khi cần để khởi
+động nhanh cho các tiến trình ngắn.
+"""
+import argparse
+import random
+import sys
+
+import WOM_MAZE_LOGIC as logic
+
+ALGORITHMS = list(logic.SOLVER_GENERATORS)
+HEURISTICS = ['Manhattan', 'Euclidean', 'Chebyshev', 'Octile', 'Tie-breaking', 'Angle Euclidean']
+
+
+# --- Đọc/ghi mê cung dạng văn bản (mỗi hàng một dòng, 0=lối đi, 1=tường) ---
+def write_maze(grid, f):
+    for row in grid:
+        f.write(''.join('1' if v else '0' for v in row))
+        f.write('\n')
+
+
+def read_maze(f):
+    grid = [[1 if ch == '1' else 0 for ch in line.strip()] for line in f if line.strip()]
+    if any(len(row) != len(grid) for row in grid):
+        raise ValueError('maze file must contain a square grid')
+    return grid
+
+
+def _open_out(path):
+    return sys.stdout if path in (None, '-') else open(path, 'w', encoding='utf-8')
+
+
+def _load_or_generate(args):
+    if args.maze:
+        with open(args.maze, encoding='utf-8') as f:
+            return read_maze(f)
+    if args.seed is not None:
+        random.seed(args.seed)
+    return logic.generate_maze(args.size, args.generator)
+
+
+def _endpoints(grid, args):
+    n = len(grid)
+    # Hai lần tra một lần duy nhất: find_nearest_empty rẻ hơn nhiều so với dựng NearestOpenIndex
+    start = tuple(args.start) if args.start else logic.find_nearest_empty(grid, (0, 0))
+    goal = tuple(args.goal) if args.goal else logic.find_nearest_empty(grid, (n - 1, n - 1))
+    return start, goal
+
+
+# --- Các lệnh con ---
+def cmd_generate(args):
+    grid = _load_or_generate(args)
+    out = _open_out(args.output)
+    try:
+        write_maze(grid, out)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+def cmd_solve(args):
+    grid = _load_or_generate(args)
+    start, goal = _endpoints(grid, args)
+    if args.algorithm is None:
+        args.algorithm = 'A*' if args.deadline is not None else 'BFS'
+    if args.heuristic is None:
+        # ARA* chỉ chứng minh được cận với heuristic chấp nhận được trên mô hình 8 hướng
+        args.heuristic = 'Octile' if args.deadline is not None else 'Manhattan'
+    if args.deadline is not None:
+        return _solve_anytime(grid, start, goal, args)
+    stats = logic.SearchStats()
+    events = logic.solver_generator(args.algorithm, grid, start, goal, args.heuristic, stats)
+    recorder = None
+    if args.record:
+        from WOM_MAZE_TRACE import TraceRecorder
+        recorder = TraceRecorder(args.record, grid, start, goal)
+        events = recorder.tee(events)
+    path = []
+    for typ, cell in events:
+        if typ == 'path':
+            path.append(cell)
+    if recorder is not None:
+        recorder.close()
+    if args.json:
+        import json
+        result = {'start': list(start), 'goal': list(goal), 'found': bool(path),
+                  'path_length': len(path), 'stats': stats.as_dict()}
+        if args.path:
+            result['path'] = [list(cell) for cell in path]
+        print(json.dumps(result))
+    else:
+        print(f'{args.algorithm} {start} -> {goal}: '
+              f'{"path of " + str(len(path)) + " cells" if path else "no path"}')
+        print(stats.summary())
+        if args.path:
+            print(' '.join(f'{r},{c}' for r, c in path))
+    return 0 if path else 1
+
+
+def _solve_anytime(grid, start, goal, args):
+    stats = logic.SearchStats()
+    best = logic.anytime_astar(grid, start, goal, args.heuristic, args.deadline / 1000, stats=stats)
+    path = best['path'] if best else []
+    if args.json:
+        import json
+        result = {'start': list(start), 'goal': list(goal), 'found': bool(path), 'path_length': len(path),
+                  'cost': best['cost'] if best else None, 'bound': best['bound'] if best else None,
+                  'elapsed_ms': best['elapsed'] * 1000 if best else None, 'stats': stats.as_dict()}
+        if args.path:
+            result['path'] = [list(cell) for cell in path]
+        print(json.dumps(result))
+    else:
+        if best:
+            bound = (f"<= {best['bound']:.2f} x optimal" if best['bound'] is not None
+                     else f'no bound: {args.heuristic} is not admissible')
+            print(f"ARA* {start} -> {goal}: path of {len(path)} cells, cost {best['cost']:.2f} "
+                  f"({bound}) after {best['elapsed'] * 1000:.2f} ms")
+        else:
+            print(f'ARA* {start} -> {goal}: no path')
+        print(stats.summary())
+        if args.path:
+            print(' '.join(f'{r},{c}' for r, c in path))
+    return 0 if path else 1
+
+
+def render_frame(grid, start, goal, events):
+    """Khung ASCII: '#' tường, '.' lối đi, '+' đã duyệt, '*' đường đi, 'S'/'G' điểm đầu/cuối."""
+    rows = [['#' if v else '.' for v in row] for row in grid]
+    for typ, (r, c) in events:
+        rows[r][c] = '+' if typ == 'visit' else '*'
+    rows[start[0]][start[1]] = 'S'
+    rows[goal[0]][goal[1]] = 'G'
+    return '\n'.join(''.join(row) for row in rows)
+
+
+def cmd_replay(args):
+    from WOM_MAZE_TRACE import TraceReader
+    with TraceReader(args.record) as trace:
+        step = len(trace) if args.step is None else max(0, min(args.step, len(trace)))
+        visited, path_cells = trace.counts_at(step)
+        if not args.counts_only:
+            print(render_frame(trace.grid(), trace.start, trace.goal, trace.events(0, step)))
+        print(f'step {step}/{len(trace)}  visited {visited}  path {path_cells}')
+    return 0
+
+
+def read_queries(f):
+    """Mỗi dòng một truy vấn: 'hàng_đầu cột_đầu hàng_cuối cột_cuối'."""
+    queries = []
+    for line in f:
+        parts = line.split()
+        if not parts or parts[0].startswith('#'):
+            continue
+        if len(parts) != 4:
+            raise ValueError(f'bad query line: {line.strip()!r}')
+        r1, c1, r2, c2 = map(int, parts)
+        queries.append(((r1, c1), (r2, c2)))
+    return queries
+
+
+def cmd_batch(args):
+    from WOM_MAZE_BATCH import solve_many
+    grid = _load_or_generate(args)
+    with (sys.stdin if args.queries == '-' else open(args.queries, encoding='utf-8')) as f:
+        queries = read_queries(f)
+    results = solve_many(grid, queries, args.algorithm, args.processes)
+    if args.json:
+        import json
+        for res in results:
+            print(json.dumps({'start': list(res.start), 'goal': list(res.goal), 'found': res.found,
+                              'cost': res.cost, 'path_length': len(res.path),
+                              'group_size': res.group_size, 'settle_order': res.settle_order,
+                              'stats': res.stats.as_dict(), 'group_stats': res.group_stats.as_dict()}))
+    else:
+        for res in results:
+            print(f'{res.start} -> {res.goal}: '
+                  f'{f"cost {res.cost:.2f}, {len(res.path)} cells" if res.found else "no path"}')
+    return 0 if all(res.found for res in results) else 1
+
+
+def cmd_bench(args):
+    import WOM_MAZE_BENCH
+    return WOM_MAZE_BENCH.main(args.bench_args)
+
+
+def cmd_mapf(args):
+    import WOM_MAZE_MAPF
+    return WOM_MAZE_MAPF.main(args.bench_args)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='wom_maze', description='Headless WOM MAZE tools')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def add_maze_source(p):
+        p.add_argument('--maze', help='read the maze from a text file instead of generating it')
+        p.add_argument('--size', type=int, default=50)
+        p.add_argument('--generator', default='Recursive Backtracking', choices=list(logic.MAZE_GENERATORS))
+        p.add_argument('--seed', type=int)
+
+    p = sub.add_parser('generate', help='generate a maze and write it as text')
+    add_maze_source(p)
+    p.add_argument('-o', '--output', help="output file ('-' or omitted for stdout)")
+    p.set_defaults(func=cmd_generate)
+
+    p = sub.add_parser('solve', help='solve one start/goal query')
+    add_maze_source(p)
+    p.add_argument('--algorithm', choices=ALGORITHMS, help='search algorithm (default: BFS)')
+    p.add_argument('--heuristic', choices=HEURISTICS,
+                   help='A* heuristic (default: Manhattan, or Octile with --deadline)')
+    p.add_argument('--start', type=int, nargs=2, metavar=('ROW', 'COL'))
+    p.add_argument('--goal', type=int, nargs=2, metavar=('ROW', 'COL'))
+    p.add_argument('--json', action='store_true', help='print the result as JSON')
+    p.add_argument('--path', action='store_true', help='also print the path cells')
+    p.add_argument('--record', help='save the visit/path event stream as a binary trace')
+    p.add_argument('--deadline', type=float, metavar='MS',
+                   help='anytime A* (ARA*): best path found within MS milliseconds, with its suboptimality bound '
+                        '(not with --record, or with --algorithm other than A*)')
+    p.set_defaults(func=cmd_solve)
+
+    p = sub.add_parser('replay', help='print a recorded trace as ASCII at a given step')
+    p.add_argument('record')
+    p.add_argument('--step', type=int, help='number of events to apply (default: all)')
+    p.add_argument('--counts-only', action='store_true',
+                   help='only print the counters at STEP (seeks without decoding the whole trace)')
+    p.set_defaults(func=cmd_replay)
+
+    p = sub.add_parser('batch', help='solve many start/goal queries on one maze, sharing work by goal')
+    add_maze_source(p)
+    p.add_argument('--queries', required=True, help="file with one 'r1 c1 r2 c2' query per line ('-' for stdin)")
+    p.add_argument('--algorithm', default='Dijkstra', choices=['Dijkstra', 'A*', 'BFS'])
+    p.add_argument('--processes', type=int, help='spread query groups over a process pool')
+    p.add_argument('--json', action='store_true', help='print one JSON object per query')
+    p.set_defaults(func=cmd_batch)
+
+    p = sub.add_parser('bench', help='run WOM_MAZE_BENCH (remaining args are passed through)',
+                       add_help=False)
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser('mapf', help='run the multi-agent benchmark (remaining args are passed through)',
+                       add_help=False)
+    p.set_defaults(func=cmd_mapf)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if args.command in ('bench', 'mapf'):
+        args.bench_args = extra
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    if args.command == 'solve' and args.deadline is not None:
+        # --deadline chạy ARA*: không có thuật toán khác để chọn, không có luồng sự kiện để ghi
+        if args.algorithm not in (None, 'A*'):
+            parser.error(f'--deadline runs anytime A* and cannot be combined with --algorithm {args.algorithm}')
+        if args.record:
+            parser.error('--deadline cannot be combined with --record (ARA* has no event stream)')
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())